@@ -0,0 +1,80 @@
+"""
+Measure the throughput of the Markdown escaping layer, on texts like the ones of generated pages
+Usage : python benchmarks/escaping.py [runs]
+"""
+import random
+import statistics
+import string
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from chardon.exporter.markdown_escaping import escape, escape_text, escape_obsidian_text, \
+    escape_link_target, escape_list_head, table_cell_table
+
+# Distinct texts escaped on each run
+TEXTS: int = 20_000
+
+# Most names and summaries have no special character, some have a few
+SPECIAL_CHARACTERS: str = '\\`*_[]<>~#$|\n'
+
+
+def corpus(count: int, special_rate: float = 0.1) -> List[str]:
+    """
+    Build texts looking like class names, member names and summaries
+    @param count: Number of texts
+    @param special_rate: Share of characters that need escaping
+    @return: Texts, all different so that memoization doesn't hide the cost of escaping
+    """
+    rng = random.Random(1)
+    texts: List[str] = []
+    for i in range(count):
+        length = rng.choice((8, 16, 60, 120))
+        text = ''.join(rng.choice(SPECIAL_CHARACTERS) if rng.random() < special_rate
+                       else rng.choice(string.ascii_letters + ' ') for _ in range(length))
+        texts.append(f"{text}{i}")
+    return texts
+
+
+def measure(function: Callable[[str], str], texts: List[str], runs: int) -> List[float]:
+    """
+    Escape every text, several times
+    @param function: Escaping function
+    @param texts: Texts
+    @param runs: Number of runs
+    @return: Duration of each run, in seconds
+    """
+    times: List[float] = []
+    for _ in range(runs):
+        clear = getattr(function, 'cache_clear', None)
+        if clear is not None:
+            clear()
+        start = time.perf_counter()
+        for text in texts:
+            function(text)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    """
+    Print the median throughput of each escaping function
+    """
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    texts = corpus(TEXTS)
+    size = sum(len(text) for text in texts) / 1e6
+    cell_table = table_cell_table('<br>')
+    functions: List[Tuple[str, Callable[[str], str]]] = [
+        ("escape_text", escape_text),
+        ("escape_obsidian_text", escape_obsidian_text),
+        ("table cell", lambda text: escape(text, cell_table)),
+        ("escape_link_target", escape_link_target),
+        ("escape_list_head", escape_list_head),
+    ]
+    for name, function in functions:
+        median = statistics.median(measure(function, texts, runs))
+        print(f"{len(texts) / median / 1e6:8.2f} M texts/s {size / median:8.1f} MB/s  {name}")
+
+
+if __name__ == '__main__':
+    main()
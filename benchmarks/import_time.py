@@ -0,0 +1,50 @@
+"""
+Measure how long importing Chardon takes, each statement being run in a fresh interpreter
+Usage : python benchmarks/import_time.py [runs]
+"""
+import statistics
+import subprocess
+import sys
+from typing import List
+
+STATEMENTS: List[str] = [
+    "import chardon",
+    "from chardon import ProjectManager, CSharpParser, MarkdownContentExport",
+    "from chardon import HtmlContentExport",
+    "from chardon import SqliteExporter",
+    "from chardon import ObsidianGraphColorer",
+    "from chardon import *",
+]
+
+TIMER: str = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(statement: str, runs: int) -> List[float]:
+    """
+    Import times of a statement
+    @param statement: Import statement
+    @param runs: Number of fresh interpreters to run it in
+    @return: Times, in milliseconds
+    """
+    return [float(subprocess.run([sys.executable, "-c", TIMER.format(statement=statement)],
+                                 check=True, capture_output=True, text=True).stdout) * 1000
+            for _ in range(runs)]
+
+
+def main():
+    """
+    Print the median and best import time of each statement
+    """
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for statement in STATEMENTS:
+        times = measure(statement, runs)
+        print(f"{statistics.median(times):8.1f} ms (best {min(times):6.1f} ms)  {statement}")
+
+
+if __name__ == '__main__':
+    main()
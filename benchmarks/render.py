@@ -0,0 +1,102 @@
+"""
+Measure how long the Markdown and Obsidian exporters take to render a large class page,
+for the working tree and for older revisions, each in a fresh interpreter
+Usage : python benchmarks/render.py [runs] [revision ...]
+eg. python benchmarks/render.py 10 6c738d4~1 compares with the recursive exporters
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+
+# Members of the page, as many as a large generated API class
+MEMBERS: int = 1500
+
+# Only uses Contents and exporters that every revision has
+RUNNER: str = """
+import json, sys, time
+from chardon.article_builder.content import Content, TableRow, TextStyle
+from chardon.exporter import MarkdownContentExport, ObsidianFlavoredMarkdownContentExport
+
+def page(members):
+    contents = [Content.Header({'title': 'Huge', 'aliases': [], 'tags': ['class']}),
+                Content.Title('Table Of Content', 1),
+                Content.Table(['Name', 'Description'], [
+                    TableRow([Content.InternalLink(f'Member{i}'), Content.Text(f'Does {i}')])
+                    for i in range(members)])]
+    for i in range(members):
+        contents.append(Content.Span([
+            Content.Title(f'Member{i}', 2),
+            Content.Span([Content.Span([Content.Text('PUBLIC')], TextStyle.ITALIC),
+                          Content.Span([Content.Link('Other', 'Api/Other')], TextStyle.BOLD)]),
+        ]))
+        contents.append(Content.Span([Content.Text('Gets the value of '),
+                                      Content.Span([Content.Text(f'Member{i}')], TextStyle.BOLD)]))
+        contents.append(Content.Table(['Inputs', 'Type', 'Description'], [
+            TableRow([Content.Text('value'), Content.Text('int'), Content.Text('Value')])]))
+    return contents
+
+contents = page(int(sys.argv[1]))
+times = {}
+for exporter in (MarkdownContentExport(), ObsidianFlavoredMarkdownContentExport()):
+    exporter.export(contents)
+    times[type(exporter).__name__] = []
+    for _ in range(int(sys.argv[2])):
+        start = time.perf_counter()
+        exporter.export(contents)
+        times[type(exporter).__name__].append(time.perf_counter() - start)
+print(json.dumps(times))
+"""
+
+
+def measure(source: Path, runs: int) -> Dict[str, List[float]]:
+    """
+    Render the page with the exporters of a source tree
+    @param source: Directory holding the chardon package
+    @param runs: Renders of the page by each exporter
+    @return: Exporter -> render times, in milliseconds
+    """
+    result = subprocess.run([sys.executable, "-c", RUNNER, str(MEMBERS), str(runs)],
+                            check=True, capture_output=True, text=True, cwd=source,
+                            env={**os.environ, 'PYTHONPATH': str(source)})
+    times: Dict[str, List[float]] = json.loads(result.stdout)
+    return {exporter: [time * 1000 for time in values] for exporter, values in times.items()}
+
+
+def checkout(revision: str, directory: Path) -> Path:
+    """
+    Extract the sources of a revision, without touching the working tree
+    @param revision: Git revision
+    @param directory: Where to extract them
+    @return: Directory holding the chardon package
+    """
+    directory.mkdir(parents=True)
+    archive = subprocess.run(["git", "archive", revision, "src"], cwd=ROOT, check=True,
+                             capture_output=True).stdout
+    subprocess.run(["tar", "-x", "-C", str(directory)], input=archive, check=True)
+    return directory / "src"
+
+
+def main():
+    """
+    Print the median and best render time of each exporter, for each revision
+    """
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    sources: Dict[str, Path] = {"working tree": ROOT / "src"}
+    with tempfile.TemporaryDirectory() as directory:
+        for revision in sys.argv[2:]:
+            sources[revision] = checkout(revision, Path(directory) / revision.replace('/', '_'))
+        for name, source in sources.items():
+            for exporter, times in measure(source, runs).items():
+                print(f"{statistics.median(times):8.1f} ms (best {min(times):6.1f} ms)  "
+                      f"{exporter} ({name})")
+
+
+if __name__ == '__main__':
+    main()
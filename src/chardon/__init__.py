@@ -1,11 +1,52 @@
 # pylint: disable=missing-module-docstring
-from .code_parser import *
-from .article_builder import *
-from .code_arranger import *
-from .content_parser import *
-from .documentation import *
-from .exporter import *
-from .extraexporter import *
-
-# Setting default parameter
-Content.parser = MarkdownParser
+import importlib
+
+# Public API, by subpackage. Subpackages are only imported when one of their names is used
+# (PEP 562), so importing chardon stays fast and optional modules (sqlite3...) load only if needed
+_SUBPACKAGES: dict[str, list[str]] = {
+    'code_parser': ['Type', 'ArrayOfType', 'DictOfType', 'SpecificType', 'Parameter', 'Function',
+                    'Field', 'Scope', 'Class', 'ClassVariant', 'LanguageParser', 'ParsingError',
+                    'Coverage', 'CSharpParser'],
+    'article_builder': ['ContentParser', 'RunContext', 'Content', 'ContentType', 'TextStyle',
+                        'TableRow', 'TableCell', 'CalloutType', 'LazyTextContent',
+                        'TableOfContentABC', 'ListTableOfContent', 'TableTableOfContent', 'Article',
+                        'ContentArena', 'ArenaContent'],
+    'code_arranger': ['ReferenceKind', 'Reference', 'ReferenceIndex', 'InheritanceClosure',
+                      'PageSplit', 'DocumentationError', 'DocArticle'],
+    'content_parser': ['MarkdownParser', 'NoParser'],
+    'diagnostics': ['Diagnostics'],
+    'documentation': ['ProjectManager', 'SymbolTable', 'ResolutionContext', 'BuildManifest',
+                      'SearchIndex', 'CoverageReport', 'Source', 'DirectorySource', 'ZipSource',
+                      'TarSource', 'MemorySource', 'GitTreeSource', 'Sink', 'DirectorySink',
+                      'ZipSink', 'TarSink', 'MemorySink', 'ContentAddressedSink'],
+    'exporter': ['ContentExport', 'MarkdownContentBreaklineType', 'MarkdownContentExport',
+                 'ObsidianFlavoredMarkdownContentExport', 'HtmlContentExport'],
+    'extraexporter': ['ObsidianGraphColorer', 'SqliteExporter'],
+}
+
+# Public name -> subpackage
+_LAZY_ATTRIBUTES: dict[str, str] = {name: subpackage
+                                    for subpackage, names in _SUBPACKAGES.items()
+                                    for name in names}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    """
+    Import the subpackage of a public name on first access
+    @param name: Name
+    @return: Class (or function) defined by the subpackage
+    """
+    if name in _SUBPACKAGES:
+        return importlib.import_module(f'.{name}', __name__)
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_LAZY_ATTRIBUTES[name]}', __name__), name)
+    # Cached, so next accesses don't go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,6 @@
+# pylint: disable=missing-module-docstring
+import sys
+
+from chardon.cli import main
+
+sys.exit(main())
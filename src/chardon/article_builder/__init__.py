@@ -1,5 +1,8 @@
 # pylint: disable=missing-module-docstring
 from .text_parser import ContentParser
-from .content import Content, ContentType, TextStyle, TableRow, TableCell, CalloutType
+from .run_context import RunContext
+from .content import Content, ContentType, TextStyle, TableRow, TableCell, CalloutType, \
+    LazyTextContent
 from .summary import *
 from .article import Article
+from .content_arena import ContentArena, ArenaContent
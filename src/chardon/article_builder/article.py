@@ -4,6 +4,7 @@ Basic Article
 from typing import List
 
 from chardon.article_builder.content import Content
+from chardon.article_builder.content_arena import ContentArena
 from chardon.article_builder.summary.abc_table_of_content import TableOfContentABC
 from chardon.article_builder.summary.list_table_of_content import ListTableOfContent
 
@@ -39,6 +40,16 @@ class Article:
         """
         return [self.header] + self.table_of_contents.get_contents() + self.contents
 
+    def to_arena(self) -> ContentArena:
+        """
+        Return Article as a compact ContentArena
+        Useful to keep many articles in memory before exporting them
+        @return: ContentArena, its roots being the Contents of the article
+        """
+        arena = ContentArena()
+        arena.from_contents(self.to_contents())
+        return arena
+
     def set_title(self, title: str):
         """
         Set the title of the note
@@ -5,6 +5,7 @@ from enum import Enum, auto, Flag
 from typing import List
 
 from chardon.article_builder import ContentParser
+from chardon.article_builder.run_context import content_parser
 
 
 class CalloutType(str, Enum):
@@ -122,6 +123,7 @@ class TableRow:
 
 
 # pylint: disable=invalid-name
+# pylint: disable=too-many-public-methods
 class Content:
     """
     Class that define the bases of content registration.
@@ -129,13 +131,19 @@ class Content:
     Eg : it will store title, and not <h2>...</h2> or ## ...
     """
 
-    # Need to be set at runtime, to specify which class to use as Parser
-    parser: type[ContentParser]
-
     def __init__(self, content_type: ContentType, attributes: dict):
         self.type = content_type
         self.attributes = attributes
 
+    @staticmethod
+    def get_parser() -> type[ContentParser]:
+        """
+        Class used to parse text : the parser of the current run (see RunContext),
+        MarkdownParser outside of runs
+        @return: Parser class
+        """
+        return content_parser()
+
     def __repr__(self):
         return f"<{self.type.name}{' '.join(map(str, self.attributes.get('children', [])))}>"
 
@@ -198,6 +206,19 @@ class Content:
         attr['text'] = text
         return Content(ContentType.TEXT, attr)
 
+    @staticmethod
+    def Literal(text: str, attributes: dict = None) -> 'Content':
+        """
+        Create a Text Content holding a name from the code (class, member, type...)
+        It isn't parsed, and exporters escape it so that it is rendered as is
+        @param text: Name
+        @param attributes: optional custom attributes
+        @return: Text Content
+        """
+        attr = attributes or {}
+        attr['literal'] = True
+        return Content.Text(text, attr)
+
     @staticmethod
     def FromText(text: str) -> 'Content':
         """
@@ -205,7 +226,18 @@ class Content:
         @param text: text to parse
         @return: Span Content with parsed text inside
         """
-        return Content.Span(Content.parser(text).parse())
+        return Content.Span(Content.get_parser()(text).parse())
+
+    @staticmethod
+    def LazyText(text: str, attributes: dict = None) -> 'LazyTextContent':
+        """
+        Create a Span Content, from text that will only be parsed when first rendered
+        Useful for long texts (summaries, remarks...) of pages that may never be exported
+        @param text: text to parse
+        @param attributes: optional custom attributes
+        @return: Span Content with parsed text inside
+        """
+        return LazyTextContent(text, attributes)
 
     @staticmethod
     def Span(children: List['Content'], style: TextStyle = TextStyle.REGULAR,
@@ -436,3 +468,37 @@ class Content:
                                     for content in entries]
 
         return Content(ContentType.LIST, attr)
+
+
+class LazyTextContent(Content):
+    """
+    Span Content holding raw text, parsed the first time its attributes are read (usually by an
+    exporter), the result being kept on the node
+    The text is parsed with the parser of the run the Content was created in
+    """
+
+    def __init__(self, text: str, attributes: dict = None):
+        self.raw_text = text
+        self.parsed = False
+        self.parser: type[ContentParser] = content_parser()
+        super().__init__(ContentType.SPAN, attributes or {})
+
+    @property
+    def attributes(self) -> dict:
+        """
+        Attributes of the Span, parsing the text on first access
+        @return: attributes
+        """
+        if not self.parsed:
+            # Marked as parsed only once complete : if the parser raises, the next read parses
+            # again, and threads reading at once never see a Span without children
+            # (they may both parse it, to the same result)
+            children = self.parser(self.raw_text).parse()
+            self._attributes.setdefault('style', TextStyle.REGULAR)
+            self._attributes['children'] = children
+            self.parsed = True
+        return self._attributes
+
+    @attributes.setter
+    def attributes(self, attributes: dict):
+        self._attributes = attributes
@@ -0,0 +1,653 @@
+"""
+Compact, array-backed representation of a Content tree
+"""
+from array import array
+from typing import Dict, List
+
+from chardon.article_builder.content import Content, ContentType, TextStyle, TableRow, TableCell
+
+# Type code of the rows of a table (not a ContentType, only exists inside the arena)
+_ROW: int = 0
+_NO_TEXT: int = -1
+_HEADER: int = ContentType.HEADER.value
+
+# ContentType of each type code, avoiding the (slow) Enum call
+_CONTENT_TYPES: Dict[int, ContentType] = {content_type.value: content_type
+                                          for content_type in ContentType}
+
+# Bits of the link flags
+_INTERNAL_LINK: int = 1
+_LINK_TO_ANOTHER_PAGE: int = 2
+_EMBED: int = 4
+
+# Attributes stored in the arrays, other attributes are kept in a sparse dict
+_STORED_ATTRIBUTES: Dict[ContentType, frozenset] = {
+    ContentType.SECTION: frozenset({'children'}),
+    ContentType.TEXT: frozenset({'text'}),
+    ContentType.SPAN: frozenset({'children', 'style', 'separator'}),
+    ContentType.LIST: frozenset({'children', 'ordered'}),
+    ContentType.LIST_ENTRY: frozenset({'entry', 'level'}),
+    ContentType.TITLE: frozenset({'text', 'level'}),
+    ContentType.QUOTE: frozenset({'quote'}),
+    ContentType.CODE: frozenset({'text', 'language'}),
+    ContentType.TABLE: frozenset({'headers', 'rows'}),
+    ContentType.LINK: frozenset({'text', 'target', 'internal-link', 'link_to_another_page',
+                                 'embed'}),
+    ContentType.COMMENT: frozenset({'text'}),
+}
+
+
+# pylint: disable=too-many-instance-attributes,too-many-public-methods
+class ContentArena:
+    """
+    Store a Content tree as parallel arrays instead of one object (and dict) per node :
+    each node is an index, with a type code, a parent, a range of children,
+    up to two interned strings, a style bitmask and a number (level, ordered, flags...).
+    Rare attributes (quote author, image uri, header metadata...) are kept in a sparse dict.
+
+    Factories mirror the Content ones, but return the index of the created node.
+    Exporters walk the arena through ArenaContent views (see roots) :
+    rendering costs a bit more CPU than plain Contents, as views are rebuilt on the fly,
+    but a page held in an arena is a handful of arrays instead of one object per node
+    """
+
+    def __init__(self):
+        self.types = array('B')
+        self.parents = array('l')
+        self.first_children = array('l')
+        self.children_counts = array('l')
+        self.texts = array('l')
+        self.seconds = array('l')
+        self.styles = array('B')
+        self.numbers = array('l')
+
+        # Children of every node, each node's children being contiguous
+        self.children = array('l')
+        self.strings: List[str] = []
+        self.extras: Dict[int, dict] = {}
+        self.root_nodes: List[int] = []
+        self._string_ids: Dict[str, int] = {}
+
+    def __len__(self):
+        return len(self.types)
+
+    def intern(self, text: str | None) -> int:
+        """
+        Intern a string
+        @param text: String
+        @return: Id of the string
+        """
+        if text is None:
+            return _NO_TEXT
+        string_id = self._string_ids.get(text)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(text)
+            self._string_ids[text] = string_id
+        return string_id
+
+    def string(self, string_id: int) -> str | None:
+        """
+        Get an interned string
+        @param string_id: Id of the string
+        @return: String
+        """
+        return None if string_id == _NO_TEXT else self.strings[string_id]
+
+    # pylint: disable=too-many-arguments
+    def _add(self, type_code: int, children: List[int] = (), *, text: str = None,
+             second: str = None, style: int = 0, number: int = 0, extras: dict = None) -> int:
+        """
+        Add a node
+        @return: Index of the node
+        """
+        index = len(self.types)
+        self.types.append(type_code)
+        self.parents.append(-1)
+        self.first_children.append(len(self.children))
+        self.children_counts.append(len(children))
+        self.texts.append(self.intern(text))
+        self.seconds.append(self.intern(second))
+        self.styles.append(style)
+        self.numbers.append(number)
+
+        for child in children:
+            self.children.append(child)
+            self.parents[child] = index
+
+        if extras:
+            self.extras[index] = extras
+        return index
+
+    @staticmethod
+    def _extras(content_type: ContentType, attributes: dict | None) -> dict | None:
+        """
+        Keep only the attributes that are not stored in the arrays
+        """
+        if not attributes:
+            return None
+        stored = _STORED_ATTRIBUTES.get(content_type, frozenset())
+        return {key: value for key, value in attributes.items() if key not in stored} or None
+
+    def get_children(self, index: int) -> array:
+        """
+        Get children of a node
+        @param index: Node
+        @return: Indexes of the children
+        """
+        first = self.first_children[index]
+        return self.children[first:first + self.children_counts[index]]
+
+    def add_root(self, index: int) -> int:
+        """
+        Add a node at the root of the page
+        @param index: Node
+        @return: Node
+        """
+        self.root_nodes.append(index)
+        return index
+
+    def roots(self) -> List['ArenaContent']:
+        """
+        Return the root nodes, as contents that any exporter can render
+        @return: List of Contents
+        """
+        return [ArenaContent(self, index) for index in self.root_nodes]
+
+    def set_style(self, index: int, style: TextStyle):
+        """
+        Change the style of a Span
+        @param index: Node
+        @param style: New style
+        """
+        self.styles[index] = style.value
+
+    def add_children(self, index: int, child: int):
+        """
+        Insert a child inside a Section or a Span
+        Children must stay contiguous, so the node's children are moved at the end if needed
+        @param index: Node
+        @param child: Child to add
+        """
+        if self.types[index] not in (ContentType.SECTION.value, ContentType.SPAN.value):
+            raise AttributeError(f'Trying to fit a children inside a '
+                                 f'{_CONTENT_TYPES.get(self.types[index])} content')
+        first, count = self.first_children[index], self.children_counts[index]
+        if first + count != len(self.children):
+            self.children.extend(self.children[first:first + count])
+            self.first_children[index] = len(self.children) - count
+        self.children.append(child)
+        self.children_counts[index] = count + 1
+        self.parents[child] = index
+
+    # pylint: disable=too-many-return-statements,too-many-branches
+    def from_content(self, content: Content) -> int:
+        """
+        Copy a Content tree inside the arena
+        @param content: Content
+        @return: Index of the copied node
+        """
+        attributes = content.attributes
+        match content.type:
+            case ContentType.SECTION:
+                return self.Section([self.from_content(child) for child in attributes['children']],
+                                    self._extras(content.type, attributes))
+            case ContentType.HEADER:
+                return self.Header(attributes)
+            case ContentType.TEXT:
+                return self.Text(attributes['text'], self._extras(content.type, attributes))
+            case ContentType.SPAN:
+                return self.Span([self.from_content(child) for child in attributes['children']],
+                                 attributes['style'], attributes)
+            case ContentType.LIST:
+                return self._add(ContentType.LIST.value,
+                                 [self.from_content(child) for child in attributes['children']],
+                                 number=int(attributes['ordered']),
+                                 extras=self._extras(content.type, attributes))
+            case ContentType.LIST_ENTRY:
+                return self.ListEntry(self.from_content(attributes['entry']), attributes['level'],
+                                      attributes.get('completed'),
+                                      self._extras(content.type, attributes))
+            case ContentType.TITLE:
+                return self.Title(attributes['text'], attributes['level'],
+                                  self._extras(content.type, attributes))
+            case ContentType.QUOTE:
+                return self._add(ContentType.QUOTE.value, [self.from_content(attributes['quote'])],
+                                 extras=self._extras(content.type, attributes))
+            case ContentType.CODE:
+                return self.Code(attributes['text'], attributes.get('language'),
+                                 self._extras(content.type, attributes))
+            case ContentType.TABLE:
+                return self._table([self.from_content(head) for head in attributes['headers']],
+                                   [[(self.from_content(cell.content), cell.size)
+                                     for cell in row.cells] for row in attributes['rows']],
+                                   self._extras(content.type, attributes))
+            case ContentType.LINK:
+                flags = _INTERNAL_LINK * bool(attributes.get('internal-link')) \
+                    | _LINK_TO_ANOTHER_PAGE * bool(attributes.get('link_to_another_page')) \
+                    | _EMBED * bool(attributes.get('embed'))
+                return self._add(ContentType.LINK.value, text=attributes['text'],
+                                 second=str(attributes['target']), number=flags,
+                                 extras=self._extras(content.type, attributes))
+            case _:
+                return self._add(content.type.value, text=attributes.get('text'),
+                                 extras=self._extras(content.type, attributes))
+
+    def from_contents(self, contents: List[Content]) -> List[int]:
+        """
+        Copy Contents at the root of the arena
+        @param contents: Contents (eg. from Article.to_contents)
+        @return: Indexes of the copied nodes
+        """
+        return [self.add_root(self.from_content(content)) for content in contents]
+
+    # pylint: disable=invalid-name
+    def Section(self, children: List[int], attributes: dict = None) -> int:
+        """
+        Create a Section node, which hold children
+        @param children: children nodes
+        @param attributes: optional custom attributes
+        @return: Section node
+        """
+        return self._add(ContentType.SECTION.value, children,
+                         extras=self._extras(ContentType.SECTION, attributes))
+
+    def Header(self, attributes: dict) -> int:
+        """
+        Create a Header node, which hold attributes and metadata
+        @param attributes: attributes
+        @return: Header node
+        """
+        return self._add(ContentType.HEADER.value, extras=attributes)
+
+    def Text(self, text: str, attributes: dict = None) -> int:
+        """
+        Create a Text node, which hold plain text
+        @param text: Text
+        @param attributes: optional custom attributes
+        @return: Text node
+        """
+        return self._add(ContentType.TEXT.value, text=text,
+                         extras=self._extras(ContentType.TEXT, attributes))
+
+    def Literal(self, text: str, attributes: dict = None) -> int:
+        """
+        Create a Text node holding a name from the code, escaped by exporters (see Content.Literal)
+        @param text: Name
+        @param attributes: optional custom attributes
+        @return: Text node
+        """
+        return self.Text(text, {**(attributes or {}), 'literal': True})
+
+    def FromText(self, text: str) -> int:
+        """
+        Create a Span node, from text that will be parsed
+        @param text: text to parse
+        @return: Span node with parsed text inside
+        """
+        parsed = Content.get_parser()(text).parse()
+        return self.Span([self.from_content(content) for content in parsed])
+
+    def Span(self, children: List[int], style: TextStyle = TextStyle.REGULAR,
+             attributes: dict = None) -> int:
+        """
+        Create a Span node, which hold formatting and sub-span or text node
+        @param children: nodes within this span
+        @param style: Formatting this span gives
+        @param attributes: optional custom attributes
+        @return: Span node
+        """
+        separator = attributes.get('separator') if attributes else None
+        return self._add(ContentType.SPAN.value, children, second=separator, style=style.value,
+                         extras=self._extras(ContentType.SPAN, attributes))
+
+    def Title(self, title: str, level: int = 1, attributes: dict = None) -> int:
+        """
+        Create a Title node
+        @param title: Title
+        @param level: Level of the title (starting from 1, which is the default)
+        @param attributes: optional custom attributes
+        @return: Title node
+        """
+        return self._add(ContentType.TITLE.value, text=title, number=level,
+                         extras=self._extras(ContentType.TITLE, attributes))
+
+    # pylint: disable=too-many-arguments
+    def QuoteText(self, quote: str, author: str = None,
+                  date: str = None, location: str = None,
+                  attributes: dict = None) -> int:
+        """
+        Create a Quote node from a text (use .Quote for quoting a node)
+        @param quote: text to quote
+        @param author: Who made this quote
+        @param date: When this quote was made
+        @param location: Where this quote was made
+        @param attributes: optional custom attributes
+        @return: Quote node
+        """
+        return self.Quote(self.FromText(quote), author, date, location, attributes)
+
+    # pylint: disable=too-many-arguments
+    def Quote(self, quote: int, author: str = None,
+              date: str = None, location: str = None,
+              attributes: dict = None) -> int:
+        """
+        Create a Quote node from another node (use .QuoteText for quoting a string)
+        @param quote: node to quote
+        @param author: Who made this quote
+        @param date: When this quote was made
+        @param location: Where this quote was made
+        @param attributes: optional custom attributes
+        @return: Quote node
+        """
+        extras = dict(attributes or {})
+        if author:
+            extras['author'] = author
+        if date:
+            extras['date'] = date
+        if location:
+            extras['location'] = location
+        return self._add(ContentType.QUOTE.value, [quote], extras=extras)
+
+    def Code(self, code: str, language: str = None, attributes: dict = None) -> int:
+        """
+        Create a Code node, which hold code from a specific language
+        @param code: Code
+        @param language: Name of the language
+        @param attributes: optional custom attributes
+        @return: Code node
+        """
+        return self._add(ContentType.CODE.value, text=code, second=language,
+                         extras=self._extras(ContentType.CODE, attributes))
+
+    def Separator(self, attributes: dict = None) -> int:
+        """
+        Create an horizontal Separator
+        @param attributes: optional custom attributes
+        @return: Separator node
+        """
+        return self._add(ContentType.SEPARATOR.value, extras=attributes)
+
+    def _table(self, headers: List[int], rows: List[List[tuple[int, int]]],
+               attributes: dict = None) -> int:
+        """
+        Create a Table node, its children being the headers followed by the rows
+        @param headers: header nodes
+        @param rows: rows, as lists of (cell node, cell size)
+        @param attributes: optional custom attributes
+        @return: Table node
+        """
+        row_indexes = []
+        for row in rows:
+            sizes = [size for _, size in row]
+            row_indexes.append(self._add(_ROW, [cell for cell, _ in row],
+                                         extras={'sizes': sizes} if any(
+                                             size != 1 for size in sizes) else None))
+        return self._add(ContentType.TABLE.value, headers + row_indexes, number=len(headers),
+                         extras=self._extras(ContentType.TABLE, attributes))
+
+    def Table(self, headers: List[str] | List[int], rows: List[List[str] | List[int]],
+              attributes: dict = None) -> int:
+        """
+        Create a Table node
+        @param headers: Name of the columns (or nodes)
+        @param rows: Rows within it, as list of texts (or nodes)
+        @param attributes: optional custom attributes
+        @return: Table node
+        """
+        return self._table([self.FromText(head) if isinstance(head, str) else head
+                            for head in headers],
+                           [[(self.FromText(cell) if isinstance(cell, str) else cell, 1)
+                             for cell in row] for row in rows], attributes)
+
+    def Image(self, uri: str, alt: str, link: str = "", attributes: dict = None) -> int:
+        """
+        Create an Image node
+        @param uri: URI of the image
+        @param alt: Alt text
+        @param link: Link to open when clicking the image
+        @param attributes: optional custom attributes
+        @return: Image node
+        """
+        extras = dict(attributes or {})
+        extras['uri'] = uri
+        extras['alt'] = alt
+        if link:
+            extras['link'] = link
+        return self._add(ContentType.IMAGE.value, extras=extras)
+
+    def Link(self, text: str, target: str, alt: str = "", attributes: dict = None) -> int:
+        """
+        Create a Link node
+        @param text: Text
+        @param target: Target where this link points to
+        @param alt: Alt text
+        @param attributes: optional custom attributes
+        @return: Link node
+        """
+        extras = self._extras(ContentType.LINK, attributes) or {}
+        if alt:
+            extras['alt'] = alt
+        flags = _LINK_TO_ANOTHER_PAGE if attributes and attributes.get('link_to_another_page') \
+            else 0
+        return self._add(ContentType.LINK.value, text=text, second=str(target), number=flags,
+                         extras=extras)
+
+    def InternalLink(self, text: str, target: str = None, attributes: dict = None) -> int:
+        """
+        Create a Link node that is internal and only has text by default
+        @param text: Text
+        @param target: Text (will be set to text if not specified)
+        @param attributes: optional custom attributes
+        @return: Link node
+        """
+        return self._add(ContentType.LINK.value, text=text, second=str(target or text),
+                         number=_INTERNAL_LINK,
+                         extras=self._extras(ContentType.LINK, attributes))
+
+    def Comment(self, comment: str, attributes: dict = None) -> int:
+        """
+        Create a Comment node, for debug purpose
+        @param comment: Comment
+        @param attributes: optional custom attributes
+        @return: Comment node
+        """
+        return self._add(ContentType.COMMENT.value, text=comment,
+                         extras=self._extras(ContentType.COMMENT, attributes))
+
+    def ListEntry(self, entry: int, level: int = 0,
+                  completed: bool = None, attributes: dict = None) -> int:
+        """
+        Create a List Entry node
+        @param entry: Entry node
+        @param level: Level of the entry (starts at 0 for main list)
+        @param completed: checked tasked or not (None for no checkbox at all)
+        @param attributes: optional custom attributes
+        @return: List Entry node
+        """
+        extras = self._extras(ContentType.LIST_ENTRY, attributes) or {}
+        if completed is not None:
+            extras['completed'] = completed
+        return self._add(ContentType.LIST_ENTRY.value, [entry], number=level, extras=extras)
+
+    def node_attributes(self, index: int) -> dict:
+        """
+        Rebuild the attributes of a node, as a Content would hold them
+        Children are returned as ArenaContent views
+        @param index: Node
+        @return: Attributes
+        """
+        type_code = self.types[index]
+        extras = self.extras.get(index)
+        if type_code == _HEADER:
+            return extras if extras is not None else {}
+
+        attributes: dict = extras.copy() if extras is not None else {}
+        text_id = self.texts[index]
+        if text_id != _NO_TEXT:
+            attributes['text'] = self.strings[text_id]
+
+        reader = self._READERS.get(type_code)
+        if reader is not None:
+            reader(self, index, attributes)
+        return attributes
+
+    def _views(self, index: int) -> List['ArenaContent']:
+        """
+        Return children of a node as views
+        @param index: Node
+        @return: Views
+        """
+        first = self.first_children[index]
+        return [ArenaContent(self, child)
+                for child in self.children[first:first + self.children_counts[index]]]
+
+    def _read_children(self, index: int, attributes: dict):
+        """
+        Read children of a Section
+        """
+        attributes['children'] = self._views(index)
+
+    def _read_list(self, index: int, attributes: dict):
+        """
+        Read children of a List, and whether it is ordered
+        """
+        attributes['children'] = self._views(index)
+        attributes['ordered'] = bool(self.numbers[index])
+
+    def _read_span(self, index: int, attributes: dict):
+        """
+        Read children, style and separator of a Span
+        """
+        attributes['children'] = self._views(index)
+        attributes['style'] = _TEXT_STYLES[self.styles[index]]
+        separator_id = self.seconds[index]
+        if separator_id != _NO_TEXT:
+            attributes['separator'] = self.strings[separator_id]
+
+    def _read_list_entry(self, index: int, attributes: dict):
+        """
+        Read entry and level of a List Entry
+        """
+        attributes['entry'] = ArenaContent(self, self.children[self.first_children[index]])
+        attributes['level'] = self.numbers[index]
+
+    def _read_title(self, index: int, attributes: dict):
+        """
+        Read level of a Title
+        """
+        attributes['level'] = self.numbers[index]
+
+    def _read_quote(self, index: int, attributes: dict):
+        """
+        Read the quoted node of a Quote
+        """
+        attributes['quote'] = ArenaContent(self, self.children[self.first_children[index]])
+
+    def _read_code(self, index: int, attributes: dict):
+        """
+        Read language of a Code
+        """
+        attributes['language'] = self.string(self.seconds[index])
+
+    def _read_table(self, index: int, attributes: dict):
+        """
+        Read headers and rows of a Table
+        """
+        children = self.get_children(index)
+        header_count = self.numbers[index]
+        attributes['headers'] = [ArenaContent(self, head) for head in children[:header_count]]
+        attributes['rows'] = [self._row(row) for row in children[header_count:]]
+
+    def _read_link(self, index: int, attributes: dict):
+        """
+        Read target and flags of a Link
+        """
+        attributes['target'] = self.strings[self.seconds[index]]
+        flags = self.numbers[index]
+        if flags & _INTERNAL_LINK:
+            attributes['internal-link'] = True
+        if flags & _LINK_TO_ANOTHER_PAGE:
+            attributes['link_to_another_page'] = True
+        if flags & _EMBED:
+            attributes['embed'] = True
+
+    def _row(self, index: int) -> TableRow:
+        """
+        Rebuild a TableRow from a row node
+        @param index: Row node
+        @return: TableRow
+        """
+        children = self.get_children(index)
+        sizes = self.extras.get(index, {}).get('sizes') or [1] * len(children)
+        return TableRow([TableCell(ArenaContent(self, cell), size)
+                         for cell, size in zip(children, sizes)])
+
+
+    # Note : We put this method at the very end, as typing List would refer to it afterward
+    # (see Content.List)
+    def List(self, entries: List[str] | List[int], ordered: bool = False,
+             attributes: dict = None, checkbox: bool = None) -> int:
+        """
+        Create a List node, containing List Entry nodes
+        @param entries: Entries in the list, as texts or nodes
+        @param ordered: Ordered list or not
+        @param attributes: optional custom attributes
+        @param checkbox: Default state of the checkbox (None for no checkbox)
+        @return: List node
+        """
+        children = []
+        for entry in entries:
+            if isinstance(entry, str):
+                children.append(self.ListEntry(self.FromText(entry), completed=checkbox))
+            elif self.types[entry] == ContentType.LIST_ENTRY.value:
+                children.append(entry)
+            else:
+                children.append(self.ListEntry(entry))
+        return self._add(ContentType.LIST.value, children, number=int(ordered),
+                         extras=self._extras(ContentType.LIST, attributes))
+
+    # Attribute readers of each type code
+    _READERS = {
+        ContentType.SECTION.value: _read_children,
+        ContentType.LIST.value: _read_list,
+        ContentType.SPAN.value: _read_span,
+        ContentType.LIST_ENTRY.value: _read_list_entry,
+        ContentType.TITLE.value: _read_title,
+        ContentType.QUOTE.value: _read_quote,
+        ContentType.CODE.value: _read_code,
+        ContentType.TABLE.value: _read_table,
+        ContentType.LINK.value: _read_link,
+    }
+
+
+# TextStyle of each bitmask
+_TEXT_STYLES: Dict[int, TextStyle] = {value: TextStyle(value)
+                                      for value in range(1 << len(TextStyle))}
+
+
+class ArenaContent:
+    """
+    Lightweight view of a node of a ContentArena, that exporters render as any Content
+    Views are created while walking the arena, and dropped right after
+    """
+    __slots__ = ('arena', 'index', 'type', '_attributes')
+
+    def __init__(self, arena: ContentArena, index: int):
+        self.arena = arena
+        self.index = index
+        self.type: ContentType = _CONTENT_TYPES[arena.types[index]]
+        self._attributes: dict | None = None
+
+    @property
+    def attributes(self) -> dict:
+        """
+        Attributes of the node, rebuilt on first access
+        @return: Attributes
+        """
+        if self._attributes is None:
+            self._attributes = self.arena.node_attributes(self.index)
+        return self._attributes
+
+    def __repr__(self):
+        return f"<{self.type.name} #{self.index}>"
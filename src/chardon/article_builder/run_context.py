@@ -0,0 +1,92 @@
+"""
+Settings and caches of a run, passed explicitly instead of being kept as class state
+"""
+import contextlib
+import contextvars
+from typing import Dict, Iterator
+
+from chardon.article_builder.text_parser import ContentParser
+
+# RunContext of the current thread (or task), None outside of runs
+_active: contextvars.ContextVar = contextvars.ContextVar('chardon_run_context', default=None)
+
+
+class RunContext:
+    """
+    Everything a run (building articles and exporting pages) reads besides its input :
+    the class parsing texts into Contents, the params of exporters, and caches
+    Runs never share a RunContext, and exporters never change while rendering (see
+    ContentExport.bind), so ProjectManagers with different settings can run at once in threads
+    """
+
+    def __init__(self, parser: type[ContentParser] = None, params: Dict[type, dict] = None):
+        """
+        Create the context of a run
+        @param parser: Class parsing texts into Contents (default: MarkdownParser)
+        @param params: Exporter class -> params overriding the ones of its exporters for this run
+        """
+        if parser is None:
+            # pylint: disable=import-outside-toplevel
+            from chardon.content_parser.markdown_parser import MarkdownParser
+            parser = MarkdownParser
+        self.parser: type[ContentParser] = parser
+        self.params: Dict[type, dict] = params or {}
+        # Caches of the run, by name (eg. shapes of classes, see BuildManifest.signature)
+        self.caches: Dict[str, dict] = {}
+
+    def params_of(self, exporter) -> dict:
+        """
+        Params an exporter renders the pages of this run with
+        @param exporter: ContentExport
+        @return: Params of the exporter, overridden by the ones given for its class
+        (or a parent class) to this run
+        """
+        params = dict(exporter.params)
+        for class_ in reversed(type(exporter).__mro__):
+            params.update(self.params.get(class_, {}))
+        return params
+
+    def cache(self, name: str) -> dict:
+        """
+        Cache of the run
+        @param name: Name of the cache
+        @return: Cache, empty the first time
+        """
+        cache = self.caches.get(name)
+        if cache is None:
+            cache = self.caches[name] = {}
+        return cache
+
+    @contextlib.contextmanager
+    def active(self) -> Iterator['RunContext']:
+        """
+        Make this context the one of the current thread (or task) : Contents created
+        in it parse their text with its parser
+        @return: self
+        """
+        token = _active.set(self)
+        try:
+            yield self
+        finally:
+            _active.reset(token)
+
+
+def current_run() -> RunContext | None:
+    """
+    RunContext of the current thread (or task)
+    @return: RunContext, None outside of runs
+    """
+    return _active.get()
+
+
+def content_parser() -> type[ContentParser]:
+    """
+    Class parsing texts into Contents, in the current run
+    @return: Parser of the current RunContext, MarkdownParser outside of runs
+    """
+    context: RunContext | None = _active.get()
+    if context is not None:
+        return context.parser
+    # pylint: disable=import-outside-toplevel
+    from chardon.content_parser.markdown_parser import MarkdownParser
+    return MarkdownParser
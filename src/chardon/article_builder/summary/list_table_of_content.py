@@ -1,9 +1,9 @@
 """
 Basic List Table Of Content
 """
-import logging
 from typing import List
 
+from chardon import diagnostics
 from chardon.article_builder.content import Content
 from chardon.article_builder.summary import TableOfContentABC
 
@@ -30,10 +30,7 @@ class ListTableOfContent(TableOfContentABC):
         self.entries.append([text, uri])
 
         if description is not None:
-            logging.warning("%s recieved description for an entry (%s),"
-                            "but doesn't support description."
-                            "This content will be skipped",
-                            self.__class__.__name__, text)
+            diagnostics.record('toc-description', symbol=text, detail=self.__class__.__name__)
 
     def get_contents(self) -> List[Content]:
         """
@@ -32,7 +32,7 @@ class TableTableOfContent(TableOfContentABC):
             Content.Table(['Name', 'Description'], [
                 TableRow([
                     Content.InternalLink(text, uri),
-                    Content.FromText(description)
+                    Content.LazyText(description)
                 ]) for (text, uri, description) in self.entries
             ]),
             Content.Separator()
@@ -0,0 +1,514 @@
+"""
+Command line interface : chardon build | watch | stats | serve | call
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import chardon
+from chardon.diagnostics import ISSUES, Diagnostics
+
+# Exporters, by format name (imported only when used)
+FORMATS: Dict[str, str] = {
+    'markdown': 'MarkdownContentExport',
+    'obsidian': 'ObsidianFlavoredMarkdownContentExport',
+    'html': 'HtmlContentExport',
+}
+
+# Parser, and files parsed by default, by language
+LANGUAGES: Dict[str, Tuple[str, str]] = {
+    'csharp': ('CSharpParser', r'.*\.cs$'),
+}
+
+# Sinks, by extension of the output (a directory otherwise)
+ARCHIVES: Dict[str, str] = {
+    '.zip': 'ZipSink',
+    '.tar': 'TarSink',
+    '.gz': 'TarSink',
+    '.tgz': 'TarSink',
+    '.bz2': 'TarSink',
+    '.xz': 'TarSink',
+}
+
+
+class Trace:
+    """
+    Duration of each step of a run, written in the Chrome trace event format
+    (readable with chrome://tracing or Perfetto)
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.events: List[dict] = []
+
+    @contextmanager
+    def span(self, name: str, **args) -> Iterator[None]:
+        """
+        Time a step, as a context manager
+        @param name: Name of the step
+        @param args: Details about the step
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.events.append({'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': 0,
+                                'ts': round((start - self.start) * 1e6),
+                                'dur': round(duration * 1e6), 'args': args})
+            logging.info("%s : %.1f ms", name, duration * 1000)
+
+    def durations(self) -> Dict[str, float]:
+        """
+        Total duration of each step
+        @return: Name -> duration, in milliseconds
+        """
+        durations: Dict[str, float] = {}
+        for event in self.events:
+            durations[event['name']] = durations.get(event['name'], 0) + event['dur'] / 1000
+        return durations
+
+    def save(self, path: Path):
+        """
+        Write the trace
+        @param path: Path of the trace file
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+
+
+def target_option(text: str) -> Tuple[str, Path]:
+    """
+    Parse a --target option
+    @param text: FORMAT:PATH, eg. html:out/html or markdown:out/doc.zip
+    @return: Format, and output
+    """
+    name, separator, path = text.partition(':')
+    if not separator or name not in FORMATS or not path:
+        raise argparse.ArgumentTypeError(f"invalid target {text!r}, expected FORMAT:PATH "
+                                         f"with FORMAT in {', '.join(FORMATS)}")
+    return name, Path(path)
+
+
+def _target(target: Tuple[str, Path]) -> Tuple['chardon.ContentExport', 'chardon.Sink | Path']:
+    """
+    Create the exporter of a target, and where it writes
+    @param target: Format, and output
+    @return: Exporter, and output directory or Sink
+    """
+    name, path = target
+    sink = ARCHIVES.get(path.suffix)
+    return getattr(chardon, FORMATS[name])(), \
+        getattr(chardon, sink)(path) if sink is not None else path
+
+
+def _project(args: argparse.Namespace, targets: List[Tuple]) -> 'chardon.ProjectManager':
+    """
+    Create the ProjectManager described by the options, without parsing anything yet
+    @param args: Options
+    @param targets: Exporters, and where they write
+    @return: ProjectManager
+    """
+    parser, include = LANGUAGES[args.language]
+    if args.include:
+        include = '|'.join(f'(?:{pattern})' for pattern in args.include)
+    exclude = '|'.join(f'(?:{pattern})' for pattern in args.exclude) if args.exclude else None
+    return chardon.ProjectManager(getattr(chardon, parser)(), None, None, None,
+                                  file_regex=include, encoding=args.encoding, targets=targets,
+                                  exclude_regex=exclude, workers=args.workers)
+
+
+def _parse(project: 'chardon.ProjectManager', args: argparse.Namespace, trace: Trace):
+    """
+    Parse and resolve the project described by the options
+    @param project: ProjectManager
+    @param args: Options
+    @param trace: Trace
+    """
+    cache_dir: Path | None = args.cache_dir
+    if getattr(args, 'revision', None) is not None:
+        with trace.span('parse', revision=args.revision):
+            project.parse_git(args.project, args.revision, args.previous, args.directory,
+                              cache_dir / 'git-parse-cache' if cache_dir is not None else None)
+        return
+
+    with trace.span('parse', workers=args.workers):
+        project.parse_source(chardon.DirectorySource(args.project),
+                             cache=cache_dir / 'parse-cache' if cache_dir is not None else None)
+    with trace.span('resolve', classes=len(project.classes)):
+        project.resolve()
+
+
+def _build(args: argparse.Namespace, trace: Trace) -> 'chardon.ProjectManager':
+    """
+    Parse the project, and export it to every target
+    @param args: Options
+    @param trace: Trace
+    @return: ProjectManager
+    """
+    project = _project(args, [_target(target) for target in args.target])
+    _parse(project, args, trace)
+    with trace.span('export', targets=len(project.targets)):
+        project.export(incremental=args.incremental, search_index=args.search_index,
+                       coverage=args.coverage, split=_split(args))
+    print(f"{len(project.exported_pages)} pages exported ({len(project.classes)} classes, "
+          f"{len(project.targets)} targets)")
+    return project
+
+
+def _split(args: argparse.Namespace) -> 'chardon.PageSplit | None':
+    """
+    Page splitting described by the options
+    @param args: Options
+    @return: PageSplit, None if no threshold is given
+    """
+    if args.split_members is None and args.split_bytes is None:
+        return None
+    return chardon.PageSplit(args.split_members, args.split_bytes, args.split_by)
+
+
+def build(args: argparse.Namespace) -> int:
+    """
+    chardon build : export the documentation once
+    @param args: Options
+    @return: Exit code
+    """
+    trace = Trace()
+    try:
+        with Diagnostics().collecting() as issues:
+            _build(args, trace)
+    finally:
+        if args.trace is not None:
+            trace.save(args.trace)
+    return _report(issues, args)
+
+
+def _report(issues: Diagnostics, args: argparse.Namespace) -> int:
+    """
+    Log the issues found during a run, in a single report
+    @param issues: Diagnostics of the run
+    @param args: Options
+    @return: Exit code, 1 if an issue of a --fail-on code was found
+    """
+    issues.emit()
+    if args.diagnostics is not None:
+        args.diagnostics.write_text(json.dumps(issues.to_json(), indent=1), encoding='utf-8')
+    failures = issues.failures(args.fail_on)
+    if failures:
+        logging.error("Failed on %s", ', '.join(f"{code} ({issues.count(code)})"
+                                                for code in failures))
+        return 1
+    return 0
+
+
+def _snapshot(args: argparse.Namespace) -> Dict[str, Tuple[int, int]]:
+    """
+    Modification time and size of every file of the project to parse
+    @param args: Options
+    @return: Path -> (mtime, size)
+    """
+    accept = _project(args, []).accept
+    snapshot: Dict[str, Tuple[int, int]] = {}
+    for directory, _directories, files in os.walk(args.project):
+        for name in files:
+            path = Path(directory) / name
+            if accept(path.relative_to(args.project)):
+                stat = path.stat()
+                snapshot[str(path)] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def watch(args: argparse.Namespace) -> int:
+    """
+    chardon watch : export the documentation again whenever a file of the project changes
+    As exports are incremental, only the pages affected by a change are written again
+    @param args: Options
+    @return: Exit code
+    """
+    trace = Trace()
+    snapshot = _snapshot(args)
+    with Diagnostics().collecting() as issues:
+        _build(args, trace)
+    issues.emit()
+    try:
+        while True:
+            time.sleep(args.interval)
+            current = _snapshot(args)
+            if current == snapshot:
+                continue
+            snapshot = current
+            # pylint: disable=broad-exception-caught
+            try:
+                with Diagnostics().collecting() as issues:
+                    _build(args, trace)
+                issues.emit()
+            except Exception as e:
+                # Keep watching, the file may be saved again fixed
+                logging.error("Export failed : %s", e)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        if args.trace is not None:
+            trace.save(args.trace)
+
+
+def stats(args: argparse.Namespace) -> int:
+    """
+    chardon stats : parse the project and print what was found, and how long it took
+    @param args: Options
+    @return: Exit code
+    """
+    trace = Trace()
+    project = _project(args, [])
+    with Diagnostics().collecting() as issues:
+        _parse(project, args, trace)
+
+    classes = list(project.classes.values())
+    members = [field for class_ in classes for field in class_.fields or []]
+    # pylint: disable=import-outside-toplevel
+    from chardon.documentation.coverage_report import ratio
+    documented, undocumented = project.coverage_report().totals()
+    methods = [field for field in members if isinstance(field.type, chardon.Function)]
+    report = {
+        'files': len(project.results),
+        'classes': len(classes),
+        'members': len(members),
+        'methods': len(methods),
+        'fields': len(members) - len(methods),
+        'classes_without_summary': sum('summary' not in class_.attributes.get('comments', {})
+                                       for class_ in classes),
+        'members_without_summary': sum('summary' not in field.attributes.get('comments', {})
+                                       for field in members),
+        'unresolved_parents': sum(map(len, project.inheritance.unresolved.values())),
+        'documented_declarations': documented,
+        'undocumented_declarations': undocumented,
+        'coverage': f"{ratio(documented, undocumented)} %",
+        'issues': {code: issues.count(code) for code in sorted(issues.issues)},
+        'durations_ms': {name: round(duration, 1)
+                         for name, duration in trace.durations().items()},
+    }
+
+    if args.trace is not None:
+        trace.save(args.trace)
+    if args.json:
+        print(json.dumps(report, indent=1))
+    else:
+        for key, value in report.items():
+            if key == 'durations_ms':
+                value = ', '.join(f"{name} {duration} ms" for name, duration in value.items())
+            elif isinstance(value, dict):
+                value = ', '.join(f"{code} {count}" for code, count in value.items()) or 'none'
+            print(f"{key.replace('_', ' ').capitalize()} : {value}")
+    return _report(issues, args)
+
+
+def serve(args: argparse.Namespace) -> int:
+    """
+    chardon serve : keep the model of the project in memory, and answer requests until shutdown
+    @param args: Options
+    @return: Exit code
+    """
+    # pylint: disable=import-outside-toplevel
+    from chardon.daemon import DocumentationDaemon, serve as serve_daemon
+
+    targets = [_target(target) for target in args.target]
+    with Diagnostics().collecting() as issues:
+        daemon = DocumentationDaemon(lambda: _project(args, targets), args.project,
+                                     {name: getattr(chardon, exporter)()
+                                      for name, exporter in FORMATS.items()})
+    issues.emit()
+    print(f"Serving {len(daemon.project.classes)} classes on "
+          f"{args.socket or f'http://127.0.0.1:{args.port}'}", flush=True)
+    try:
+        serve_daemon(daemon, args.port, args.socket)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def call(args: argparse.Namespace) -> int:
+    """
+    chardon call : send a request to a running daemon (see chardon serve), and print its result
+    @param args: Options
+    @return: Exit code
+    """
+    # pylint: disable=import-outside-toplevel
+    from chardon.daemon_client import DaemonClient, DaemonError
+
+    params = {}
+    for param in args.params:
+        key, _, value = param.partition('=')
+        try:
+            params[key] = json.loads(value)
+        except ValueError:
+            params[key] = value
+    try:
+        result = DaemonClient(args.port, args.socket).call(args.method, **params)
+    except (DaemonError, OSError) as e:
+        print(f"chardon call: {e}", file=sys.stderr)
+        return 1
+    if isinstance(result, dict) and isinstance(result.get('content'), str):
+        print(result['content'])
+    else:
+        print(json.dumps(result, indent=1))
+    return 0
+
+
+def _add_daemon_arguments(parser: argparse.ArgumentParser):
+    """
+    Options locating the daemon
+    @param parser: Parser of a command
+    """
+    # pylint: disable=import-outside-toplevel
+    from chardon.daemon_client import DEFAULT_PORT
+
+    address = parser.add_mutually_exclusive_group()
+    address.add_argument('--port', type=int, default=DEFAULT_PORT,
+                         help=f"port of the daemon, on localhost (default: {DEFAULT_PORT})")
+    address.add_argument('--socket', type=Path, help="Unix socket of the daemon, instead of a port")
+
+
+def _add_project_arguments(parser: argparse.ArgumentParser, git: bool = True,
+                           run: bool = True):
+    """
+    Options shared by every command : what to parse, and how
+    @param parser: Parser of a command
+    @param git: Add the options to read the project from git objects
+    @param run: Add the options of commands parsing the project as a run (cache, trace),
+    not kept by a daemon
+    """
+    parser.add_argument('project', type=Path,
+                        help="project directory (the repository, with --revision)")
+    parser.add_argument('--language', choices=LANGUAGES, default='csharp',
+                        help="language of the project (default: csharp)")
+    parser.add_argument('--include', action='append', metavar='REGEX', default=[],
+                        help="only parse files whose name matches (repeatable, "
+                             "default: the extension of the language)")
+    parser.add_argument('--exclude', action='append', metavar='REGEX', default=[],
+                        help="skip files whose path from the project matches (repeatable)")
+    parser.add_argument('--encoding', default='utf-8', help="encoding of files (default: utf-8)")
+    parser.add_argument('-j', '--workers', type=int, default=1,
+                        help="number of processes parsing files (default: 1)")
+    parser.add_argument('-v', '--verbose', action='count', default=0,
+                        help="log more (-v for steps, -vv for everything)")
+    if run:
+        parser.add_argument('--cache-dir', type=Path,
+                            help="keep parsed files there, so unchanged files are not parsed again")
+        parser.add_argument('--trace', type=Path, metavar='FILE',
+                            help="write the duration of each step (Chrome trace event format)")
+    if git:
+        parser.add_argument('--revision',
+                            help="read the project from this git revision, without checkout")
+        parser.add_argument('--previous',
+                            help="with --revision, revision of the last export "
+                                 "(only the files changed since are parsed)")
+        parser.add_argument('--directory', default='',
+                            help="with --revision, project directory inside the repository")
+
+
+def _add_export_arguments(parser: argparse.ArgumentParser, required: bool = True):
+    """
+    Options of the commands exporting the documentation
+    @param parser: Parser of a command
+    @param required: At least one target is required
+    """
+    parser.add_argument('-t', '--target', action='append', required=required, default=[],
+                        metavar='FORMAT:PATH', type=target_option,
+                        help=f"exporter ({', '.join(FORMATS)}) and output directory, or .zip / "
+                             f".tar.gz bundle (repeatable, all exported in the same pass)")
+    parser.add_argument('--incremental', action=argparse.BooleanOptionalAction, default=True,
+                        help="only export the pages whose dependencies changed (default: on)")
+    parser.add_argument('--search-index', action='store_true',
+                        help="also write a client-side search index")
+    parser.add_argument('--coverage', action='store_true',
+                        help="also write the documentation coverage (coverage.json, and a page)")
+    parser.add_argument('--split-members', type=int, metavar='N',
+                        help="split the members of classes having more than N members "
+                             "across several pages")
+    parser.add_argument('--split-bytes', type=int, metavar='N',
+                        help="split the members of classes whose members exceed N bytes "
+                             "(estimated) across several pages")
+    parser.add_argument('--split-by', choices=['kind', 'alphabetical'], default='kind',
+                        help="group the members of split classes by kind (then alphabetically "
+                             "if still too many), or alphabetically (default: kind)")
+
+
+def _add_diagnostics_arguments(parser: argparse.ArgumentParser):
+    """
+    Options of the commands reporting the issues found, once done
+    @param parser: Parser of a command
+    """
+    parser.add_argument('--fail-on', action='append', metavar='CODE', default=[],
+                        choices=sorted(ISSUES),
+                        help=f"exit with 1 if an issue of this code is found "
+                             f"(repeatable, one of {', '.join(sorted(ISSUES))})")
+    parser.add_argument('--diagnostics', type=Path, metavar='FILE',
+                        help="write every issue found (JSON)")
+
+
+def argument_parser() -> argparse.ArgumentParser:
+    """
+    Parser of the command line
+    @return: ArgumentParser
+    """
+    parser = argparse.ArgumentParser(prog='chardon', description=__doc__.strip())
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = commands.add_parser('build', help="export the documentation")
+    _add_project_arguments(build_parser)
+    _add_export_arguments(build_parser)
+    _add_diagnostics_arguments(build_parser)
+    build_parser.set_defaults(func=build)
+
+    watch_parser = commands.add_parser('watch', help="export the documentation on every change")
+    _add_project_arguments(watch_parser, git=False)
+    _add_export_arguments(watch_parser)
+    watch_parser.add_argument('--interval', type=float, default=1,
+                              help="seconds between two scans of the project (default: 1)")
+    watch_parser.set_defaults(func=watch)
+
+    stats_parser = commands.add_parser('stats', help="print statistics about the project")
+    _add_project_arguments(stats_parser)
+    stats_parser.add_argument('--json', action='store_true', help="print them as JSON")
+    _add_diagnostics_arguments(stats_parser)
+    stats_parser.set_defaults(func=stats)
+
+    serve_parser = commands.add_parser('serve', help="keep the project in memory, and answer "
+                                                     "requests (render, reindex, symbols, export)")
+    _add_project_arguments(serve_parser, git=False, run=False)
+    _add_export_arguments(serve_parser, required=False)
+    _add_daemon_arguments(serve_parser)
+    serve_parser.set_defaults(func=serve)
+
+    call_parser = commands.add_parser('call', help="send a request to a running daemon")
+    call_parser.add_argument('method', help="render, reindex, symbols, export or shutdown")
+    call_parser.add_argument('params', nargs='*', metavar='KEY=VALUE',
+                             help="parameters, values being read as JSON if possible "
+                                  "(eg. name=Entity format=html files='[\"Core/Entity.cs\"]')")
+    call_parser.add_argument('-v', '--verbose', action='count', default=0, help="log more")
+    _add_daemon_arguments(call_parser)
+    call_parser.set_defaults(func=call)
+    return parser
+
+
+def main(argv: List[str] | None = None) -> int:
+    """
+    Entry point of the chardon command
+    @param argv: Arguments (default: sys.argv)
+    @return: Exit code
+    """
+    args = argument_parser().parse_args(argv)
+    logging.basicConfig(level=[logging.WARNING, logging.INFO, logging.DEBUG][min(args.verbose, 2)],
+                        format="%(levelname)s %(message)s")
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
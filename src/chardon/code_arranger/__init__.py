@@ -1,2 +1,5 @@
 # pylint: disable=missing-module-docstring
+from .reference_index import ReferenceKind, Reference, ReferenceIndex
+from .inheritance import InheritanceClosure
+from .page_split import PageSplit
 from .documentation import DocumentationError, DocArticle
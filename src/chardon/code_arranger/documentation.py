@@ -1,17 +1,24 @@
 """
 Article for Documentation
 """
-import logging
 from pathlib import Path
 import re
-from typing import List
+from typing import Dict, List, Tuple
 
+from chardon import diagnostics
 from chardon.article_builder import Content, TextStyle, TableRow, Article,\
     TableOfContentABC, TableTableOfContent, CalloutType
+from chardon.code_arranger.inheritance import InheritanceClosure
+from chardon.code_arranger.page_split import PageSplit
+from chardon.code_arranger.reference_index import ReferenceIndex, Reference
 from chardon.code_parser.structure import ArrayOfType, DictOfType, SpecificType,\
     Parameter, Function, ClassVariant, Field, Type, Class
 
 SUMMARY_MAX_SIZE = 100
+# Estimated bytes of a member besides its texts (title, scope, type, table of content row),
+# and of each input of a method
+MEMBER_SIZE = 120
+INPUT_SIZE = 60
 
 
 def beautiful_class_name(text: str) -> str:
@@ -23,26 +30,37 @@ def beautiful_class_name(text: str) -> str:
     return re.sub(r"(\w)([A-Z])", r"\1 \2", text)
 
 
-def find_summary(field: Field) -> str:
+def find_summary(field: Field, class_: Class = None) -> str:
     """
     Find summary from a Field
     @param field: Field
+    @param class_: Class of the field, named in diagnostics
     @return: Summary
     """
     if 'comments' in field.attributes:
         if 'summary' in field.attributes['comments']:
             tag = field.attributes['comments']['summary']
             if len(tag.content) > SUMMARY_MAX_SIZE:
-                logging.warning("Summary of %s is a too long : %s", field.name, len(tag.content))
+                diagnostics.record('long-summary', symbol=_member_name(field, class_),
+                                   detail=f"{len(tag.content)} characters")
             if '\n' in tag.content:
-                logging.warning("Summary of %s contains more than one line."
-                                " It may lead to incorrect formatting", field.name)
+                diagnostics.record('multiline-summary', symbol=_member_name(field, class_))
             return tag.content
 
-    logging.error("Summary of %s is missing", field.name)
+    diagnostics.record('missing-summary', symbol=_member_name(field, class_))
     return "*missing summary*"
 
 
+def _member_name(field: Field, class_: Class | None) -> str:
+    """
+    Name of a member, with its class if known
+    @param field: Field
+    @param class_: Class, or None
+    @return: eg. Entity.Speed
+    """
+    return f"{class_.name}.{field.name}" if class_ is not None else field.name
+
+
 def type_representation(type_: Type | Class) -> Content:
     """
     Convert type to str, or link to their Class
@@ -77,7 +95,28 @@ def type_representation(type_: Type | Class) -> Content:
 
         return span
 
-    return Content.FromText(type_.name)
+    return Content.Span([Content.Literal(type_.name)])
+
+
+def classes_of(type_: Type | Function) -> List[Class]:
+    """
+    Find the classes a type refers to (and would link to)
+    @param type_: Type, or Function (its inputs and outputs)
+    @return: Classes
+    """
+    if isinstance(type_, Class):
+        return [type_]
+    if isinstance(type_, Function):
+        return [class_ for param in type_.inputs + type_.outputs
+                for param_type in param.types for class_ in classes_of(param_type)]
+    if isinstance(type_, ArrayOfType):
+        return classes_of(type_.type_)
+    if isinstance(type_, DictOfType):
+        return classes_of(type_.key) + classes_of(type_.value)
+    if isinstance(type_, SpecificType):
+        return classes_of(type_.type_) + classes_of(type_.specific1) \
+            + (classes_of(type_.specific2) if type_.specific2 is not None else [])
+    return []
 
 
 def param_representation(params: Parameter) -> Content:
@@ -141,7 +180,7 @@ def _get_field_head(field: Field) -> Content:
     # Return type of function or type of Field
     field_type: Content = _get_field_types(field)
     # Field scope (public, private, protected)
-    field_scope: Content = Content.Span([Content.FromText(field.scope.name)], TextStyle.ITALIC)
+    field_scope: Content = Content.Span([Content.Literal(field.scope.name)], TextStyle.ITALIC)
 
     field_default_value: Content = _get_default_value(field)
 
@@ -165,9 +204,9 @@ def _get_function_inputs(function: Function, params_comment: dict[str: str]) ->
             raise DocumentationError(f"missing {param.name} documentation")
 
         table.add_row(TableRow([
-            Content.FromText(param.name),
+            Content.Literal(param.name),
             param_representation(param),
-            Content.FromText(params_comment[param.name])
+            Content.LazyText(params_comment[param.name])
         ]))
 
     return table
@@ -187,6 +226,63 @@ def heritage_to_content(inherits: List[Type]) -> Content:
     ], TextStyle.BOLD)
 
 
+def derived_to_content(derived: List[Class]) -> List[Content]:
+    """
+    Export classes inheriting from a class to content
+    @param derived: Child classes
+    @return: Contents
+    """
+    return [
+        Content.Title("Derived classes", level=1),
+        Content.Span([type_representation(class_) for class_ in derived],
+                     attributes={'separator': ', '})
+    ]
+
+
+def used_by_to_content(references: List[Reference]) -> List[Content]:
+    """
+    Export members using a class to content
+    @param references: References to the class
+    @return: Contents
+    """
+    table = Content.Table(["Class", "Member", "Usage"], [])
+    for reference in references:
+        table.add_row(TableRow([
+            type_representation(reference.class_),
+            Content.Literal(reference.field.name),
+            Content.Literal(reference.kind.value)
+        ]))
+    return [Content.Title("Used by", level=1), table]
+
+
+def inherited_members_to_content(members: List[Tuple[Field, Class]],
+                                 unresolved: List[Type]) -> List[Content]:
+    """
+    Export members inherited from ancestors to content
+    @param members: (member, class defining it)
+    @param unresolved: Undocumented ancestors, whose members are unknown
+    @return: Contents
+    """
+    contents: List[Content] = [Content.Title("Inherited members", level=1)]
+    if members:
+        table = Content.Table(["Member", "Type", "Defined in"], [])
+        for field, owner in members:
+            table.add_row(TableRow([
+                Content.Literal(field.name),
+                _get_field_types(field),
+                type_representation(owner)
+            ]))
+        contents.append(table)
+
+    if unresolved:
+        contents.append(Content.Span([
+            Content.FromText("Also inherits from undocumented : "),
+            Content.Span([type_representation(type_) for type_ in unresolved],
+                         attributes={'separator': ', '})
+        ], TextStyle.ITALIC))
+    return contents
+
+
 class DocumentationError(Exception):
     """
     Error in the documentation, such as missing comment
@@ -205,10 +301,26 @@ class DocArticle(Article):
     """
     TABLE_OF_CONTENT: type[TableOfContentABC] = TableTableOfContent
 
-    def __init__(self, class_: Class, path: Path):
+    # pylint: disable=too-many-arguments
+    def __init__(self, class_: Class, path: Path, references: ReferenceIndex = None,
+                 inheritance: InheritanceClosure = None, split: PageSplit = None):
+        """
+        Generate the documentation of a class
+        @param class_: Class
+        @param path: Directory of the class, from the project root
+        @param references: Reverse references of the project, to list where the class is used
+        @param inheritance: Inheritance closure of the project, to list inherited members
+        @param split: Split the members of the class across pages when there are too many
+        (see to_pages), None to keep them on the class page
+        """
         super().__init__()
         self.class_ = class_
+        self.path = path
         self.presentation = Content.Section([])
+        # Classes rendered in this article (links, member lists), by qualified name
+        self.dependencies: Dict[str, Class] = {}
+        # Field, summary, and index of its first Content, for each member
+        self.members: List[Tuple[Field, str, int]] = []
 
         self.set_metadata('title', self.class_.name)
         self.set_metadata('path', str(path))
@@ -227,16 +339,17 @@ class DocArticle(Article):
 
         if len(self.class_.inherits) > 0:
             self.presentation.add_children(heritage_to_content(self.class_.inherits))
+            self.depend_on(*self.class_.inherits)
 
         # Parse class comments
         for type_, comment in self.class_.attributes.get('comments', {}).items():
             match type_:
                 case 'summary':
-                    self.presentation.add_children(Content.FromText(comment.content))
+                    self.presentation.add_children(Content.LazyText(comment.content))
                 case 'remarks':
                     self.presentation.add_children(
-                        Content.QuoteText(comment.content,
-                                          attributes={'callout': CalloutType.INFO}))
+                        Content.Quote(Content.LazyText(comment.content),
+                                      attributes={'callout': CalloutType.INFO}))
                 case _:
                     pass
                     # self.presentation.add_children(
@@ -250,24 +363,81 @@ class DocArticle(Article):
             try:
                 self.add_field(field)
             except DocumentationError as e:
-                logging.error("Error at %s.%s : %s", class_.name, field.name, e)
+                diagnostics.record('undocumented-member', symbol=f"{class_.name}.{field.name}",
+                                   detail=str(e))
+        # Contents after the members (inherited members, references) stay on the class page
+        self.members_end = len(self.contents)
+        # Label and members of each member page, empty if the class fits on one page
+        self.groups: List[Tuple[str, List[int]]] = [] if split is None else split.groups([
+            (field.name, 'Methods' if isinstance(field.type, Function) else 'Fields',
+             _estimate_size(field, summary)) for field, summary, _start in self.members])
+
+        if inheritance is not None:
+            self.add_inherited_members(inheritance)
+
+        if references is not None:
+            self.add_references(references)
+
+    def depend_on(self, *types: Type | Function):
+        """
+        Record the classes rendered in the article
+        @param types: Types, or Functions
+        """
+        for type_ in types:
+            for class_ in classes_of(type_):
+                self.dependencies[class_.get_qualified_name()] = class_
 
     def add_field(self, field: Field):
         """
         Add a class field in the article
         @param field: Field
         """
-        summary: str = find_summary(field)
+        summary: str = find_summary(field, self.class_)
+        self.depend_on(field.type)
 
         # Add entry to table of content
         self.table_of_contents.add_entry(field.name, field.name, summary)
+        self.members.append((field, summary, len(self.contents)))
 
         self.add_content(_get_field_head(field))
-        self.add_content(Content.FromText(summary))
+        self.add_content(Content.LazyText(summary))
 
         if isinstance(field.type, Function) and len(field.type.inputs) > 0:
             self.add_content(_get_function_inputs(field.type, field.attributes.get('params', {})))
 
+    def add_inherited_members(self, inheritance: InheritanceClosure):
+        """
+        Add the members inherited from ancestors, linking to the class defining them
+        @param inheritance: Inheritance closure of the project
+        """
+        members: List[Tuple[Field, Class]] = inheritance.get_inherited_members(self.class_)
+        # Direct undocumented parents are already listed in the presentation
+        unresolved: List[Type] = [type_ for type_ in inheritance.get_unresolved(self.class_)
+                                  if type_ not in self.class_.inherits]
+        for field, owner in members:
+            self.depend_on(owner, field.type)
+
+        if members or unresolved:
+            for content in inherited_members_to_content(members, unresolved):
+                self.add_content(content)
+
+    def add_references(self, references: ReferenceIndex):
+        """
+        Add the classes inheriting from the class, and the members using it
+        @param references: Reverse references of the project
+        """
+        derived: List[Class] = references.get_derived(self.class_)
+        self.depend_on(*derived)
+        if derived:
+            for content in derived_to_content(derived):
+                self.add_content(content)
+
+        used_by: List[Reference] = references.get_used_by(self.class_)
+        self.depend_on(*(reference.class_ for reference in used_by))
+        if used_by:
+            for content in used_by_to_content(used_by):
+                self.add_content(content)
+
     def to_contents(self) -> List[Content]:
         """
         Return Article as a List of Content
@@ -276,3 +446,99 @@ class DocArticle(Article):
         """
         return [self.header, self.presentation, Content.Separator()] \
                + self.table_of_contents.get_contents() + self.contents
+
+    def page_name(self, label: str) -> str:
+        """
+        Name of a member page, next to the class page
+        @param label: Label of the group of members (eg. Methods A-C)
+        @return: eg. Entity-Methods-A-C
+        """
+        return f"{self.class_.name}-{label.replace(' ', '-')}"
+
+    def page_names(self) -> List[str]:
+        """
+        Name of the pages of the article, without building them
+        @return: Class page, then member pages
+        """
+        return [self.class_.name] + [self.page_name(label) for label, _members in self.groups]
+
+    def member_pages(self) -> Dict[str, str]:
+        """
+        Find the page of each member
+        @return: Member name -> name of the page documenting it
+        """
+        pages: Dict[str, str] = {}
+        for label, members in self.groups:
+            for i in members:
+                pages[self.members[i][0].name] = self.page_name(label)
+        return pages
+
+    def _member_contents(self, i: int) -> List[Content]:
+        """
+        Contents documenting a member
+        @param i: Index of the member
+        @return: Head, summary and inputs
+        """
+        end = self.members[i + 1][2] if i + 1 < len(self.members) else self.members_end
+        return self.contents[self.members[i][2]:end]
+
+    def to_pages(self) -> List[Tuple[str, List[Content]]]:
+        """
+        Return Article as pages, when its members are split across pages
+        The class page lists the member pages instead of the members, each member page has
+        its own table of content, and links back to the class page
+        @return: Name (see page_names) and Contents of each page, the class page first
+        """
+        if not self.groups:
+            return [(self.class_.name, self.to_contents())]
+
+        uri: Path = self.class_.attributes['uri']
+        table = Content.Table(["Members", "Count", "From", "To"], [])
+        pages: List[Tuple[str, List[Content]]] = []
+        for label, members in self.groups:
+            name = self.page_name(label)
+            table.add_row(TableRow([
+                Content.Link(label, uri.parent / name, attributes={'link_to_another_page': True}),
+                Content.Literal(str(len(members))),
+                Content.Literal(self.members[members[0]][0].name),
+                Content.Literal(self.members[members[-1]][0].name),
+            ]))
+
+            header = Content.Header({
+                'title': f"{self.class_.name} - {label}",
+                'path': str(self.path),
+                'aliases': [],
+                'tags': ['class-members'],
+            })
+            table_of_contents = self.TABLE_OF_CONTENT()
+            contents: List[Content] = []
+            for i in members:
+                field, summary, _start = self.members[i]
+                table_of_contents.add_entry(field.name, field.name, summary)
+                contents.extend(self._member_contents(i))
+            pages.append((name, [
+                header,
+                Content.Span([Content.FromText(f"{label} of "), type_representation(self.class_)],
+                             TextStyle.BOLD),
+                Content.Separator(),
+            ] + table_of_contents.get_contents() + contents))
+
+        index = [self.header, self.presentation, Content.Separator(),
+                 Content.Title("Members", 1), table, Content.Separator()] \
+            + self.contents[self.members_end:]
+        return [(self.class_.name, index)] + pages
+
+
+def _estimate_size(field: Field, summary: str) -> int:
+    """
+    Estimate the bytes documenting a member, without rendering it
+    @param field: Field
+    @param summary: Summary of the field
+    @return: Size
+    """
+    size = MEMBER_SIZE + 3 * len(field.name) + 2 * len(summary)
+    if isinstance(field.type, Function):
+        params: dict = field.attributes.get('params', {})
+        size += sum(INPUT_SIZE + len(param.name) + len(params.get(param.name, ''))
+                    for param in field.type.inputs)
+    return size
@@ -0,0 +1,138 @@
+"""
+Inheritance closure : every ancestor of a class, and the members it inherits from them
+"""
+from typing import Dict, Iterable, List, Tuple
+
+from chardon import diagnostics
+from chardon.code_parser.structure import Class, Field, Scope, Type
+
+
+class InheritanceClosure:
+    """
+    Ancestors and inherited members of every class, computed once in a single topological pass
+    Parents are always processed before their children, so each class only merges the
+    (memoized) closures of its direct parents, whatever the depth of the hierarchy
+    """
+
+    def __init__(self, classes: Iterable[Class]):
+        """
+        Compute the closure of a set of classes
+        @param classes: Classes, with their types resolved
+        """
+        # Qualified name -> ancestors, from the nearest to the farthest
+        self.ancestors: Dict[str, List[Class]] = {}
+        # Qualified name -> (member, class defining it), nearest definitions first
+        self.inherited: Dict[str, List[Tuple[Field, Class]]] = {}
+        # Qualified name -> bases that aren't documented classes (eg. MonoBehaviour)
+        self.unresolved: Dict[str, List[Type]] = {}
+        # Qualified name -> parents left out because they close an inheritance cycle
+        self._ignored: Dict[str, List[Class]] = {}
+
+        for class_ in classes:
+            self._compute(class_)
+
+    def _compute(self, root: Class):
+        """
+        Compute the closure of a class and of its ancestors, with an explicit stack
+        @param root: Class
+        """
+        if root.get_qualified_name() in self.ancestors:
+            return
+
+        visiting: set = set()
+        stack: List[Class] = [root]
+        while stack:
+            class_ = stack[-1]
+            name = class_.get_qualified_name()
+            if name in self.ancestors:
+                stack.pop()
+                continue
+
+            pending = [parent for parent in self._parents(class_)
+                       if parent.get_qualified_name() not in self.ancestors]
+            if name not in visiting:
+                visiting.add(name)
+                cycle = [parent for parent in pending if parent.get_qualified_name() in visiting]
+                for parent in cycle:
+                    diagnostics.record('inheritance-cycle', symbol=name,
+                                       detail=f"inherits {parent.get_qualified_name()}")
+                    self._ignored.setdefault(name, []).append(parent)
+                pending = [parent for parent in pending if parent not in cycle]
+                if pending:
+                    stack.extend(pending)
+                    continue
+
+            stack.pop()
+            visiting.discard(name)
+            self._merge(class_)
+
+    def _parents(self, class_: Class) -> List[Class]:
+        """
+        Direct parents of a class that are documented classes
+        @param class_: Class
+        @return: Parents
+        """
+        ignored = self._ignored.get(class_.get_qualified_name(), [])
+        return [parent for parent in class_.inherits
+                if isinstance(parent, Class) and parent not in ignored]
+
+    def _merge(self, class_: Class):
+        """
+        Compute the closure of a class from the closures of its parents
+        @param class_: Class, whose parents are already computed
+        """
+        ancestors: Dict[str, Class] = {}
+        inherited: List[Tuple[Field, Class]] = []
+        unresolved: List[Type] = [parent for parent in class_.inherits
+                                  if not isinstance(parent, Class)]
+        # Members defined closer hide the ones with the same name
+        seen: set = {field.name for field in class_.fields or []}
+
+        for parent in self._parents(class_):
+            parent_name = parent.get_qualified_name()
+            ancestors.setdefault(parent_name, parent)
+            for ancestor in self.ancestors[parent_name]:
+                ancestors.setdefault(ancestor.get_qualified_name(), ancestor)
+            unresolved.extend(self.unresolved[parent_name])
+
+            for field in parent.fields or []:
+                if field.scope != Scope.PRIVATE and field.name not in seen:
+                    seen.add(field.name)
+                    inherited.append((field, parent))
+            for field, owner in self.inherited[parent_name]:
+                if field.name not in seen:
+                    seen.add(field.name)
+                    inherited.append((field, owner))
+
+        name = class_.get_qualified_name()
+        self.ancestors[name] = list(ancestors.values())
+        self.inherited[name] = inherited
+        unique: Dict[str, Type] = {}
+        for type_ in unresolved:
+            unique.setdefault(type_.name, type_)
+        self.unresolved[name] = list(unique.values())
+
+    def get_ancestors(self, class_: Class) -> List[Class]:
+        """
+        Every documented ancestor of a class
+        @param class_: Class
+        @return: Ancestors, from the nearest to the farthest
+        """
+        return self.ancestors.get(class_.get_qualified_name(), [])
+
+    def get_inherited_members(self, class_: Class) -> List[Tuple[Field, Class]]:
+        """
+        Members inherited by a class, and the class defining them
+        Private and overridden members are left out
+        @param class_: Class
+        @return: (member, defining class)
+        """
+        return self.inherited.get(class_.get_qualified_name(), [])
+
+    def get_unresolved(self, class_: Class) -> List[Type]:
+        """
+        Bases of a class, or of its ancestors, that aren't documented
+        @param class_: Class
+        @return: Types
+        """
+        return self.unresolved.get(class_.get_qualified_name(), [])
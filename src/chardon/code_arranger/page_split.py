@@ -0,0 +1,102 @@
+"""
+Split the members of large classes across several pages
+"""
+from typing import Dict, Iterable, List, Tuple
+
+# How members are grouped into pages
+BY_KIND = 'kind'
+ALPHABETICAL = 'alphabetical'
+
+# Name, kind (eg. Methods), and estimated size of a member
+Member = Tuple[str, str, int]
+
+
+class PageSplit:
+    """
+    When and how the page of a class is split : once a class has more members (or bigger ones)
+    than the thresholds, it is exported as an index page, and pages holding its members grouped
+    by kind (Fields, Methods) or in alphabetical buckets
+    Groups still too big once split by kind are split again in alphabetical buckets
+    """
+
+    def __init__(self, max_members: int = None, max_bytes: int = None, group_by: str = BY_KIND):
+        """
+        Create splitting settings
+        @param max_members: Most members on a page (None for no limit)
+        @param max_bytes: Most bytes of members on a page, as estimated before rendering
+        (None for no limit)
+        @param group_by: BY_KIND or ALPHABETICAL
+        """
+        if max_members is None and max_bytes is None:
+            raise ValueError("Page splitting needs a number of members or of bytes")
+        if group_by not in (BY_KIND, ALPHABETICAL):
+            raise ValueError(f"Unknown grouping {group_by}, expected {BY_KIND} or {ALPHABETICAL}")
+        self.max_members = max_members
+        self.max_bytes = max_bytes
+        self.group_by = group_by
+
+    def __repr__(self) -> str:
+        # Part of the page signatures (see BuildManifest)
+        return f"PageSplit({self.max_members}, {self.max_bytes}, {self.group_by})"
+
+    def exceeds(self, count: int, size: int) -> bool:
+        """
+        Tell if members don't fit on a page
+        @param count: Number of members
+        @param size: Estimated size of the members
+        @return: True if a threshold is exceeded
+        """
+        return (self.max_members is not None and count > self.max_members) \
+            or (self.max_bytes is not None and size > self.max_bytes)
+
+    def groups(self, members: List[Member]) -> List[Tuple[str, List[int]]]:
+        """
+        Group the members of a class into pages
+        @param members: Members of the class, in declaration order
+        @return: Label of each page, and indexes of its members (empty if they fit on one page)
+        """
+        if not self.exceeds(len(members), sum(size for _name, _kind, size in members)):
+            return []
+        if self.group_by == ALPHABETICAL:
+            return self._buckets(members, range(len(members)))
+
+        kinds: Dict[str, List[int]] = {}
+        for i, (_name, kind, _size) in enumerate(members):
+            kinds.setdefault(kind, []).append(i)
+        groups: List[Tuple[str, List[int]]] = []
+        for kind, indexes in kinds.items():
+            if self.exceeds(len(indexes), sum(members[i][2] for i in indexes)):
+                groups.extend((f"{kind} {label}", bucket)
+                              for label, bucket in self._buckets(members, indexes))
+            else:
+                groups.append((kind, indexes))
+        return groups
+
+    def _buckets(self, members: List[Member], indexes: Iterable[int]) \
+            -> List[Tuple[str, List[int]]]:
+        """
+        Split members in alphabetical buckets, each one filled up to the thresholds
+        @param members: Members of the class
+        @param indexes: Members to split
+        @return: Label (eg. A-C) of each bucket, and indexes of its members, sorted by name
+        """
+        buckets: List[List[int]] = []
+        count = size = 0
+        for i in sorted(indexes, key=lambda i: (members[i][0].lower(), i)):
+            if buckets and not self.exceeds(count + 1, size + members[i][2]):
+                buckets[-1].append(i)
+                count += 1
+                size += members[i][2]
+            else:
+                buckets.append([i])
+                count, size = 1, members[i][2]
+
+        labels: Dict[str, int] = {}
+        groups: List[Tuple[str, List[int]]] = []
+        for bucket in buckets:
+            first, last = members[bucket[0]][0][:1].upper(), members[bucket[-1]][0][:1].upper()
+            label = first if first == last else f"{first}-{last}"
+            # Buckets starting and ending with the same letters are numbered
+            labels[label] = labels.get(label, 0) + 1
+            groups.append((label if labels[label] == 1 else f"{label} {labels[label]}", bucket))
+        return groups
@@ -0,0 +1,87 @@
+"""
+Reverse references between classes : where each class is used
+"""
+from enum import Enum
+from typing import Dict, List
+
+from chardon.code_parser.structure import Class, Field
+
+
+class ReferenceKind(str, Enum):
+    """
+    How a class is referenced
+    """
+    FIELD = "field"
+    PARAMETER = "parameter"
+    RETURN = "return"
+
+
+# pylint: disable=too-few-public-methods
+class Reference:
+    """
+    A member of a class referencing another class
+    """
+
+    def __init__(self, class_: Class, field: Field, kind: ReferenceKind):
+        """
+        Init a Reference
+        @param class_: Class declaring the member
+        @param field: Member referencing the class
+        @param kind: How the member references it
+        """
+        self.class_ = class_
+        self.field = field
+        self.kind = kind
+
+
+class ReferenceIndex:
+    """
+    Reverse index of references, filled while types are resolved (see SymbolTable.resolve_all)
+    Each reference is recorded once, so building it is linear in the number of references
+    """
+
+    def __init__(self):
+        # Qualified name -> members using the class
+        self.used_by: Dict[str, List[Reference]] = {}
+        # Qualified name -> classes inheriting from the class
+        self.derived: Dict[str, List[Class]] = {}
+
+    def clear(self):
+        """
+        Forget every reference
+        """
+        self.used_by.clear()
+        self.derived.clear()
+
+    def add_derived(self, parent: Class, child: Class):
+        """
+        Record an inheritance
+        @param parent: Parent class
+        @param child: Class inheriting from parent
+        """
+        self.derived.setdefault(parent.get_qualified_name(), []).append(child)
+
+    def add_reference(self, target: Class, reference: Reference):
+        """
+        Record a member using a class
+        @param target: Class used
+        @param reference: Reference
+        """
+        if target is not reference.class_:
+            self.used_by.setdefault(target.get_qualified_name(), []).append(reference)
+
+    def get_used_by(self, class_: Class) -> List[Reference]:
+        """
+        Members using a class
+        @param class_: Class
+        @return: References, in resolution order
+        """
+        return self.used_by.get(class_.get_qualified_name(), [])
+
+    def get_derived(self, class_: Class) -> List[Class]:
+        """
+        Classes directly inheriting from a class
+        @param class_: Class
+        @return: Classes, in resolution order
+        """
+        return self.derived.get(class_.get_qualified_name(), [])
@@ -1,3 +1,4 @@
 # pylint: disable=missing-module-docstring
 from .languageparser import LanguageParser, ParsingError
+from .coverage import Coverage
 from .csharp import *
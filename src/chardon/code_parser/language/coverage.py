@@ -0,0 +1,54 @@
+"""
+Documentation coverage of a file
+"""
+from typing import Dict, List, Tuple
+
+from chardon.code_parser.structure import Scope
+
+# Kinds of declarations
+TYPE = 'type'
+MEMBER = 'member'
+
+
+class Coverage:
+    """
+    Documented and undocumented declarations of a file, counted by the parser while it reads it
+    Counts are kept by (class, kind, scope), so they can be summed per file, class or scope
+    """
+
+    def __init__(self):
+        # (class name, kind, scope) -> [documented, undocumented]
+        self.counts: Dict[Tuple[str, str, Scope], List[int]] = {}
+
+    def add(self, class_name: str, kind: str, scope: Scope, documented: bool):
+        """
+        Count a declaration
+        @param class_name: Class declared, or class of the member declared ("" outside of classes)
+        @param kind: TYPE or MEMBER
+        @param scope: Scope
+        @param documented: The declaration has a documentation comment
+        """
+        key = (class_name, kind, scope)
+        count = self.counts.get(key)
+        if count is None:
+            count = self.counts[key] = [0, 0]
+        count[0 if documented else 1] += 1
+
+    def merge(self, other: 'Coverage'):
+        """
+        Add the counts of another Coverage
+        @param other: Coverage
+        """
+        for (class_name, kind, scope), (documented, undocumented) in other.counts.items():
+            key = (class_name, kind, scope)
+            count = self.counts.setdefault(key, [0, 0])
+            count[0] += documented
+            count[1] += undocumented
+
+    def totals(self) -> Tuple[int, int]:
+        """
+        Count every declaration
+        @return: Documented, and undocumented declarations
+        """
+        return (sum(count[0] for count in self.counts.values()),
+                sum(count[1] for count in self.counts.values()))
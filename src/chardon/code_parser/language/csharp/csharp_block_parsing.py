@@ -2,12 +2,11 @@
 """
 C# Parser
 """
-import logging
+import functools
 import re
 from typing import List
 
-import regex
-
+from chardon import diagnostics
 from chardon.code_parser.language import ParsingError
 from chardon.code_parser.structure import Scope, Type, DictOfType, ArrayOfType, SpecificType, Parameter, Class, Field, \
     ClassVariant, Function
@@ -22,6 +21,20 @@ SCOPES = {
     'internal protected': Scope.PROTECTED,
     'protected private': Scope.PRIVATE,
 }
+
+@functools.cache
+def _compiled(pattern: str):
+    """
+    Compile a pattern with the regex module (needed for recursive patterns), once, on first use
+    Both the module and the patterns are slow to load, so this is delayed until a file is parsed
+    @param pattern: Pattern
+    @return: Compiled pattern
+    """
+    # pylint: disable=import-outside-toplevel
+    import regex
+    return regex.compile(pattern)
+
+
 # Parse
 # [Serializable] public static class AnimationManager
 # private static List<(int startIdx, int endIdx)> _blockTextIdxs = new List<(int startIdx, int endIdx)>(128);
@@ -77,7 +90,30 @@ COMMENT_TAG_ATTRIBUTES_REGEX = r'(?P<key>[\w\-\_]+) ?= ?(?P<quote>[\'\"])(?P<val
 # List<int>
 # Type<A<B, C<E>>, D>
 # Into their name and specification (List<int> -> name=List | type1=int)
-TYPE_REGEX = r'(?P<type>(?P<name>\w+)(?P<specification><(?&type) ?,? ?(?&type)?>)?)'
+TYPE_REGEX = r'(?P<type>(?P<name>[\w\.]+)(?P<specification><(?&type) ?,? ?(?&type)?>)?)'
+
+# Parse using directives
+# using System.Collections.Generic;
+# using static UnityEngine.Mathf;
+# using Vector = UnityEngine.Vector3;
+# Into the imported namespace (and its alias if any)
+USING_REGEX = re.compile(r'^(?:global )?using (?:static )?(?:(?P<alias>\w+) ?= ?)?(?P<namespace>[\w\.]+) ?;')
+
+# Parse namespace declaration (block or file scoped)
+# namespace Game.AI
+# namespace Game.AI;
+NAMESPACE_REGEX = re.compile(r'^namespace (?P<namespace>[\w\.]+)')
+
+# Parse the start of a declaration, to count it in the coverage
+# [SerializeField] private int speed;
+# public static class AnimationManager
+# Into its scope keywords (empty if it has none)
+DECLARATION_START_REGEX = re.compile(r'^(?:\[.*?\]\s*)*(?P<scope>(?:(?:public|protected|private|internal)\s+)*)')
+
+# Find the type a declaration declares, if any
+# public static class AnimationManager : MonoBehaviour
+# Into its name (AnimationManager)
+TYPE_DECLARATION_REGEX = re.compile(r'\b(?:class|struct|interface|enum|record)\s+(?P<name>\w+)')
 
 MODIFIERS = [
     'abstract',
@@ -117,9 +153,38 @@ class Block:
     """
 
     # I don't really like this name, can't find a better one
-    def __init__(self, comment: str, declaration: str):
+    def __init__(self, comment: str, declaration: str, namespace: str = "",
+                 usings: 'FileUsings' = None):
         self.comment = comment
         self.declaration = declaration
+        self.namespace = namespace
+        self.usings = usings or FileUsings()
+
+
+# pylint: disable=too-few-public-methods
+class FileUsings:
+    """
+    Using directives of a file : imported namespaces and aliases
+    """
+
+    def __init__(self):
+        self.namespaces: List[str] = []
+        self.aliases: dict[str, str] = {}
+
+    def add(self, line: str) -> bool:
+        """
+        Register a line if it is a using directive
+        @param line: Clean line
+        @return: Whether the line was a using directive
+        """
+        match = USING_REGEX.match(line)
+        if match is None:
+            return False
+        if match['alias']:
+            self.aliases[match['alias']] = match['namespace']
+        else:
+            self.namespaces.append(match['namespace'])
+        return True
 
 
 # pylint: disable=too-few-public-methods
@@ -147,20 +212,24 @@ def _parse_type(text: str) -> Type:
     @param text: input
     @return: Type
     """
-    match = regex.match(TYPE_REGEX, text)
+    text = text.strip()
+    if text.endswith('[]'):
+        return ArrayOfType(_parse_type(text[:-2]))
+
+    match = _compiled(TYPE_REGEX).match(text)
     if match is None:
         raise Exception(f"Could not parse type {text}")
     _, name, specification = match.groups()
 
     if specification is not None:
-        if name == "Dictionary":
-            key, value = [match[0] for match in regex.findall(TYPE_REGEX, specification)]
-            return DictOfType(key, value)
-        if name == "List":
-            return ArrayOfType(_parse_type(specification))
-
-        specifics = [match[0] for match in regex.findall(TYPE_REGEX, specification)]
-        return SpecificType(Type(name), specifics[0] or None, specifics[1] or None)
+        specifics = [_parse_type(match[0])
+                     for match in _compiled(TYPE_REGEX).findall(specification[1:-1])]
+        if name == "Dictionary" and len(specifics) == 2:
+            return DictOfType(specifics[0], specifics[1])
+        if name == "List" and len(specifics) == 1:
+            return ArrayOfType(specifics[0])
+
+        return SpecificType(Type(name), specifics[0], specifics[1] if len(specifics) > 1 else None)
     return Type(name)
 
 
@@ -264,7 +333,7 @@ def _parse_declaration(declaration: str) -> [str, str, str, List[str]]:
     @param declaration:
     @return: name, scope, modifiers, List of keywords
     """
-    keywords = [result[0] for result in regex.findall(DECLARATION_REGEX, declaration)]
+    keywords = [result[0] for result in _compiled(DECLARATION_REGEX).findall(declaration)]
     name: str = keywords.pop()
     scope, keywords = _find_scope(keywords)
 
@@ -282,7 +351,7 @@ def _parse_block(block: Block) -> Class | Field:
     declaration: str = block.declaration
     declaration.replace('\n', ' ')
 
-    match = regex.match(BLOCK_REGEX, declaration)
+    match = _compiled(BLOCK_REGEX).match(declaration)
     if match is {}:
         raise Exception(f"Invalid declaration : {block.declaration}")
     parts: dict = match.groupdict()
@@ -332,7 +401,7 @@ def _parse_block(block: Block) -> Class | Field:
         if len(keywords) == 1:
             return_type = keywords.pop()
             if return_type != "void":
-                return_types.append(Parameter('', [Type(return_type)]))
+                return_types.append(Parameter('', [_parse_type(return_type)]))
         else:
             raise ParsingError(f"Can't tell what is the return "
                                f"type of {name} : {block.declaration}")
@@ -342,9 +411,9 @@ def _parse_block(block: Block) -> Class | Field:
         result = Field(name, function, scope, attributes=attributes)
 
     else:
-        result = Field(name, Type(keywords.pop()), scope, default_value=parts['default_value'], attributes=attributes)
+        result = Field(name, _parse_type(keywords.pop()), scope, default_value=parts['default_value'], attributes=attributes)
 
     if len(keywords) > 0:
-        logging.warning("%s has unkown keywords : %s, will be ignored", result, keywords)
+        diagnostics.record('unknown-keywords', symbol=name, detail=', '.join(sorted(keywords)))
 
     return result
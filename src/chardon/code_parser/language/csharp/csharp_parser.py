@@ -1,14 +1,19 @@
 """
 Selective C# Parser
 """
-import logging
-from typing import List
+from typing import List, Tuple
 
 # pylint: disable=too-few-public-methods
-from chardon.code_parser.language.csharp.csharp_block_parsing import Block, \
-    _parse_block, _clean_line
+from chardon import diagnostics
+from chardon.code_parser.language.csharp.csharp_block_parsing import Block, FileUsings, \
+    NAMESPACE_REGEX, DECLARATION_START_REGEX, TYPE_DECLARATION_REGEX, SCOPES, _parse_block, \
+    _clean_line
 from chardon.code_parser.language import LanguageParser, ParsingError
-from chardon.code_parser.structure import Class, Field
+from chardon.code_parser.language.coverage import Coverage, TYPE, MEMBER
+from chardon.code_parser.structure import Class, Field, Scope
+
+# Undocumented lines starting with one of these may be declarations (see _count_undocumented)
+DECLARATION_PREFIXES = ('public', 'protected', 'private', 'internal', '[')
 
 
 class CSharpParser(LanguageParser):
@@ -60,31 +65,49 @@ class CSharpParser(LanguageParser):
     parsed in the file and the language read another 'class' somewhere else
     """
 
-    def _parse(self, lines: List[str], file: str) -> List[Class]:
+    # pylint: disable=too-many-branches
+    def _parse(self, lines: List[str], file: str, coverage: Coverage = None) -> List[Class]:
         """
         Parse the given lines into a list of Class
         """
-        blocks: List[Block] = self._parse_raw_code(lines)
+        # Undocumented declarations (see _parse_raw_code), only looked for to count them
+        undocumented: List[Tuple[int, str]] | None = [] if coverage is not None else None
+        blocks: List[Block] = self._parse_raw_code(lines, undocumented)
         classes: List[Class] = []
         current_class: Class | None = None
+        # Class the members counted in the coverage belong to (the last one declared)
+        class_name: str = ""
+        counted: int = 0
 
         # Parse all block
-        for block in blocks:
+        for index, block in enumerate(blocks):
+            if coverage is not None:
+                counted, class_name = _count_undocumented(coverage, undocumented, counted, index,
+                                                          class_name)
             try:
                 res: Class | Field = _parse_block(block)
             except ParsingError as e:
                 raise e
             except NotImplementedError as e:
-                logging.warning(e)
+                diagnostics.record('unsupported-declaration', detail=str(e))
                 continue
             except Exception as e:
                 raise ParsingError(str(e), line=block.comment + "\n" + block.declaration) from e
 
+            if coverage is not None:
+                if isinstance(res, Class):
+                    class_name = res.name
+                coverage.add(class_name, TYPE if isinstance(res, Class) else MEMBER, res.scope,
+                             True)
+
             # Focus on the new class
             if isinstance(res, Class):
                 if current_class:
                     classes.append(current_class)
                 current_class = res
+                # Used to resolve types against the class namespace and the file usings
+                current_class.attributes['namespace'] = block.namespace
+                current_class.attributes['usings'] = block.usings
 
             # Insert field in class
             else:
@@ -96,19 +119,31 @@ class CSharpParser(LanguageParser):
 
         if current_class:
             classes.append(current_class)
+        if coverage is not None:
+            _count_undocumented(coverage, undocumented, counted, len(blocks), class_name)
 
         return classes
 
     # pylint: disable=too-many-branches
-    def _parse_raw_code(self, lines: List[str]) -> List[Block]:
+    # pylint: disable=too-many-statements
+    # pylint: disable=too-many-locals
+    def _parse_raw_code(self, lines: List[str],
+                        undocumented: List[Tuple[int, str]] = None) -> List[Block]:
         """
         Parse all Comment and associated Declaration
         @param lines: raw code
+        @param undocumented: Filled with the undocumented declarations, and the number of blocks
+        found before each of them (None not to look for them)
         @return: List of comment and declaration
         """
         blocks: List[Block] = []
         inside_code: bool = False
 
+        # Namespaces are not scoped by counting brackets (see class docstring) :
+        # a class belongs to the last namespace declared before it
+        namespace: str = ""
+        usings: FileUsings = FileUsings()
+
         multilines_comment_in_declaration: bool = False
 
         current_comment: str = ""
@@ -168,7 +203,7 @@ class CSharpParser(LanguageParser):
 
                 # If we are no longer inside declaration (we hit either { or ;)
                 if not inside_code:
-                    blocks.append(Block(current_comment, current_declaration))
+                    blocks.append(Block(current_comment, current_declaration, namespace, usings))
 
                     # Reset value
                     current_comment = ""
@@ -180,19 +215,50 @@ class CSharpParser(LanguageParser):
 
             # Uncommented code
             else:
+                if line.startswith('using') and usings.add(line):
+                    continue
+
+                if line.startswith('namespace'):
+                    namespace_match = NAMESPACE_REGEX.match(line)
+                    if namespace_match:
+                        namespace = namespace_match['namespace']
+                        continue
+
                 if 'class' in line and len(blocks) > 0:
-                    logging.info("Undocumented class at %s %s, this can lead to parsing error"
-                                 " (issue will be created to explain further how this is a problem",
-                                 index, line)
+                    diagnostics.record('undocumented-class', line=index + 1, detail=line.strip())
                 if 'struct' in line and len(blocks) > 0:
-                    logging.info("Undocumented struct at %s %s, this can lead to parsing error"
-                                 " (issue will be created to explain further how this is a problem",
-                                 index, line)
+                    diagnostics.record('undocumented-struct', line=index + 1, detail=line.strip())
+
+                if undocumented is not None and line.startswith(DECLARATION_PREFIXES) \
+                        and DECLARATION_START_REGEX.match(line)['scope']:
+                    undocumented.append((len(blocks), line))
 
-                # pylint: disable=W0511
-                # Todo : add code coverage test and such, not in the project scope yet
                 if self.parameters.get('analyse_uncommented_code', False):
                     if 'class' in line:
-                        logging.info("Undocumented class at %s %s", index, line)
+                        diagnostics.record('uncommented-code', line=index + 1, detail=line.strip())
 
         return blocks
+
+
+def _count_undocumented(coverage: Coverage, undocumented: List[Tuple[int, str]], counted: int,
+                        blocks: int, class_name: str) -> Tuple[int, str]:
+    """
+    Count the undocumented declarations found before a block in the coverage
+    @param coverage: Coverage
+    @param undocumented: Undocumented declarations, and the number of blocks found before each
+    @param counted: Number of declarations already counted
+    @param blocks: Number of blocks parsed so far
+    @param class_name: Class the members belong to
+    @return: Number of declarations counted, and the class the next members belong to
+    """
+    while counted < len(undocumented) and undocumented[counted][0] <= blocks:
+        declaration = undocumented[counted][1]
+        scope = ' '.join(DECLARATION_START_REGEX.match(declaration)['scope'].split())
+        type_match = TYPE_DECLARATION_REGEX.search(declaration)
+        if type_match is not None:
+            class_name = type_match['name']
+            coverage.add(class_name, TYPE, SCOPES.get(scope, Scope.INTERNAL), False)
+        else:
+            coverage.add(class_name, MEMBER, SCOPES.get(scope, Scope.PRIVATE), False)
+        counted += 1
+    return counted, class_name
@@ -5,6 +5,8 @@ from abc import ABC
 from pathlib import Path
 from typing import List
 
+from chardon import diagnostics
+from chardon.code_parser.language.coverage import Coverage
 from chardon.code_parser.structure import Class
 
 
@@ -32,6 +34,15 @@ class LanguageParser(ABC):
     def __init__(self, parameters: dict = None):
         self.parameters = parameters or {}
 
+    def fingerprint(self) -> str:
+        """
+        Identify what the parser produces : its class and parameters
+        Files cached by a parser are only reused by parsers with the same fingerprint
+        @return: eg. chardon.code_parser.language.csharp.csharp_parser.CSharpParser[]
+        """
+        return f"{type(self).__module__}.{type(self).__qualname__}" \
+               f"{sorted(self.parameters.items())!r}"
+
     def parse(self, file: Path, encoding="utf-8") -> List[Class]:
         """
         Open a file and parse its content
@@ -40,14 +51,38 @@ class LanguageParser(ABC):
         @return: List of classes
         """
         with open(file, 'r', encoding=encoding) as f:
-            try:
-                return self._parse(f.readlines(), f.name)
-            except ParsingError as e:
-                e.file = file.name
-                raise e
-            except BaseException as e:
-                print(f"Uncaught exception at {file}")
-                raise e
-
-    def _parse(self, lines: List[str], file: str) -> List[Class]:
+            return self.parse_lines(f.readlines(), file)
+
+    def parse_bytes(self, content: bytes, file: Path, encoding="utf-8",
+                    coverage: Coverage = None) -> List[Class]:
+        """
+        Parse the raw content of a file, read from any source (archive, git, memory...)
+        @param content: Content of the file
+        @param file: Path of the file, used in errors
+        @param encoding: Encoding, default is utf-8
+        @param coverage: Coverage the declarations of the file are counted in
+        @return: List of classes
+        """
+        return self.parse_lines(content.decode(encoding).splitlines(keepends=True), file,
+                                coverage)
+
+    def parse_lines(self, lines: List[str], file: Path, coverage: Coverage = None) -> List[Class]:
+        """
+        Parse code already read, such as a file from an archive or a git blob
+        @param lines: Lines of code
+        @param file: Path of the code, used in errors
+        @param coverage: Coverage the declarations of the file are counted in
+        @return: List of classes
+        """
+        try:
+            with diagnostics.located(str(file)):
+                return self._parse(lines, str(file), coverage)
+        except ParsingError as e:
+            e.file = file.name
+            raise e
+        except BaseException as e:
+            print(f"Uncaught exception at {file}")
+            raise e
+
+    def _parse(self, lines: List[str], file: str, coverage: Coverage = None) -> List[Class]:
         raise NotImplementedError
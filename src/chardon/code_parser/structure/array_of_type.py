@@ -13,5 +13,5 @@ class ArrayOfType(Type):
     """
 
     def __init__(self, type_: Type, attributes: dict = None):
-        super().__init__(type_.name, attributes)
+        super().__init__(type_.name, attributes=attributes)
         self.type_ = type_
@@ -48,6 +48,21 @@ class Class(Type):
         self.variant = variant
         self.attributes = attributes or {}
 
+    def get_namespace(self) -> str:
+        """
+        Namespace the class is declared in
+        @return: namespace ("" for the global namespace)
+        """
+        return self.attributes.get('namespace', "")
+
+    def get_qualified_name(self) -> str:
+        """
+        Name of the class, prefixed by its namespace
+        @return: qualified name
+        """
+        namespace = self.get_namespace()
+        return f"{namespace}.{self.name}" if namespace else self.name
+
     def add_field(self, field: Field):
         """
         Add field in class
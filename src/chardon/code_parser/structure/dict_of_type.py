@@ -13,6 +13,6 @@ class DictOfType(Type):
     """
 
     def __init__(self, key: Type, value: Type, attributes: dict = None):
-        super().__init__(key.name, attributes)
+        super().__init__(key.name, attributes=attributes)
         self.key = key
         self.value = value
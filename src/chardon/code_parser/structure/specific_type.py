@@ -13,7 +13,7 @@ class SpecificType(Type):
 
     def __init__(self, type_: Type, specific1: Type, specific2: Type = None,
                  attributes: dict = None):
-        super().__init__(type_.name, attributes)
+        super().__init__(type_.name, attributes=attributes)
         self.type_ = type_
         self.specific1 = specific1
         self.specific2 = specific2
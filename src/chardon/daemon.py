@@ -0,0 +1,297 @@
+"""
+Long-lived documentation daemon, answering requests over a local socket (HTTP + JSON)
+"""
+import http.server
+import json
+import logging
+import pickle
+import socketserver
+import threading
+from pathlib import Path, PurePosixPath
+from typing import Callable, Dict, List, Tuple
+
+from chardon.code_arranger import DocArticle
+from chardon.code_parser.language import ParsingError
+from chardon.code_parser.structure import Class
+from chardon.daemon_client import DEFAULT_PORT, DaemonError
+from chardon.diagnostics import Diagnostics
+from chardon.documentation.build_manifest import BuildManifest
+from chardon.documentation.project_manager import ProjectManager, ParsingResult
+from chardon.documentation.sources import DirectorySource
+from chardon.exporter import ContentExport
+
+
+# pylint: disable=too-many-instance-attributes
+class DocumentationDaemon:
+    """
+    Keep the model of a project in memory, so editors and hooks don't parse the project again
+    Each file is kept as pickled classes (before types are resolved) : re-indexing files only parses
+    them, and the model is rebuilt from the pickles of the others
+    Rendered pages are kept along their signature (see BuildManifest), and rendered again only
+    when something they show has changed
+    """
+
+    def __init__(self, factory: Callable[[], ProjectManager], directory: Path,
+                 exporters: Dict[str, ContentExport]):
+        """
+        Parse a project and keep its model
+        @param factory: Create a ProjectManager (parser, filters, targets), without parsing
+        @param directory: Project directory
+        @param exporters: Exporters pages can be rendered with, by format name
+        """
+        self.factory = factory
+        self.directory = directory
+        self.exporters = exporters
+        # Requests are answered one at a time, exporters holding state while rendering
+        self.lock = threading.Lock()
+
+        # File path, from the project directory -> pickled classes
+        self.files: Dict[str, bytes] = {}
+        # (format, qualified name) -> (signature, content)
+        self.pages: Dict[Tuple[str, str], Tuple[str, str]] = {}
+
+        self.project = factory()
+        self._parse(dict(DirectorySource(directory).files(self.project.accept)))
+        self._rebuild()
+
+    def _parse(self, files: Dict[PurePosixPath, bytes | None]):
+        """
+        Parse files, and keep their classes
+        @param files: File path -> content (None if the file was removed)
+        """
+        for path in [path for path, content in files.items() if content is None]:
+            self.files.pop(path.as_posix(), None)
+        updated = [(Path(path), content) for path, content in files.items() if content is not None]
+        for (path, _content), (classes, _coverage) in zip(updated,
+                                                          self.project.parse_files(updated)):
+            self.files[path.as_posix()] = pickle.dumps(classes)
+
+    def _rebuild(self):
+        """
+        Rebuild the model from the classes of every file
+        """
+        project = self.factory()
+        for path, classes in self.files.items():
+            project.add_result(ParsingResult(Path(path), Path(path), pickle.loads(classes)))
+        project.resolve()
+        self.project = project
+
+    def find(self, name: str) -> Class:
+        """
+        Find a class
+        @param name: Qualified name, or name if no other class has it
+        @return: Class
+        """
+        class_ = self.project.classes.get(name)
+        if class_ is None:
+            homonyms = self.project.symbols.by_name.get(name, [])
+            if len(homonyms) != 1:
+                raise DaemonError(f"Unknown class {name}" if not homonyms else
+                                  f"Ambiguous class {name} : " +
+                                  ', '.join(homonym.get_qualified_name() for homonym in homonyms))
+            class_ = homonyms[0]
+        return class_
+
+    # pylint: disable=redefined-builtin
+    def render(self, name: str, format: str = 'markdown') -> dict:
+        """
+        Render the page of a class
+        @param name: Class
+        @param format: Format name
+        @return: Class, page path and content
+        """
+        if format not in self.exporters:
+            raise DaemonError(f"Unknown format {format}, "
+                              f"expected one of {', '.join(self.exporters)}")
+        class_ = self.find(name)
+        exporter = self.exporters[format]
+        uri: Path = class_.attributes['uri']
+        context = self.project.context
+        with context.active():
+            article = DocArticle(class_, uri.parent, self.project.references,
+                                 self.project.inheritance)
+
+            key = (format, class_.get_qualified_name())
+            # Shapes of classes are cached until the model is rebuilt
+            signature = BuildManifest.signature(class_, article.dependencies.values(),
+                                                context.cache('shapes'), format)
+            if key not in self.pages or self.pages[key][0] != signature:
+                self.pages[key] = (signature, exporter.export(article.to_contents(), context))
+        return {'class': class_.get_qualified_name(),
+                'page': PurePosixPath(*uri.parts).as_posix() + exporter.PREFERRED_EXTENSION,
+                'content': self.pages[key][1]}
+
+    def reindex(self, files: List[str]) -> dict:
+        """
+        Parse files again (eg. once saved in an editor), and rebuild the model
+        @param files: File paths, from the project directory (removed files are forgotten)
+        @return: Number of files parsed and removed, and of classes
+        """
+        contents: Dict[PurePosixPath, bytes | None] = {}
+        directory = self.directory.resolve()
+        for file in files:
+            path = PurePosixPath(Path(file).as_posix())
+            if not (self.directory / path).resolve().is_relative_to(directory):
+                raise DaemonError(f"{file} is outside the project")
+            if (self.directory / path).is_file() and self.project.accept(path):
+                contents[path] = (self.directory / path).read_bytes()
+            else:
+                contents[path] = None
+        self._parse(contents)
+        self._rebuild()
+        return {'parsed': sum(content is not None for content in contents.values()),
+                'removed': sum(content is None for content in contents.values()),
+                'classes': len(self.project.classes)}
+
+    def symbols(self, query: str = "", limit: int = 50) -> List[dict]:
+        """
+        Find classes by name
+        @param query: Part of the name (case insensitive), names starting with it come first
+        @param limit: Maximum number of classes
+        @return: Name, qualified name, variant and page of each class
+        """
+        query = query.lower()
+        found = [class_ for class_ in self.project.classes.values()
+                 if query in class_.name.lower()]
+        found.sort(key=lambda class_: (not class_.name.lower().startswith(query),
+                                       len(class_.name), class_.name))
+        return [{'name': class_.name, 'qualified_name': class_.get_qualified_name(),
+                 'variant': class_.variant.name,
+                 'uri': PurePosixPath(*class_.attributes['uri'].parts).as_posix()}
+                for class_ in found[:limit]]
+
+    def export(self, incremental: bool = True) -> dict:
+        """
+        Export the project to the targets of the ProjectManager
+        @param incremental: Only export the pages whose dependencies changed
+        @return: Pages written
+        """
+        self.project.export(incremental=incremental)
+        return {'pages': [page.as_posix() for page in self.project.exported_pages]}
+
+    def call(self, method: str, params: dict):
+        """
+        Answer a request
+        @param method: render, reindex, symbols or export
+        @param params: Arguments of the method
+        @return: Result, serializable as JSON
+        """
+        if method not in ('render', 'reindex', 'symbols', 'export'):
+            raise DaemonError(f"Unknown method {method}")
+        try:
+            with self.lock, Diagnostics().collecting() as issues:
+                result = getattr(self, method)(**params)
+        except TypeError as e:
+            raise DaemonError(f"Invalid parameters for {method} : {e}") from e
+        # Issues found while answering, reported once per request
+        issues.emit()
+        return result
+
+
+class _RequestHandler(http.server.BaseHTTPRequestHandler):
+    """
+    POST / with {"method": ..., "params": {...}}, answered with {"result": ...} or {"error": ...}
+    """
+
+    server: '_HTTPServer | _UnixHTTPServer'
+
+    # Hosts of the requests of local clients (HTTP clients send the host they connect to)
+    LOCAL_HOSTS = ('127.0.0.1', 'localhost')
+
+    def _rejected(self) -> str | None:
+        """
+        Tell why a request doesn't come from a local client : web pages can send requests to
+        localhost, but not with a JSON content type (without a preflight, which isn't answered),
+        nor with a local Host once a DNS name is rebound to 127.0.0.1
+        @return: Reason, or None if the request can be answered
+        """
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip()
+        if content_type != 'application/json':
+            return f"Expected Content-Type application/json, got {content_type or 'none'}"
+        host = self.headers.get('Host', '').rpartition(':')[0] or self.headers.get('Host', '')
+        if host not in self.LOCAL_HOSTS:
+            return f"Only local clients are answered, got Host {host or 'none'}"
+        return None
+
+    # pylint: disable=invalid-name
+    # pylint: disable=broad-exception-caught
+    def do_POST(self):
+        """
+        Answer a request
+        """
+        shutdown = False
+        rejected = self._rejected()
+        if rejected is not None:
+            status, body = 403, {'error': rejected}
+        else:
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                shutdown = request.get('method') == 'shutdown'
+                result = None if shutdown else self.server.documentation.call(
+                    request.get('method'), request.get('params', {}))
+                status, body = 200, {'result': result}
+            except (ValueError, AttributeError, DaemonError, ParsingError) as e:
+                status, body = 400, {'error': str(e)}
+            # Any failure is answered, the daemon keeps serving the other requests
+            except Exception as e:
+                logging.exception("Failed to answer a request")
+                status, body = 500, {'error': f"{type(e).__name__} : {e}"}
+
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+        self.wfile.flush()
+
+        if shutdown:
+            # From another thread, as shutdown waits for the server loop to stop
+            threading.Thread(target=self.server.shutdown).start()
+
+    def address_string(self) -> str:
+        # Unix sockets have no client address
+        return self.client_address[0] if self.client_address else 'local'
+
+    # pylint: disable=redefined-builtin
+    def log_message(self, format: str, *args):
+        logging.debug(format, *args)
+
+
+class _HTTPServer(http.server.ThreadingHTTPServer):
+    """
+    HTTP server listening on localhost, holding the daemon answering requests
+    """
+
+    documentation: DocumentationDaemon
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    HTTP server listening on a Unix socket, holding the daemon answering requests
+    """
+
+    daemon_threads = True
+    documentation: DocumentationDaemon
+
+
+def serve(daemon: DocumentationDaemon, port: int = DEFAULT_PORT, socket_path: Path = None):
+    """
+    Answer requests until a shutdown request
+    @param daemon: DocumentationDaemon
+    @param port: Port, on localhost only
+    @param socket_path: Unix socket to listen on instead of a port
+    """
+    if socket_path is not None:
+        socket_path.unlink(missing_ok=True)
+        server = _UnixHTTPServer(str(socket_path), _RequestHandler)
+    else:
+        server = _HTTPServer(('127.0.0.1', port), _RequestHandler)
+    server.documentation = daemon
+    logging.info("Serving %s", socket_path or f"http://127.0.0.1:{port}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if socket_path is not None:
+            socket_path.unlink(missing_ok=True)
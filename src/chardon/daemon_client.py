@@ -0,0 +1,68 @@
+"""
+Client of the documentation daemon, kept apart so hooks and editors don't import the whole model
+"""
+import http.client
+import json
+import socket
+from pathlib import Path
+
+DEFAULT_PORT: int = 7420
+
+
+class DaemonError(Exception):
+    """
+    Error raised when a request can't be answered (unknown class, method...)
+    """
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """
+    HTTP connection over a Unix socket
+    """
+
+    def __init__(self, socket_path: Path, timeout: float):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(str(self.socket_path))
+
+
+# pylint: disable=too-few-public-methods
+class DaemonClient:
+    """
+    Send requests to a running daemon
+    """
+
+    def __init__(self, port: int = DEFAULT_PORT, socket_path: Path = None, timeout: float = 60):
+        """
+        Init a DaemonClient
+        @param port: Port of the daemon, on localhost
+        @param socket_path: Unix socket of the daemon, instead of a port
+        @param timeout: Seconds to wait for an answer
+        """
+        self.port = port
+        self.socket_path = socket_path
+        self.timeout = timeout
+
+    def call(self, method: str, **params):
+        """
+        Send a request
+        @param method: render, reindex, symbols, export or shutdown
+        @param params: Arguments of the method
+        @return: Result
+        """
+        connection = _UnixHTTPConnection(self.socket_path, self.timeout) \
+            if self.socket_path is not None \
+            else http.client.HTTPConnection('127.0.0.1', self.port, timeout=self.timeout)
+        try:
+            connection.request('POST', '/', json.dumps({'method': method, 'params': params}),
+                               {'Content-Type': 'application/json'})
+            body = json.loads(connection.getresponse().read())
+        finally:
+            connection.close()
+        if 'error' in body:
+            raise DaemonError(body['error'])
+        return body['result']
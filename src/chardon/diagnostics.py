@@ -0,0 +1,206 @@
+"""
+Issues found while parsing and exporting a project (missing summaries, undocumented classes...)
+Issues are recorded as tuples in the active Diagnostics, and reported once at the end of a run,
+instead of being logged one by one
+"""
+import contextlib
+import contextvars
+import logging
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+# Code -> (logging level, message)
+ISSUES: Dict[str, Tuple[int, str]] = {
+    'missing-summary': (logging.ERROR, "Summary is missing"),
+    'long-summary': (logging.WARNING, "Summary is too long"),
+    'multiline-summary': (logging.WARNING, "Summary contains more than one line,"
+                                           " it may lead to incorrect formatting"),
+    'undocumented-member': (logging.ERROR, "Member can't be documented"),
+    'undocumented-class': (logging.INFO, "Undocumented class, this can lead to parsing errors"),
+    'undocumented-struct': (logging.INFO, "Undocumented struct, this can lead to parsing errors"),
+    'uncommented-code': (logging.INFO, "Undocumented class"),
+    'unsupported-declaration': (logging.WARNING, "Declaration is not supported, it is ignored"),
+    'unknown-keywords': (logging.WARNING, "Unknown keywords are ignored"),
+    'inheritance-cycle': (logging.WARNING, "Inheritance cycle, the link is ignored"),
+    'duplicate-class': (logging.WARNING, "Class is declared more than once,"
+                                         " only the last one is kept"),
+    'toc-description': (logging.WARNING, "Table of content doesn't support descriptions,"
+                                         " they are skipped"),
+    'table-line-break': (logging.WARNING, "Table element contains a line break,"
+                                          " which is unsupported"),
+}
+
+# File, line, symbol, detail
+Issue = Tuple[str | None, int | None, str | None, str | None]
+
+# Diagnostics issues are recorded in, None to log them right away
+_collector: contextvars.ContextVar = contextvars.ContextVar('chardon_diagnostics', default=None)
+# File being parsed or exported, when issues don't tell it
+_file: contextvars.ContextVar = contextvars.ContextVar('chardon_diagnostics_file', default=None)
+
+
+def level_of(code: str) -> int:
+    """
+    Logging level of an issue
+    @param code: Issue code
+    @return: Level (unknown codes are warnings)
+    """
+    return ISSUES.get(code, (logging.WARNING, code))[0]
+
+
+def describe(code: str, issue: Issue) -> str:
+    """
+    Describe an issue in a single line
+    @param code: Issue code
+    @param issue: Issue
+    @return: eg. "Summary is missing : Entity.Speed (Core/Entity.cs) [missing-summary]"
+    """
+    file, line, symbol, detail = issue
+    text = ISSUES.get(code, (logging.WARNING, code))[1]
+    if symbol is not None:
+        text += f" : {symbol}"
+    if detail is not None:
+        text += f" ({detail})"
+    if file is not None:
+        text += f" at {file}" + (f":{line}" if line is not None else "")
+    return text + f" [{code}]"
+
+
+class Diagnostics:
+    """
+    Collect issues, by code
+    Issues are recorded while the Diagnostics is active (see collecting), from any module
+    """
+
+    def __init__(self):
+        # Code -> issues, in the order they were found
+        self.issues: Dict[str, List[Issue]] = {}
+
+    def add(self, code: str, file: str = None, line: int = None, symbol: str = None,
+            detail: str = None):
+        """
+        Record an issue
+        @param code: Issue code (see ISSUES)
+        @param file: File
+        @param line: Line number
+        @param symbol: Class or member
+        @param detail: Anything else worth telling (length, keywords...)
+        """
+        issues = self.issues.get(code)
+        if issues is None:
+            issues = self.issues[code] = []
+        issues.append((file, line, symbol, detail))
+
+    def merge(self, other: 'Diagnostics'):
+        """
+        Record the issues of another Diagnostics (eg. collected by a worker process)
+        @param other: Diagnostics
+        """
+        for code, issues in other.issues.items():
+            self.issues.setdefault(code, []).extend(issues)
+
+    def count(self, code: str = None) -> int:
+        """
+        Count issues
+        @param code: Issue code, None for all of them
+        @return: Number of issues
+        """
+        if code is not None:
+            return len(self.issues.get(code, []))
+        return sum(len(issues) for issues in self.issues.values())
+
+    def failures(self, codes: Iterable[str]) -> List[str]:
+        """
+        Find the codes that were found, among the ones that should fail a run
+        @param codes: Issue codes
+        @return: Codes with at least one issue
+        """
+        return [code for code in codes if self.issues.get(code)]
+
+    @contextlib.contextmanager
+    def collecting(self) -> Iterator['Diagnostics']:
+        """
+        Record the issues found in this context (and thread) in this Diagnostics
+        @return: self
+        """
+        token = _collector.set(self)
+        try:
+            yield self
+        finally:
+            _collector.reset(token)
+
+    def summary(self, examples: int = 3) -> str:
+        """
+        Aggregated report : number of issues by code, most severe first, with a few examples
+        @param examples: Issues shown for each code
+        @return: Report, empty if there is no issue
+        """
+        lines: List[str] = []
+        for code in sorted(self.issues, key=lambda code: (-level_of(code), code)):
+            issues = self.issues[code]
+            lines.append(f"{logging.getLevelName(level_of(code))} {code} : {len(issues)}")
+            lines.extend("    " + describe(code, issue) for issue in issues[:examples])
+            if len(issues) > examples:
+                lines.append(f"    ... and {len(issues) - examples} more")
+        return "\n".join(lines)
+
+    def emit(self, examples: int = 3):
+        """
+        Log the aggregated report, once, at the level of the most severe issue
+        @param examples: Issues shown for each code
+        """
+        if not self.issues:
+            return
+        level = max(level_of(code) for code in self.issues)
+        logging.log(level, "%s issues found\n%s", self.count(), self.summary(examples))
+
+    def to_json(self) -> dict:
+        """
+        Issues, serializable as JSON
+        @return: Code -> level, and issues (file, line, symbol, detail)
+        """
+        return {code: {'level': logging.getLevelName(level_of(code)),
+                       'issues': [list(issue) for issue in issues]}
+                for code, issues in self.issues.items()}
+
+    def replay(self):
+        """
+        Record every issue again, in the active Diagnostics (or log them)
+        """
+        for code, issues in self.issues.items():
+            for file, line, symbol, detail in issues:
+                record(code, file, line, symbol, detail)
+
+
+def record(code: str, file: str = None, line: int = None, symbol: str = None,
+           detail: str = None):
+    """
+    Record an issue in the active Diagnostics
+    Outside of Diagnostics.collecting, the issue is logged right away
+    @param code: Issue code (see ISSUES)
+    @param file: File (defaults to the file being processed, see located)
+    @param line: Line number
+    @param symbol: Class or member
+    @param detail: Anything else worth telling
+    """
+    if file is None:
+        file = _file.get()
+    collector: Diagnostics | None = _collector.get()
+    if collector is not None:
+        collector.add(code, file, line, symbol, detail)
+        return
+    level = level_of(code)
+    if logging.getLogger().isEnabledFor(level):
+        logging.log(level, "%s", describe(code, (file, line, symbol, detail)))
+
+
+@contextlib.contextmanager
+def located(file: str) -> Iterator[None]:
+    """
+    Tell the file being processed, for the issues recorded without one
+    @param file: File
+    """
+    token = _file.set(file)
+    try:
+        yield
+    finally:
+        _file.reset(token)
@@ -1,2 +1,8 @@
 # pylint: disable=missing-module-docstring
 from .project_manager import ProjectManager
+from .symbol_table import SymbolTable, ResolutionContext
+from .build_manifest import BuildManifest
+from .search_index import SearchIndex
+from .coverage_report import CoverageReport
+from .sources import Source, DirectorySource, ZipSource, TarSource, MemorySource, GitTreeSource
+from .sinks import Sink, DirectorySink, ZipSink, TarSink, MemorySink, ContentAddressedSink
@@ -0,0 +1,162 @@
+"""
+Manifest of exported pages, to only export again the pages whose dependencies changed
+"""
+import hashlib
+import json
+import logging
+from pathlib import PurePosixPath
+from typing import Dict, Iterable
+
+from chardon.code_parser.structure import Class, Field, Function, Type, ArrayOfType, \
+    DictOfType, SpecificType
+from chardon.documentation.sinks import Sink
+
+MANIFEST_NAME: PurePosixPath = PurePosixPath(".chardon-manifest.json")
+
+# Version of the rendered pages, part of every signature : bump it whenever Chardon renders pages
+# differently (escaping, layout...), so pages exported by a previous version are exported again
+RENDER_VERSION: int = 2
+
+
+def type_signature(type_: Type | Function) -> str:
+    """
+    Describe a type as rendered on a page (classes are described by their qualified name)
+    @param type_: Type, or Function
+    @return: Signature
+    """
+    if isinstance(type_, Class):
+        return '@' + type_.get_qualified_name()
+    if isinstance(type_, Function):
+        inputs = ','.join('|'.join(map(type_signature, param.types)) for param in type_.inputs)
+        outputs = ','.join('|'.join(map(type_signature, param.types)) for param in type_.outputs)
+        return f"({inputs})->({outputs})"
+    if isinstance(type_, ArrayOfType):
+        return type_signature(type_.type_) + '[]'
+    if isinstance(type_, DictOfType):
+        return f"{{{type_signature(type_.key)}:{type_signature(type_.value)}}}"
+    if isinstance(type_, SpecificType):
+        specifics = type_signature(type_.specific1)
+        if type_.specific2 is not None:
+            specifics += ',' + type_signature(type_.specific2)
+        return f"{type_signature(type_.type_)}<{specifics}>"
+    return type_.name
+
+
+def _field_shape(field: Field) -> str:
+    """
+    Describe what other pages show of a field
+    @param field: Field
+    @return: Shape
+    """
+    return f"{field.name} {field.scope.name} {type_signature(field.type)} {field.default_value}"
+
+
+def class_shape(class_: Class) -> str:
+    """
+    Hash what other pages show of a class : its name, uri, parents and members
+    @param class_: Class
+    @return: Hash
+    """
+    shape = [class_.get_qualified_name(), str(class_.attributes.get('uri', '')),
+             class_.scope.name, class_.variant.name,
+             ','.join(map(type_signature, class_.inherits))]
+    shape.extend(map(_field_shape, class_.fields or []))
+    return hashlib.sha1('\n'.join(shape).encode()).hexdigest()
+
+
+def class_content(class_: Class) -> str:
+    """
+    Hash everything the page of a class shows of it : its shape, plus its comments
+    @param class_: Class
+    @return: Hash
+    """
+    content = [class_shape(class_), repr(class_.attributes.get('attributes', ''))]
+    content.extend(f"{tag}:{comment.content}"
+                   for tag, comment in class_.attributes.get('comments', {}).items())
+    for field in class_.fields or []:
+        content.extend(f"{field.name}.{tag}:{comment.content}"
+                       for tag, comment in field.attributes.get('comments', {}).items())
+        content.extend(f"{field.name}#{name}:{comment}"
+                       for name, comment in field.attributes.get('params', {}).items())
+    return hashlib.sha1('\n'.join(content).encode()).hexdigest()
+
+
+class BuildManifest:
+    """
+    Signature of each page exported in a sink
+    A page signature covers the content of its class, and the shape of every class it renders
+    (links, inherited members, usages...), so a page is exported again if and only if
+    something it shows has changed
+    """
+
+    def __init__(self, sink: Sink):
+        """
+        Load the manifest of an output (empty if there is none yet)
+        @param sink: Where the pages are written
+        """
+        self.sink = sink
+        # Page, relative to the root of the sink -> signature
+        self.pages: Dict[str, str] = {}
+        self.previous: Dict[str, str] = {}
+
+        manifest = sink.read(MANIFEST_NAME)
+        if manifest is not None:
+            try:
+                self.previous = json.loads(manifest).get('pages', {})
+            except ValueError as e:
+                logging.warning("Ignoring unreadable manifest : %s", e)
+
+    @staticmethod
+    def signature(class_: Class, dependencies: Iterable[Class], shapes: Dict[str, str],
+                  context: str = "") -> str:
+        """
+        Compute the signature of the page of a class
+        @param class_: Class documented by the page
+        @param dependencies: Classes rendered in the page
+        @param shapes: Memoized class_shape, by qualified name
+        @param context: Anything else the page depends on (eg. exporter settings)
+        (the version of the rendering, RENDER_VERSION, is always part of it)
+        @return: Signature
+        """
+        parts = [f"render {RENDER_VERSION}", context, class_content(class_)]
+        for dependency in sorted(dependencies, key=Class.get_qualified_name):
+            name = dependency.get_qualified_name()
+            if name not in shapes:
+                shapes[name] = class_shape(dependency)
+            parts.append(f"{name}={shapes[name]}")
+        return hashlib.sha1('\n'.join(parts).encode()).hexdigest()
+
+    def is_fresh(self, page: PurePosixPath, signature: str) -> bool:
+        """
+        Tell if a page was already exported with the same signature, and keep it if so
+        @param page: Page, relative to the root of the sink
+        @param signature: Signature of the page
+        @return: True if the page doesn't need to be exported again
+        """
+        key = page.as_posix()
+        if self.previous.get(key) == signature and self.sink.exists(page):
+            self.pages[key] = signature
+            return True
+        return False
+
+    def record(self, page: PurePosixPath, signature: str):
+        """
+        Record an exported page
+        @param page: Page, relative to the root of the sink
+        @param signature: Signature of the page
+        """
+        self.pages[page.as_posix()] = signature
+
+    def remove_stale_pages(self):
+        """
+        Delete the pages exported previously whose class doesn't exist anymore
+        """
+        for page in self.previous.keys() - self.pages.keys():
+            self.sink.remove(PurePosixPath(page))
+
+    def save(self):
+        """
+        Write the manifest in the sink
+        """
+        self.sink.write(MANIFEST_NAME,
+                        json.dumps({'pages': self.pages}, indent=1, sort_keys=True))
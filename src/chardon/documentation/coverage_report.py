@@ -0,0 +1,130 @@
+"""
+Documentation coverage of a project, from the coverage counted while parsing each file
+"""
+from typing import Dict, List, Tuple
+
+from chardon.article_builder import Content, TableRow
+from chardon.code_parser.language import Coverage
+
+COVERAGE_PAGE = 'coverage'
+COVERAGE_JSON = 'coverage.json'
+
+
+def ratio(documented: int, undocumented: int) -> float:
+    """
+    Share of documented declarations
+    @param documented: Documented declarations
+    @param undocumented: Undocumented declarations
+    @return: Percentage, 100 if there is no declaration
+    """
+    total = documented + undocumented
+    return round(100 * documented / total, 1) if total else 100.0
+
+
+def _counts(documented: int, undocumented: int) -> dict:
+    """
+    Counts, serializable as JSON
+    @return: Documented, undocumented, and coverage (percentage)
+    """
+    return {'documented': documented, 'undocumented': undocumented,
+            'coverage': ratio(documented, undocumented)}
+
+
+class CoverageReport:
+    """
+    Documented and undocumented declarations of a project, summed by file, class and scope
+    """
+
+    def __init__(self, files: Dict[str, Coverage]):
+        """
+        Sum the coverage of each file
+        @param files: File path -> Coverage
+        """
+        self.files = files
+        self.scopes: Dict[str, List[int]] = {}
+        self.kinds: Dict[str, List[int]] = {}
+        # File -> class -> [documented, undocumented]
+        self.classes: Dict[str, Dict[str, List[int]]] = {}
+        for file, coverage in files.items():
+            classes = self.classes.setdefault(file, {})
+            for (class_name, kind, scope), (documented, undocumented) in coverage.counts.items():
+                for counts in (self.scopes.setdefault(scope.name.lower(), [0, 0]),
+                               self.kinds.setdefault(kind, [0, 0]),
+                               classes.setdefault(class_name, [0, 0])):
+                    counts[0] += documented
+                    counts[1] += undocumented
+
+    def totals(self) -> Tuple[int, int]:
+        """
+        Count every declaration of the project
+        @return: Documented, and undocumented declarations
+        """
+        return (sum(counts[0] for counts in self.kinds.values()),
+                sum(counts[1] for counts in self.kinds.values()))
+
+    def to_json(self) -> dict:
+        """
+        Report, serializable as JSON
+        @return: Totals, then counts by kind, scope, file and class
+        """
+        return {
+            **_counts(*self.totals()),
+            'kinds': {kind: _counts(*counts) for kind, counts in sorted(self.kinds.items())},
+            'scopes': {scope: _counts(*counts) for scope, counts in sorted(self.scopes.items())},
+            'files': {file: {**_counts(*coverage.totals()),
+                             'classes': {class_name: _counts(*counts) for class_name, counts
+                                         in sorted(self.classes[file].items())}}
+                      for file, coverage in sorted(self.files.items())},
+        }
+
+    def to_contents(self) -> List[Content]:
+        """
+        Summary page : totals, then coverage by scope, file, and of the least documented classes
+        @return: Contents
+        """
+        documented, undocumented = self.totals()
+        contents: List[Content] = [
+            Content.Title("Documentation coverage", 1),
+            Content.Text(f"{ratio(documented, undocumented)} % of the declarations are "
+                         f"documented ({documented} documented, {undocumented} undocumented)"),
+        ]
+
+        headers = ["Documented", "Undocumented", "Coverage"]
+        contents.append(Content.Title("Scopes", 2))
+        contents.append(_table(["Scope"] + headers, [([scope], counts) for scope, counts
+                                                     in sorted(self.scopes.items())]))
+
+        # Least documented first
+        files = sorted(self.files.items(), key=lambda item: (ratio(*item[1].totals()), item[0]))
+        contents.append(Content.Title("Files", 2))
+        contents.append(_table(["File"] + headers,
+                               [([file], coverage.totals()) for file, coverage in files]))
+
+        classes = sorted(((file, class_name, counts)
+                          for file, file_classes in self.classes.items()
+                          for class_name, counts in file_classes.items() if counts[1]),
+                         key=lambda item: (-item[2][1], item[0], item[1]))
+        if classes:
+            contents.append(Content.Title("Undocumented declarations", 2))
+            contents.append(_table(["Class", "File"] + headers,
+                                   [([class_name or "(outside of classes)", file], counts)
+                                    for file, class_name, counts in classes]))
+        return contents
+
+
+def _table(headers: List[str], rows: List[Tuple[List[str], Tuple[int, int] | List[int]]]) \
+        -> Content:
+    """
+    Table of counts
+    @param headers: Name of the columns
+    @param rows: Name cells, and (documented, undocumented) of each row
+    @return: Table Content
+    """
+    table = Content.Table(headers, [])
+    for names, (documented, undocumented) in rows:
+        table.add_row(TableRow([Content.Text(text) for text in names] + [
+            Content.Text(str(documented)),
+            Content.Text(str(undocumented)),
+            Content.Text(f"{ratio(documented, undocumented)} %"),
+        ]))
+    return table
@@ -0,0 +1,262 @@
+"""
+Read a project straight from the objects of a git repository, without checkout
+"""
+import logging
+import pickle
+import subprocess
+from pathlib import Path
+from typing import IO, Dict, Iterable, List, Tuple
+
+from chardon.code_parser.language import Coverage
+from chardon.code_parser.structure import Class
+
+# Version of the pickled documentation model (Class, Field...)
+# Parse caches written with another version are discarded
+MODEL_VERSION: int = 1
+
+
+class GitError(Exception):
+    """
+    Error raised when a git command fails
+    """
+
+    def __init__(self, message: str):
+        self.message = message
+
+    def __str__(self):
+        return f'{self.message}'
+
+
+# pylint: disable=too-few-public-methods
+class GitChange:
+    """
+    A file changed between two revisions, as listed by git diff --name-status
+    """
+
+    def __init__(self, status: str, path: str, old_path: str = None):
+        """
+        Init a GitChange
+        @param status: A (added), M (modified), D (deleted), R (renamed), C (copied)...
+        @param path: Path of the file, in the new revision
+        @param old_path: Path of the file in the old revision, for renames and copies
+        """
+        self.status = status
+        self.path = path
+        self.old_path = old_path
+
+    def __repr__(self):
+        return f"<GitChange {self.status} {self.path}>"
+
+
+class GitRepository:
+    """
+    Local git repository, read through git commands
+    """
+
+    def __init__(self, path: Path):
+        """
+        Init a GitRepository
+        @param path: Path to the repository (or any directory within it)
+        """
+        self.path = path
+
+    def run(self, *args: str) -> bytes:
+        """
+        Run a git command in the repository
+        @param args: Arguments of the command
+        @return: Output
+        """
+        process = subprocess.run(['git', '-C', str(self.path), *args],
+                                 capture_output=True, check=False)
+        if process.returncode != 0:
+            raise GitError(f"git {' '.join(args)} failed : "
+                           f"{process.stderr.decode(errors='replace').strip()}")
+        return process.stdout
+
+    def rev_parse(self, revision: str) -> str:
+        """
+        Resolve a revision (branch, tag, HEAD~2...) to a commit id
+        @param revision: Revision
+        @return: Commit id
+        """
+        return self.run('rev-parse', '--verify', f'{revision}^{{commit}}').decode().strip()
+
+    def list_files(self, revision: str, directory: str = "") -> List[str]:
+        """
+        List the files of a revision
+        @param revision: Revision
+        @param directory: Only list files within this directory
+        @return: Paths, relative to the root of the repository
+        """
+        output = self.run('ls-tree', '-r', '-z', '--name-only', '--full-tree', revision, '--',
+                          directory or '.')
+        return [path.decode() for path in output.split(b'\0') if path]
+
+    def diff(self, old: str, new: str, directory: str = "") -> List[GitChange]:
+        """
+        List the files changed between two revisions
+        @param old: Old revision
+        @param new: New revision
+        @param directory: Only list files within this directory
+        @return: Changes
+        """
+        output = self.run('diff', '--name-status', '-z', old, new, '--',
+                          directory or '.')
+        fields = [field.decode() for field in output.split(b'\0')]
+        changes: List[GitChange] = []
+        index = 0
+        while index < len(fields) - 1:
+            status = fields[index]
+            if status[0] in 'RC':
+                changes.append(GitChange(status[0], fields[index + 2], fields[index + 1]))
+                index += 3
+            else:
+                changes.append(GitChange(status[0], fields[index + 1]))
+                index += 2
+        return changes
+
+    def blobs(self) -> 'GitBlobReader':
+        """
+        Open a reader of file contents, to use as a context manager
+        @return: GitBlobReader
+        """
+        return GitBlobReader(self)
+
+
+class GitBlobReader:
+    """
+    Read file contents through a single `git cat-file --batch` process
+    """
+
+    def __init__(self, repository: GitRepository):
+        self.repository = repository
+        self._process: subprocess.Popen | None = None
+
+    def __enter__(self) -> 'GitBlobReader':
+        # pylint: disable=consider-using-with
+        self._process = subprocess.Popen(['git', '-C', str(self.repository.path),
+                                          'cat-file', '--batch'],
+                                         stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        return self
+
+    def __exit__(self, *_args):
+        self._process.stdin.close()
+        self._process.wait()
+        self._process.stdout.close()
+        self._process = None
+
+    def read(self, revision: str, path: str) -> bytes | None:
+        """
+        Read a file as it is in a revision
+        @param revision: Revision
+        @param path: Path of the file, relative to the root of the repository
+        @return: Content of the file, None if it doesn't exist
+        """
+        stdin: IO[bytes] = self._process.stdin
+        stdout: IO[bytes] = self._process.stdout
+        stdin.write(f"{revision}:{path}\n".encode())
+        stdin.flush()
+
+        header = stdout.readline().split()
+        if len(header) != 3 or header[1] != b'blob':
+            return None
+
+        content = stdout.read(int(header[2]))
+        stdout.read(1)  # Trailing newline
+        return content
+
+
+def split_changes(changes: List[GitChange]) -> Tuple[List[str], List[str]]:
+    """
+    Sort changes into files to parse again and files to forget
+    @param changes: Changes
+    @return: (updated paths, removed paths)
+    """
+    updated: List[str] = []
+    removed: List[str] = []
+    for change in changes:
+        if change.status == 'D':
+            removed.append(change.path)
+        else:
+            if change.status == 'R':
+                removed.append(change.old_path)
+            updated.append(change.path)
+    return updated, removed
+
+
+class ParseCache:
+    """
+    Classes parsed from each file of a revision (or each file content), pickled right after
+    parsing (before types are resolved), so a later export only has to parse the files changed
+    The coverage of each file is cached along its classes
+    Note : the cache is unpickled, only load caches written by Chardon itself
+    """
+
+    def __init__(self, path: Path | None, fingerprint: str = ""):
+        """
+        Load a cache (empty if there is none yet, or if it was written by another parser)
+        @param path: Path of the cache file (None for a cache in memory only, never loaded or saved)
+        @param fingerprint: What the cached classes depend on besides the files
+        (see LanguageParser.fingerprint), the cache is discarded if it doesn't match
+        """
+        self.path = path
+        self.fingerprint = f"{MODEL_VERSION} {fingerprint}"
+        self.revision: str | None = None
+        # File path (or hash of its content) -> pickled classes
+        self.files: Dict[str, bytes] = {}
+        # File path (or hash of its content) -> coverage
+        self.coverage: Dict[str, Coverage] = {}
+
+        if path is not None and path.is_file():
+            try:
+                with open(path, 'rb') as f:
+                    cached = pickle.load(f)
+            except (OSError, ValueError, pickle.UnpicklingError) as e:
+                logging.warning("Ignoring unreadable parse cache %s : %s", path, e)
+            else:
+                if isinstance(cached, tuple) and len(cached) == 4 \
+                        and cached[0] == self.fingerprint:
+                    _fingerprint, self.revision, self.files, self.coverage = cached
+                else:
+                    logging.info("Ignoring parse cache %s, written by another version or parser",
+                                 path)
+
+    def store(self, key: str, classes: List[Class], coverage: Coverage = None):
+        """
+        Cache the classes parsed from a file
+        @param key: File path (or hash of its content)
+        @param classes: Classes, before types are resolved
+        @param coverage: Coverage of the file
+        """
+        self.files[key] = pickle.dumps(classes)
+        if coverage is not None:
+            self.coverage[key] = coverage
+
+    def load(self, key: str) -> List[Class]:
+        """
+        Read the classes cached for a file
+        @param key: File path (or hash of its content)
+        @return: Classes, before types are resolved
+        """
+        return pickle.loads(self.files[key])
+
+    def retain(self, keys: Iterable[str]):
+        """
+        Forget every file but some (eg. the ones still in the project)
+        @param keys: File paths (or hashes of their content) to keep
+        """
+        keys = set(keys)
+        self.files = {key: value for key, value in self.files.items() if key in keys}
+        self.coverage = {key: value for key, value in self.coverage.items() if key in keys}
+
+    def save(self, revision: str | None = None):
+        """
+        Write the cache (only kept in memory without a path)
+        @param revision: Commit id the cached files are taken from (None if cached by content)
+        """
+        self.revision = revision
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'wb') as f:
+            pickle.dump((self.fingerprint, self.revision, self.files, self.coverage), f)
@@ -1,16 +1,28 @@
 """
 Parse a project and export classes
 """
+import hashlib
+import json
 import re
-from pathlib import Path
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, TextIO, Tuple
 
 
 # pylint: disable=too-few-public-methods
-from chardon.article_builder import Content
-from chardon.code_arranger import DocArticle
-from chardon.code_parser.structure import Class, Function, Type, ArrayOfType
-from chardon.code_parser.language import LanguageParser
+from chardon import diagnostics
+from chardon.article_builder import Content, RunContext
+from chardon.code_arranger import DocArticle, ReferenceIndex, InheritanceClosure, PageSplit
+from chardon.code_parser.structure import Class, Type
+from chardon.code_parser.language import LanguageParser, Coverage
+from chardon.documentation.build_manifest import BuildManifest
+from chardon.documentation.coverage_report import CoverageReport, COVERAGE_PAGE, \
+    COVERAGE_JSON
+from chardon.documentation.search_index import SearchIndex
+from chardon.documentation.sinks import Sink, DirectorySink
+from chardon.documentation.sources import Source, DirectorySource
+from chardon.documentation.symbol_table import SymbolTable, ResolutionContext
 from chardon.exporter.content_export import ContentExport
 
 
@@ -19,10 +31,12 @@ class ParsingResult:
     Result of file parsing
     """
 
-    def __init__(self, file: Path, clean_path: Path, results: List[Class]):
+    def __init__(self, file: Path, clean_path: Path, results: List[Class],
+                 coverage: Coverage = None):
         self.file = file
         self.clean_path = clean_path
         self.results = results
+        self.coverage = coverage
 
 
 # pylint: disable=too-few-public-methods
@@ -35,36 +49,80 @@ class ProjectManager:
     # pylint: disable=too-many-branches
     # pylint: disable=too-many-nested-blocks
     # pylint: disable=too-many-instance-attributes
-    def __init__(self, parser: LanguageParser, exporter: ContentExport,
-                 directory: Path, out_directory: Path, file_regex: str = r'.*', encoding="utf-8"):
+    def __init__(self, parser: LanguageParser, exporter: ContentExport | None,
+                 directory: Path | Source | None, out_directory: Path | Sink | None,
+                 file_regex: str = r'.*', encoding="utf-8", *,
+                 targets: List[Tuple[ContentExport, Path | Sink]] = None,
+                 exclude_regex: str | None = None, workers: int = 1, context: RunContext = None):
+        """
+        Parse a project
+        @param parser: Parser used for every file
+        @param exporter: Exporter (can be None if targets are given)
+        @param directory: Project directory, or any Source of files (archive, memory...)
+        (None to parse it later, eg. with parse_git)
+        @param out_directory: Where the exporter writes, a directory or any Sink (zip, memory...)
+        (can be None if targets are given)
+        @param file_regex: Only parse files matching it
+        @param encoding: Encoding of files
+        @param targets: Extra (exporter, out_directory), all exported in the same pass
+        @param exclude_regex: Skip files whose path (from the root project) matches it
+        @param workers: Number of processes parsing files
+        @param context: Text parser, exporter params and caches of the exports (see RunContext)
+        """
         self.parser = parser
         self.exporter = exporter
         self.directory = directory
         self.out_directory = out_directory
         self.file_regex = file_regex
+        self.exclude_regex = exclude_regex
         self.encoding = encoding
+        self.workers = workers
+        self.context = context or RunContext()
         self.results: List[ParsingResult] = []
-        self.classes: dict[str: Class] = {}
+        # Classes, by namespace-qualified name
+        self.symbols = SymbolTable()
+        self.classes: dict[str: Class] = self.symbols.classes
+
+        self.targets: List[Tuple[ContentExport, Sink]] = []
+        if exporter is not None:
+            self.add_target(exporter, out_directory)
+        for target_exporter, target_directory in targets or []:
+            self.add_target(target_exporter, target_directory)
+
+        # Where each class is used, built along type resolution
+        self.references = ReferenceIndex()
+        # Ancestors and inherited members of every class
+        self.inheritance = InheritanceClosure([])
+        # Pages written by the last export, relative to the root of their sink
+        self.exported_pages: List[PurePosixPath] = []
 
         # Parse all files
-        self.parse(self.directory, Path(''))
-        class_: Class
+        if directory is not None:
+            self.parse_source(directory if isinstance(directory, Source)
+                              else DirectorySource(directory))
+            self.resolve()
 
-        # Loop through known class and replace type to their actual class
+    def resolve(self):
+        """
+        Reference parsed types to their classes, and compute where each class is used
+        """
         # When we parse the code, we don't know if a class will be parsed, thus
         # most type are saved as string first, and we have to correctly reference them afterwards
-        for class_ in self.classes.values():
-            class_.inherits = list(map(self.type_to_class, class_.inherits))
-
-            for field in class_.fields:
-                field.type = self.type_to_class(field.type)
-
-                if isinstance(field.type, Function):
-                    for param in field.type.inputs:
-                        param.types = list(map(self.type_to_class, param.types))
+        self.symbols.resolve_all(self.references)
+        # Ancestors and inherited members of every class
+        self.inheritance = InheritanceClosure(self.classes.values())
+        # Caches hold what was computed from the previous model
+        self.context.caches.clear()
 
-                    for param in field.type.outputs:
-                        param.types = list(map(self.type_to_class, param.types))
+    def add_target(self, exporter: ContentExport, out_directory: Path | Sink):
+        """
+        Add an exporter to run on export, along with the others
+        @param exporter: Exporter
+        @param out_directory: Where the exporter writes, a directory or any Sink
+        """
+        if not isinstance(out_directory, Sink):
+            out_directory = DirectorySink(out_directory, self.encoding)
+        self.targets.append((exporter, out_directory))
 
     def type_to_class(self, type_: Type) -> Type:
         """
@@ -72,14 +130,7 @@ class ProjectManager:
         @param type_: Type, which can be expressed as str
         @return: Corresponding Class if known
         """
-        # Note : missing SpecificType and DictType
-        if isinstance(type_, ArrayOfType):
-            return ArrayOfType(self.type_to_class(type_.type_))
-
-        if isinstance(type_, Type) and type_.name in self.classes:
-            return self.classes[type_.name]
-
-        return type_
+        return self.symbols.resolve(type_, ResolutionContext())
 
     def parse(self, directory: Path, clean_path: Path):
         """
@@ -87,27 +138,292 @@ class ProjectManager:
         @param directory: File path
         @param clean_path: Path from the root project
         """
-        res: ParsingResult
-        for path in directory.iterdir():
-            if path.is_dir():
-                self.parse(path, clean_path / path.name)
-            elif re.match(self.file_regex, path.name):
-                res = ParsingResult(path, clean_path / path.name, self.parser.parse(path))
-                for class_ in res.results:
-                    self.classes[class_.name] = class_
-                    self.classes[class_.name].attributes['uri'] = clean_path / class_.name
-                self.results.append(res)
+        self.parse_source(DirectorySource(directory), clean_path)
+
+    def accept(self, path: PurePosixPath) -> bool:
+        """
+        Tell if a file of the project has to be parsed
+        @param path: Path of the file, from the root project
+        @return: True if its name matches file_regex, and its path doesn't match exclude_regex
+        """
+        if self.exclude_regex is not None and re.search(self.exclude_regex, path.as_posix()):
+            return False
+        return re.match(self.file_regex, path.name) is not None
+
+    def parse_source(self, source: Source, clean_path: Path = Path(''), cache: Path = None):
+        """
+        Parse all file of a source and save them in self.results
+        Files are read one by one, archives are never extracted
+        @param source: Source
+        @param clean_path: Path from the root project to the root of the source
+        @param cache: Parse cache, by file content, so unchanged files are not parsed again
+        (written for the next run)
+        """
+        if self.workers <= 1 and cache is None:
+            for path, content in source.files(self.accept):
+                file = clean_path / path
+                coverage = Coverage()
+                classes = self.parser.parse_bytes(content, file, self.encoding, coverage)
+                self.add_result(ParsingResult(file, file, classes, coverage))
+            return
+
+        self._check_cache(cache)
+        # pylint: disable=import-outside-toplevel
+        from chardon.documentation.git_revision import ParseCache
+        parse_cache = ParseCache(cache, self._parser_fingerprint()) if cache is not None else None
+
+        # (file, hash of its content, content if it has to be parsed)
+        files: List[Tuple[Path, str, bytes | None]] = []
+        for path, content in source.files(self.accept):
+            digest = hashlib.sha1(content).hexdigest()
+            cached = parse_cache is not None and digest in parse_cache.files
+            files.append((clean_path / path, digest, None if cached else content))
+
+        parsed = iter(self.parse_files([(file, content) for file, _digest, content in files
+                                        if content is not None]))
+        for file, digest, content in files:
+            if content is None:
+                classes, coverage = parse_cache.load(digest), parse_cache.coverage.get(digest)
+            else:
+                classes, coverage = next(parsed)
+                if parse_cache is not None:
+                    parse_cache.store(digest, classes, coverage)
+            self.add_result(ParsingResult(file, file, classes, coverage))
+
+        if parse_cache is not None:
+            # Only keep the files still in the project
+            parse_cache.retain(digest for _file, digest, _content in files)
+            parse_cache.save()
+
+    def _parser_fingerprint(self) -> str:
+        """
+        Identify how files are parsed, so that parse caches are only reused by identical parsers
+        @return: Fingerprint of the parser and of the encoding of the files
+        """
+        return f"{self.parser.fingerprint()} {self.encoding}"
+
+    def _check_cache(self, cache: Path | None):
+        """
+        Make sure a parse cache is not written in an output : outputs get published, and the
+        cache, being unpickled on the next run, must not be read back from a deployed tree
+        @param cache: Parse cache (None for no cache)
+        """
+        if cache is None:
+            return
+        for _exporter, sink in self.targets:
+            if isinstance(sink, DirectorySink) \
+                    and cache.resolve().is_relative_to(sink.directory.resolve()):
+                raise ValueError(f"Parse cache {cache} is inside the output {sink.directory}, "
+                                 f"keep it out of the published pages")
+
+    def parse_files(self, files: List[Tuple[Path, bytes]]) -> List[Tuple[List[Class], Coverage]]:
+        """
+        Parse files, spread over self.workers processes
+        @param files: Path and content of each file
+        @return: Classes and coverage of each file, in the same order
+        """
+        if self.workers <= 1 or len(files) <= 1:
+            results = []
+            for file, content in files:
+                coverage = Coverage()
+                results.append((self.parser.parse_bytes(content, file, self.encoding, coverage),
+                                coverage))
+            return results
+        with ProcessPoolExecutor(self.workers) as executor:
+            results = list(executor.map(_parse_collecting, repeat(self.parser),
+                                        [content for _file, content in files],
+                                        [file for file, _content in files],
+                                        repeat(self.encoding),
+                                        chunksize=max(1, len(files) // (self.workers * 4))))
+        # Issues found by the workers, recorded in this process
+        for _classes, _coverage, issues in results:
+            issues.replay()
+        return [(classes, coverage) for classes, coverage, _issues in results]
 
-    def export(self):
+    def add_result(self, result: ParsingResult):
+        """
+        Register the classes parsed from a file
+        @param result: ParsingResult
+        """
+        for class_ in result.results:
+            class_.attributes['uri'] = result.clean_path.parent / class_.name
+            self.symbols.add(class_)
+        self.results.append(result)
+
+    # pylint: disable=too-many-arguments
+    # pylint: disable=too-many-locals
+    def parse_git(self, repository: Path, revision: str, previous: str = None,
+                  directory: str = "", cache: Path = None):
+        """
+        Parse the project as it is in a git revision, reading files from the repository objects
+        (no checkout needed), then resolve types
+        With a cache built at the previous revision, only the files changed in between are parsed
+        @param repository: Path to the git repository
+        @param revision: Revision to document
+        @param previous: Revision documented by the last export (eg. base of a pull request)
+        @param directory: Project directory, relative to the root of the repository
+        @param cache: Parse cache, written for the next run (None to parse every file)
+        It must be kept out of the outputs, which get published
+        """
+        # Only needed in CI, and slow to import (subprocess, pickle)
+        # pylint: disable=import-outside-toplevel
+        from chardon.documentation.git_revision import GitRepository, ParseCache, split_changes
+        from chardon.documentation.sources import GitTreeSource
+
+        git = GitRepository(repository)
+        commit = git.rev_parse(revision)
+        self._check_cache(cache)
+        parse_cache = ParseCache(cache, self._parser_fingerprint())
+
+        if previous is not None and parse_cache.revision is not None \
+                and parse_cache.revision == git.rev_parse(previous):
+            updated, removed = split_changes(git.diff(parse_cache.revision, commit, directory))
+            parse_cache.retain(set(parse_cache.files) - set(removed))
+        else:
+            updated = git.list_files(commit, directory)
+            parse_cache.retain([])
+
+        def accept(path: PurePosixPath) -> bool:
+            # Files are filtered by their path from the project directory, as in parse_source
+            return self.accept(path.relative_to(directory or '.'))
+
+        for path, content in GitTreeSource(git, commit, paths=updated).files(accept):
+            coverage = Coverage()
+            classes = self.parser.parse_bytes(content, Path(path), self.encoding, coverage)
+            parse_cache.store(str(path), classes, coverage)
+
+        parse_cache.save(commit)
+
+        for path in sorted(parse_cache.files):
+            if not accept(PurePosixPath(path)):
+                # Cached before the filters of the project changed
+                continue
+            clean_path = PurePosixPath(path).relative_to(directory or '.')
+            self.add_result(ParsingResult(Path(path), Path(clean_path), parse_cache.load(path),
+                                          parse_cache.coverage.get(path)))
+        self.resolve()
+
+    def coverage_report(self) -> CoverageReport:
+        """
+        Documentation coverage of the files parsed (counted while parsing them)
+        @return: CoverageReport
+        """
+        return CoverageReport({PurePosixPath(*result.file.parts).as_posix(): result.coverage
+                               for result in self.results if result.coverage is not None})
+
+    # pylint: disable=too-many-locals
+    def export(self, incremental: bool = False, search_index: bool = False,
+               coverage: bool = False, split: PageSplit = None):
         """
         Export all parsed classes
+        Each article is built once, and rendered by every target
+        @param incremental: Only export the pages whose content or dependencies changed since
+        the last export, recorded in a manifest in each output (see BuildManifest)
+        @param search_index: Also write a client-side search index (see SearchIndex)
+        @param coverage: Also write the documentation coverage, as JSON and as a summary page
+        @param split: Split the members of large classes across pages (see PageSplit)
         """
+        with self.context.active():
+            self._export(incremental, search_index, coverage, split)
+
+    # pylint: disable=too-many-locals
+    def _export(self, incremental: bool, search_index: bool, coverage: bool,
+                split: PageSplit | None):
+        """
+        Export all parsed classes, in the RunContext of the project (see export)
+        """
+        manifests: List[BuildManifest | None] = [BuildManifest(sink)
+                                                 if incremental and sink.PERSISTENT else None
+                                                 for _exporter, sink in self.targets]
+        # Exporters bound to the run, so changing an exporter doesn't affect pages being rendered
+        targets: List[Tuple[ContentExport, Sink]] = [(exporter.bind(self.context), sink)
+                                                     for exporter, sink in self.targets]
+        # Exporter settings (the text parser, and page splitting) are part of the page signatures
+        settings: List[str] = [f"{type(exporter).__name__}{sorted(exporter.params.items())!r}"
+                               f"{self.context.parser.__name__}"
+                               f"{'' if split is None else repr(split)}"
+                               for exporter, _sink in targets]
+        # Shapes of classes, hashed once for every page of the run
+        shapes: Dict[str, str] = self.context.cache('shapes')
+        self.exported_pages = []
+        index: SearchIndex | None = SearchIndex() if search_index else None
+
         for result in self.results:
             for class_ in result.results:
-                contents: List[Content] = DocArticle(class_, result.clean_path.parent).to_contents()
+                with diagnostics.located(str(result.file)):
+                    article = DocArticle(class_, result.clean_path.parent,
+                                         self.references, self.inheritance, split)
+                if index is not None:
+                    index.add_class(class_, article.member_pages())
+                # Class page, then member pages if the class is split
+                pages: List[Tuple[str, List[Content]]] | None = None
+
+                for (exporter, sink), manifest, setting in zip(targets, manifests, settings):
+                    signature: str | None = None
+                    if manifest is not None:
+                        signature = BuildManifest.signature(class_,
+                                                            article.dependencies.values(),
+                                                            shapes, setting)
+                    for i, name in enumerate(article.page_names()):
+                        page = PurePosixPath(*result.clean_path.parent.parts,
+                                             name + exporter.PREFERRED_EXTENSION)
+                        if manifest is not None:
+                            if manifest.is_fresh(page, signature):
+                                continue
+                            manifest.record(page, signature)
+
+                        with diagnostics.located(str(result.file)):
+                            if pages is None:
+                                pages = article.to_pages()
+                            with sink.open(page) as f:
+                                _render_to(exporter, pages[i][1], f, self.context)
+                        self.exported_pages.append(page)
+
+        report: CoverageReport | None = self.coverage_report() if coverage else None
+        for (exporter, sink), manifest in zip(targets, manifests):
+            # Files shared by all pages, such as stylesheets
+            for path, asset in exporter.get_assets().items():
+                sink.write(PurePosixPath(path), asset)
+            if index is not None:
+                index.write(sink, exporter.PREFERRED_EXTENSION)
+            if report is not None:
+                sink.write(PurePosixPath(COVERAGE_JSON),
+                           json.dumps(report.to_json(), indent=1))
+                with sink.open(PurePosixPath(COVERAGE_PAGE + exporter.PREFERRED_EXTENSION)) as f:
+                    _render_to(exporter, report.to_contents(), f, self.context)
+
+            if manifest is not None:
+                manifest.remove_stale_pages()
+                manifest.save()
+            sink.close()
 
-                (self.out_directory / result.clean_path.parent).mkdir(parents=True, exist_ok=True)
-                with open(self.out_directory / result.clean_path.parent /
-                          (class_.name + self.exporter.PREFERRED_EXTENSION),
-                          'w', encoding=self.encoding) as f:
-                    f.write(self.exporter.export(contents))
+
+def _parse_collecting(parser: LanguageParser, content: bytes, file: Path, encoding: str) \
+        -> Tuple[List[Class], Coverage, diagnostics.Diagnostics]:
+    """
+    Parse a file in a worker process, where the Diagnostics of the run is not active
+    @param parser: LanguageParser
+    @param content: Content of the file
+    @param file: Path of the file
+    @param encoding: Encoding
+    @return: Classes, coverage of the file, and issues found while parsing it
+    """
+    coverage = Coverage()
+    with diagnostics.Diagnostics().collecting() as issues:
+        return parser.parse_bytes(content, file, encoding, coverage), coverage, issues
+
+
+def _render_to(exporter: ContentExport, contents: List[Content], stream: TextIO,
+               context: RunContext):
+    """
+    Write a page with an exporter bound to the run
+    Exporters overriding export (see ContentExport.overrides_export) export it instead
+    @param exporter: Bound exporter
+    @param contents: Contents of the page
+    @param stream: Stream to write into
+    @param context: RunContext of the run
+    """
+    if exporter.overrides_export():
+        stream.write(exporter.export(contents, context))
+    else:
+        exporter.render_to(contents, stream)
@@ -0,0 +1,214 @@
+"""
+Prebuilt client-side search index, written as small JSON shards next to the pages
+"""
+import json
+import logging
+import re
+from pathlib import PurePosixPath
+from typing import Dict, Iterable, List, Tuple
+
+from chardon.code_arranger.documentation import beautiful_class_name
+from chardon.code_parser.structure import Class
+from chardon.documentation.sinks import Sink
+
+# Directory of the index, relative to the root of the output
+SEARCH_DIRECTORY: PurePosixPath = PurePosixPath("search")
+
+# Terms are sharded by their first characters, a query only loads the shard of its prefix
+SHARD_PREFIX_LENGTH: int = 2
+
+DOCUMENTS_PER_SHARD: int = 1000
+
+# Weight of a term, by where it is found
+WEIGHTS: Dict[str, int] = {
+    'name': 10,
+    'alias': 8,
+    'member': 5,
+    'summary': 1,
+}
+
+TERM_REGEX = re.compile(r'[a-z0-9]+')
+
+# Key holding the postings of the term ending at a trie node (never a term character)
+POSTINGS_KEY: str = '$'
+
+# Minimal loader, searching terms by prefix and fetching only the shards it needs
+SEARCH_SCRIPT: str = """\
+const chardonSearch = (() => {
+  const root = new URL('.', document.currentScript.src);
+  const cache = {};
+  const load = (path) => cache[path] ??= fetch(new URL(path, root)).then(r => r.json());
+  const collect = (node, scores) => {
+    for (const [key, child] of Object.entries(node)) {
+      if (key === '$') {
+        for (let i = 0; i < child.length; i += 2) scores[child[i]] = (scores[child[i]] || 0) + child[i + 1];
+      } else {
+        collect(child, scores);
+      }
+    }
+  };
+  return async (query, limit = 20) => {
+    const index = await load('index.json');
+    const terms = query.toLowerCase().match(/[a-z0-9]+/g) || [];
+    let total = null;
+    for (const term of terms) {
+      const scores = {};
+      const prefix = term.slice(0, index.prefix);
+      for (const shard of index.shards.filter(s => s.startsWith(prefix) || prefix.startsWith(s))) {
+        let node = await load(`terms/${shard}.json`);
+        for (const char of term.slice(shard.length)) node = node && node[char];
+        if (node) collect(node, scores);
+      }
+      if (total === null) total = scores;
+      else for (const doc of Object.keys(total)) total[doc] = doc in scores ? total[doc] + scores[doc] : undefined;
+    }
+    const hits = Object.entries(total || {}).filter(([, s]) => s !== undefined)
+      .sort((a, b) => b[1] - a[1]).slice(0, limit);
+    return Promise.all(hits.map(async ([doc, score]) => {
+      const documents = await load(`documents/${Math.floor(doc / index.documents)}.json`);
+      const [title, path, anchor, summary] = documents[doc % index.documents];
+      return {title, url: new URL(path + index.extension + anchor, new URL('..', root)).href, summary, score};
+    }));
+  };
+})();
+"""
+
+
+def terms_of(text: str) -> List[str]:
+    """
+    Split a text into search terms
+    @param text: Text
+    @return: Lowercase terms
+    """
+    return TERM_REGEX.findall(text.lower())
+
+
+def _summary(attributes: dict) -> str:
+    """
+    Find the summary of a Class or a Field
+    @param attributes: Attributes
+    @return: Summary, empty if missing
+    """
+    comment = attributes.get('comments', {}).get('summary')
+    return comment.content if comment is not None else ""
+
+
+class SearchIndex:
+    """
+    Inverted index over class names, their aliases, member names and summaries
+    Terms are stored in prefix tries, split in shards by their first characters,
+    and documents (pages and members) are split in fixed-size shards,
+    so a search only fetches a few small JSON files whatever the size of the site
+    """
+
+    def __init__(self):
+        # (title, page path without extension, anchor, summary)
+        self.documents: List[Tuple[str, str, str, str]] = []
+        # Term -> document -> score
+        self.postings: Dict[str, Dict[int, int]] = {}
+
+    def _add_document(self, title: str, path: str, anchor: str, summary: str) -> int:
+        """
+        Register a searchable document
+        @return: Document id
+        """
+        self.documents.append((title, path, anchor, summary))
+        return len(self.documents) - 1
+
+    def _add_terms(self, document: int, terms: Iterable[str], weight: str):
+        """
+        Index terms for a document
+        """
+        for term in terms:
+            scores = self.postings.setdefault(term, {})
+            scores[document] = scores.get(document, 0) + WEIGHTS[weight]
+
+    def _add_name(self, document: int, name: str, weight: str, alias_weight: str):
+        """
+        Index a name, and its words (eg. EntityAI is found by entityai, entity and ai)
+        """
+        terms = terms_of(name)
+        self._add_terms(document, terms, weight)
+        self._add_terms(document, [term for term in terms_of(beautiful_class_name(name))
+                                   if term not in terms], alias_weight)
+
+    def add_class(self, class_: Class, member_pages: Dict[str, str] = None):
+        """
+        Index a class page, and each of its members
+        @param class_: Class
+        @param member_pages: Member name -> page documenting it, when the members of the class
+        are split across pages (see DocArticle.member_pages)
+        """
+        path = '/'.join(class_.attributes['uri'].parts)
+        directory = '/'.join(class_.attributes['uri'].parent.parts)
+        member_pages = member_pages or {}
+        summary = _summary(class_.attributes)
+
+        page = self._add_document(class_.name, path, '', summary)
+        self._add_name(page, class_.name, 'name', 'alias')
+        self._add_terms(page, terms_of(summary), 'summary')
+
+        for field in class_.fields or []:
+            field_summary = _summary(field.attributes)
+            member_page = member_pages.get(field.name)
+            member = self._add_document(f"{class_.name}.{field.name}",
+                                        path if member_page is None else
+                                        '/'.join(filter(None, (directory, member_page))),
+                                        '#' + field.name, field_summary)
+            self._add_name(member, field.name, 'member', 'member')
+            self._add_terms(member, terms_of(class_.name), 'summary')
+            self._add_terms(member, terms_of(field_summary), 'summary')
+
+    def files(self, extension: str) -> Dict[PurePosixPath, str]:
+        """
+        Serialize the index
+        @param extension: Extension of the pages (eg. .html)
+        @return: Path (relative to the root of the output) -> content
+        """
+        tries: Dict[str, dict] = {}
+        for term in sorted(self.postings):
+            shard = term[:SHARD_PREFIX_LENGTH]
+            node = tries.setdefault(shard, {})
+            for char in term[len(shard):]:
+                node = node.setdefault(char, {})
+            node[POSTINGS_KEY] = [value for document, score in self.postings[term].items()
+                                  for value in (document, score)]
+
+        files: Dict[PurePosixPath, str] = {
+            SEARCH_DIRECTORY / 'index.json': json.dumps({
+                'prefix': SHARD_PREFIX_LENGTH,
+                'documents': DOCUMENTS_PER_SHARD,
+                'extension': extension,
+                'shards': sorted(tries),
+            }, separators=(',', ':')),
+            SEARCH_DIRECTORY / 'search.js': SEARCH_SCRIPT,
+        }
+        for shard, trie in tries.items():
+            files[SEARCH_DIRECTORY / 'terms' / f'{shard}.json'] = json.dumps(trie,
+                                                                            separators=(',', ':'))
+        for start in range(0, len(self.documents), DOCUMENTS_PER_SHARD):
+            files[SEARCH_DIRECTORY / 'documents' / f'{start // DOCUMENTS_PER_SHARD}.json'] = \
+                json.dumps(self.documents[start:start + DOCUMENTS_PER_SHARD],
+                           separators=(',', ':'))
+        return files
+
+    def write(self, sink: Sink, extension: str):
+        """
+        Write the index in a sink, removing the shards of a previous index that are not used anymore
+        @param sink: Sink
+        @param extension: Extension of the pages (eg. .html)
+        """
+        previous = sink.read(SEARCH_DIRECTORY / 'index.json')
+        files = self.files(extension)
+        for path, content in files.items():
+            sink.write(path, content)
+
+        if previous is not None:
+            try:
+                shards = json.loads(previous).get('shards', [])
+            except ValueError as e:
+                logging.warning("Ignoring unreadable search index : %s", e)
+                return
+            for shard in shards:
+                if SEARCH_DIRECTORY / 'terms' / f'{shard}.json' not in files:
+                    sink.remove(SEARCH_DIRECTORY / 'terms' / f'{shard}.json')
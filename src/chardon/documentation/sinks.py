@@ -0,0 +1,319 @@
+"""
+Sinks of exported files : a directory, a zip or tar bundle, memory or a content-addressed store
+"""
+import hashlib
+import io
+import json
+import tarfile
+import zipfile
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterator, TextIO
+
+
+class Sink(ABC):
+    """
+    Abstract class to represent where exported files are written
+    Every exporter writes through a stream, so any sink works with any exporter
+    """
+
+    # Files written by a previous export are kept, so exports can be incremental
+    PERSISTENT: bool = False
+
+    def __init__(self, encoding: str = "utf-8"):
+        self.encoding = encoding
+
+    @contextmanager
+    def open(self, path: PurePosixPath) -> Iterator[TextIO]:
+        """
+        Open a file to write into, as a context manager
+        By default, the file is buffered in memory and written on close
+        @param path: Path of the file, relative to the root of the sink
+        @return: Text stream
+        """
+        stream = io.StringIO()
+        yield stream
+        self.write(path, stream.getvalue())
+
+    @abstractmethod
+    def write(self, path: PurePosixPath, content: str):
+        """
+        Write a whole file
+        @param path: Path of the file, relative to the root of the sink
+        @param content: Content
+        """
+
+    # pylint: disable=unused-argument
+    def read(self, path: PurePosixPath) -> str | None:
+        """
+        Read a file written by a previous export
+        @param path: Path of the file, relative to the root of the sink
+        @return: Content, None if the file doesn't exist
+        """
+        return None
+
+    def exists(self, path: PurePosixPath) -> bool:
+        """
+        Tell if a file exists
+        @param path: Path of the file, relative to the root of the sink
+        @return: True if it exists
+        """
+        return self.read(path) is not None
+
+    def remove(self, path: PurePosixPath):
+        """
+        Remove a file written by a previous export (if any)
+        @param path: Path of the file, relative to the root of the sink
+        """
+
+    def close(self):
+        """
+        Finish the export (eg. write the end of an archive)
+        """
+
+    def __enter__(self) -> 'Sink':
+        return self
+
+    def __exit__(self, *_args):
+        self.close()
+
+
+class DirectorySink(Sink):
+    """
+    Files written in a directory, one file per page
+    """
+
+    PERSISTENT = True
+
+    def __init__(self, directory: Path, encoding: str = "utf-8"):
+        super().__init__(encoding)
+        self.directory = directory
+
+    @contextmanager
+    def open(self, path: PurePosixPath) -> Iterator[TextIO]:
+        """
+        Open a file, written as it is exported
+        """
+        (self.directory / path).parent.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / path, 'w', encoding=self.encoding) as f:
+            yield f
+
+    def write(self, path: PurePosixPath, content: str):
+        """
+        Write a whole file
+        """
+        with self.open(path) as f:
+            f.write(content)
+
+    def read(self, path: PurePosixPath) -> str | None:
+        """
+        Read a file
+        """
+        if not (self.directory / path).is_file():
+            return None
+        with open(self.directory / path, 'r', encoding=self.encoding) as f:
+            return f.read()
+
+    def exists(self, path: PurePosixPath) -> bool:
+        """
+        Tell if a file exists
+        """
+        return (self.directory / path).is_file()
+
+    def remove(self, path: PurePosixPath):
+        """
+        Remove a file
+        """
+        (self.directory / path).unlink(missing_ok=True)
+
+
+class ZipSink(Sink):
+    """
+    Files written in a single zip bundle, each page being compressed as it is exported
+    """
+
+    def __init__(self, archive: Path, encoding: str = "utf-8"):
+        super().__init__(encoding)
+        self.archive = archive
+        self._zip: zipfile.ZipFile | None = None
+
+    def _bundle(self) -> zipfile.ZipFile:
+        """
+        Open the bundle on the first write
+        @return: ZipFile
+        """
+        if self._zip is None:
+            self.archive.parent.mkdir(parents=True, exist_ok=True)
+            # pylint: disable=consider-using-with
+            self._zip = zipfile.ZipFile(self.archive, 'w', zipfile.ZIP_DEFLATED)
+        return self._zip
+
+    @contextmanager
+    def open(self, path: PurePosixPath) -> Iterator[TextIO]:
+        """
+        Open a member of the bundle, written as it is exported
+        """
+        with self._bundle().open(str(path), 'w') as member:
+            with io.TextIOWrapper(member, encoding=self.encoding) as f:
+                yield f
+
+    def write(self, path: PurePosixPath, content: str):
+        """
+        Write a whole member
+        """
+        self._bundle().writestr(str(path), content.encode(self.encoding))
+
+    def close(self):
+        """
+        Write the directory of the bundle
+        """
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+
+class TarSink(Sink):
+    """
+    Files written in a single tar bundle (compressed according to the extension, eg. .tar.gz)
+    The bundle is streamed : members are appended one after the other
+    """
+
+    def __init__(self, archive: Path, encoding: str = "utf-8"):
+        super().__init__(encoding)
+        self.archive = archive
+        self._tar: tarfile.TarFile | None = None
+
+    def _bundle(self) -> tarfile.TarFile:
+        """
+        Open the bundle on the first write
+        @return: TarFile
+        """
+        if self._tar is None:
+            compression = {'.gz': 'gz', '.tgz': 'gz', '.bz2': 'bz2', '.xz': 'xz'} \
+                .get(self.archive.suffix, '')
+            self.archive.parent.mkdir(parents=True, exist_ok=True)
+            # pylint: disable=consider-using-with
+            self._tar = tarfile.open(str(self.archive), f'w|{compression}')
+        return self._tar
+
+    def write(self, path: PurePosixPath, content: str):
+        """
+        Append a member
+        """
+        data = content.encode(self.encoding)
+        info = tarfile.TarInfo(str(path))
+        info.size = len(data)
+        self._bundle().addfile(info, io.BytesIO(data))
+
+    def close(self):
+        """
+        Write the end of the bundle
+        """
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+
+
+class MemorySink(Sink):
+    """
+    Files kept in memory, eg. for tests or when Chardon is embedded
+    """
+
+    def __init__(self, encoding: str = "utf-8"):
+        super().__init__(encoding)
+        # Path -> content
+        self.files: Dict[str, str] = {}
+
+    def write(self, path: PurePosixPath, content: str):
+        """
+        Keep a file
+        """
+        self.files[str(path)] = content
+
+    def read(self, path: PurePosixPath) -> str | None:
+        """
+        Read a file
+        """
+        return self.files.get(str(path))
+
+    def remove(self, path: PurePosixPath):
+        """
+        Forget a file
+        """
+        self.files.pop(str(path), None)
+
+
+class ContentAddressedSink(Sink):
+    """
+    Files stored by the hash of their content, so identical pages are stored once
+    The store holds objects/<hash> and an index.json mapping each path to its hash
+    """
+
+    PERSISTENT = True
+
+    INDEX: str = "index.json"
+
+    def __init__(self, directory: Path, encoding: str = "utf-8"):
+        super().__init__(encoding)
+        self.directory = directory
+        # Path -> hash of the content
+        self.index: Dict[str, str] = {}
+        if (directory / self.INDEX).is_file():
+            with open(directory / self.INDEX, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def _object(self, digest: str) -> Path:
+        """
+        Path of a stored object
+        @param digest: Hash of the content
+        @return: Path
+        """
+        return self.directory / 'objects' / digest[:2] / digest[2:]
+
+    def write(self, path: PurePosixPath, content: str):
+        """
+        Store a file, only once per distinct content
+        """
+        data = content.encode(self.encoding)
+        digest = hashlib.sha256(data).hexdigest()
+        stored = self._object(digest)
+        if not stored.is_file():
+            stored.parent.mkdir(parents=True, exist_ok=True)
+            stored.write_bytes(data)
+        self.index[str(path)] = digest
+
+    def read(self, path: PurePosixPath) -> str | None:
+        """
+        Read a file
+        """
+        digest = self.index.get(str(path))
+        if digest is None or not self._object(digest).is_file():
+            return None
+        return self._object(digest).read_bytes().decode(self.encoding)
+
+    def exists(self, path: PurePosixPath) -> bool:
+        """
+        Tell if a file exists
+        """
+        digest = self.index.get(str(path))
+        return digest is not None and self._object(digest).is_file()
+
+    def remove(self, path: PurePosixPath):
+        """
+        Remove a file from the index (its content is dropped on close if nothing else uses it)
+        """
+        self.index.pop(str(path), None)
+
+    def close(self):
+        """
+        Write the index, and drop the objects no file uses anymore
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / self.INDEX, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+
+        used = set(self.index.values())
+        for stored in (self.directory / 'objects').glob('*/*'):
+            if stored.parent.name + stored.name not in used:
+                stored.unlink()
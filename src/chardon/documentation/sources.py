@@ -0,0 +1,188 @@
+"""
+Sources of project files : a directory, an archive, a git tree or files held in memory
+"""
+import tarfile
+import zipfile
+from abc import ABC, abstractmethod
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Tuple
+
+if TYPE_CHECKING:
+    from chardon.documentation.git_revision import GitRepository
+
+# A file of the project : path relative to the root of the project, and content
+SourceFile = Tuple[PurePosixPath, bytes]
+
+# Tell if a file (path relative to the root of the project) has to be read
+FileFilter = Callable[[PurePosixPath], bool]
+
+
+def _accept_all(_path: PurePosixPath) -> bool:
+    return True
+
+
+# pylint: disable=too-few-public-methods
+class Source(ABC):
+    """
+    Abstract class to represent where the files of a project are read from
+    Files are yielded one by one, so a source never holds the whole project in memory
+    """
+
+    @abstractmethod
+    def files(self, accept: FileFilter = _accept_all) -> Iterator[SourceFile]:
+        """
+        Yield every file of the project
+        @param accept: Only read the files it accepts
+        @return: (path relative to the project root, content)
+        """
+        return NotImplemented
+
+
+class DirectorySource(Source):
+    """
+    Files of a directory on disk
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def files(self, accept: FileFilter = _accept_all) -> Iterator[SourceFile]:
+        """
+        Yield every file of the directory, recursively
+        """
+        yield from self._files(self.directory, PurePosixPath(''), accept)
+
+    def _files(self, directory: Path, clean_path: PurePosixPath,
+               accept: FileFilter) -> Iterator[SourceFile]:
+        """
+        Yield every file of a subdirectory
+        @param directory: Subdirectory
+        @param clean_path: Path of the subdirectory from the project root
+        @param accept: Only read the files it accepts
+        """
+        for path in directory.iterdir():
+            if path.is_dir():
+                yield from self._files(path, clean_path / path.name, accept)
+            elif accept(clean_path / path.name):
+                yield clean_path / path.name, path.read_bytes()
+
+
+class ZipSource(Source):
+    """
+    Files of a zip archive, read without extracting it
+    """
+
+    def __init__(self, archive: Path, directory: str = ""):
+        """
+        Init a ZipSource
+        @param archive: Path to the archive
+        @param directory: Project directory inside the archive
+        """
+        self.archive = archive
+        self.directory = PurePosixPath(directory)
+
+    def files(self, accept: FileFilter = _accept_all) -> Iterator[SourceFile]:
+        """
+        Yield every file of the archive
+        """
+        with zipfile.ZipFile(self.archive) as archive:
+            for info in archive.infolist():
+                path = PurePosixPath(info.filename)
+                if info.is_dir() or not path.is_relative_to(self.directory):
+                    continue
+                path = path.relative_to(self.directory)
+                if accept(path):
+                    with archive.open(info) as f:
+                        yield path, f.read()
+
+
+class TarSource(Source):
+    """
+    Files of a tar archive (optionally compressed), streamed without extracting it
+    """
+
+    def __init__(self, archive: Path, directory: str = ""):
+        """
+        Init a TarSource
+        @param archive: Path to the archive
+        @param directory: Project directory inside the archive
+        """
+        self.archive = archive
+        self.directory = PurePosixPath(directory)
+
+    def files(self, accept: FileFilter = _accept_all) -> Iterator[SourceFile]:
+        """
+        Yield every file of the archive, in the order they are stored
+        """
+        with tarfile.open(self.archive, 'r|*') as archive:
+            for info in archive:
+                path = PurePosixPath(info.name)
+                if not info.isfile() or not path.is_relative_to(self.directory):
+                    continue
+                path = path.relative_to(self.directory)
+                if accept(path):
+                    yield path, archive.extractfile(info).read()
+
+
+class MemorySource(Source):
+    """
+    Files held in memory, eg. for tests or when Chardon is embedded
+    """
+
+    def __init__(self, files: Dict[str, bytes | str], encoding: str = "utf-8"):
+        """
+        Init a MemorySource
+        @param files: Path relative to the project root -> content
+        @param encoding: Encoding of the contents given as str
+        """
+        self.files_ = files
+        self.encoding = encoding
+
+    def files(self, accept: FileFilter = _accept_all) -> Iterator[SourceFile]:
+        """
+        Yield every file
+        """
+        for path, content in self.files_.items():
+            if not accept(PurePosixPath(path)):
+                continue
+            if isinstance(content, str):
+                content = content.encode(self.encoding)
+            yield PurePosixPath(path), content
+
+
+class GitTreeSource(Source):
+    """
+    Files of a git revision, read from the repository objects without checkout
+    """
+
+    def __init__(self, repository: 'Path | GitRepository', revision: str, directory: str = "",
+                 paths: List[str] = None):
+        """
+        Init a GitTreeSource
+        @param repository: Path to the repository
+        @param revision: Revision to read
+        @param directory: Project directory, relative to the root of the repository
+        @param paths: Only read these files (relative to the root of the repository)
+        """
+        # pylint: disable=import-outside-toplevel
+        from chardon.documentation.git_revision import GitRepository
+        self.repository = repository if isinstance(repository, GitRepository) \
+            else GitRepository(repository)
+        self.revision = revision
+        self.directory = PurePosixPath(directory)
+        self.paths = paths
+
+    def files(self, accept: FileFilter = _accept_all) -> Iterator[SourceFile]:
+        """
+        Yield every file of the revision (or the requested ones)
+        """
+        paths = self.paths if self.paths is not None \
+            else self.repository.list_files(self.revision, str(self.directory))
+        with self.repository.blobs() as blobs:
+            for path in paths:
+                clean_path = PurePosixPath(path).relative_to(self.directory)
+                if not accept(clean_path):
+                    continue
+                content = blobs.read(self.revision, path)
+                if content is not None:
+                    yield clean_path, content
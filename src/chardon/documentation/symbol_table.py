@@ -0,0 +1,208 @@
+"""
+Index of parsed classes, resolving type names to their Class
+"""
+from typing import Dict, List, Tuple
+
+from chardon import diagnostics
+from chardon.code_arranger import ReferenceIndex, Reference, ReferenceKind
+from chardon.code_parser.structure import Class, Function, Type, ArrayOfType, DictOfType, \
+    SpecificType
+
+
+# pylint: disable=too-few-public-methods
+class ResolutionContext:
+    """
+    Where a type name is written : the namespace of the class using it,
+    and the using directives of its file (imported namespaces and aliases)
+    """
+
+    def __init__(self, namespace: str = "", usings: List[str] = None,
+                 aliases: Dict[str, str] = None):
+        self.namespace = namespace
+        self.usings = usings or []
+        self.aliases = aliases or {}
+        # Type name -> Class found in this context (see SymbolTable.lookup)
+        self.lookups: Dict[str, Class | None] = {}
+
+    @staticmethod
+    def of(class_: Class) -> 'ResolutionContext':
+        """
+        Context of the types written inside a class
+        @param class_: Class
+        @return: ResolutionContext
+        """
+        usings = class_.attributes.get('usings')
+        return ResolutionContext(class_.get_namespace(),
+                                 getattr(usings, 'namespaces', None),
+                                 getattr(usings, 'aliases', None))
+
+    def candidates(self, name: str) -> List[str]:
+        """
+        Qualified names a type name may refer to, by order of precedence
+        (enclosing namespaces, from the innermost, then aliases and using directives)
+        @param name: Type name, as written
+        @return: Qualified names
+        """
+        candidates: List[str] = []
+        namespace = self.namespace
+        while namespace:
+            candidates.append(f"{namespace}.{name}")
+            namespace = namespace.rpartition('.')[0]
+        candidates.append(name)
+
+        head, dot, tail = name.partition('.')
+        if head in self.aliases:
+            candidates.append(self.aliases[head] + dot + tail)
+
+        candidates.extend(f"{using}.{name}" for using in self.usings)
+        return candidates
+
+
+class SymbolTable:
+    """
+    Index of classes by namespace-qualified name
+    Classes sharing a file and namespace share a context, and name lookups are memoized per
+    context, so resolving all the types of a project costs one walk of each type reference
+    plus one lookup per distinct name and context
+    """
+
+    def __init__(self):
+        self.classes: Dict[str, Class] = {}
+        self.by_name: Dict[str, List[Class]] = {}
+        # (namespace, using directives) -> shared context
+        self._contexts: Dict[Tuple[str, int], Tuple[ResolutionContext, object]] = {}
+
+    def __len__(self):
+        return len(self.classes)
+
+    def __contains__(self, qualified_name: str):
+        return qualified_name in self.classes
+
+    def add(self, class_: Class):
+        """
+        Index a class
+        @param class_: Class
+        """
+        qualified_name = class_.get_qualified_name()
+        if qualified_name in self.classes:
+            diagnostics.record('duplicate-class', symbol=qualified_name)
+            self.by_name[class_.name].remove(self.classes[qualified_name])
+
+        self.classes[qualified_name] = class_
+        self.by_name.setdefault(class_.name, []).append(class_)
+        for context, _usings in self._contexts.values():
+            context.lookups.clear()
+
+    def context_of(self, class_: Class) -> ResolutionContext:
+        """
+        Context of the types written inside a class, shared with the classes of the same file
+        and namespace
+        @param class_: Class
+        @return: ResolutionContext
+        """
+        usings = class_.attributes.get('usings')
+        key = (class_.get_namespace(), id(usings))
+        if key not in self._contexts:
+            # The using directives are kept alongside, so their id can't be reused
+            self._contexts[key] = (ResolutionContext.of(class_), usings)
+        return self._contexts[key][0]
+
+    def lookup(self, name: str, context: ResolutionContext) -> Class | None:
+        """
+        Find the class a type name refers to
+        @param name: Type name, as written in the code
+        @param context: Where the name is written
+        @return: Class, or None if the name isn't a known class
+        """
+        try:
+            return context.lookups[name]
+        except KeyError:
+            pass
+
+        class_: Class | None = None
+        for candidate in context.candidates(name):
+            if candidate in self.classes:
+                class_ = self.classes[candidate]
+                break
+        else:
+            # Using directives may be missing (eg. nested namespaces), fall back on a unique name
+            homonyms = self.by_name.get(name.rpartition('.')[2], [])
+            if len(homonyms) == 1:
+                class_ = homonyms[0]
+
+        context.lookups[name] = class_
+        return class_
+
+    def resolve(self, type_: Type, context: ResolutionContext,
+                found: List[Class] = None) -> Type:
+        """
+        Replace the names inside a type by their Class when known
+        Composite types (array, dict, generic) are updated in place
+        @param type_: Type
+        @param context: Where the type is written
+        @param found: If given, classes referenced by the type are appended to it
+        @return: Resolved type
+        """
+        if isinstance(type_, ArrayOfType):
+            type_.type_ = self.resolve(type_.type_, context, found)
+            return type_
+        if isinstance(type_, DictOfType):
+            type_.key = self.resolve(type_.key, context, found)
+            type_.value = self.resolve(type_.value, context, found)
+            return type_
+        if isinstance(type_, SpecificType):
+            type_.type_ = self.resolve(type_.type_, context, found)
+            type_.specific1 = self.resolve(type_.specific1, context, found)
+            if type_.specific2 is not None:
+                type_.specific2 = self.resolve(type_.specific2, context, found)
+            return type_
+        if isinstance(type_, Type) and not isinstance(type_, Class):
+            type_ = self.lookup(type_.name, context) or type_
+        if found is not None and isinstance(type_, Class):
+            found.append(type_)
+        return type_
+
+    def resolve_class(self, class_: Class, references: ReferenceIndex = None):
+        """
+        Resolve every type referenced by a class : parents, fields, parameters and returns
+        @param class_: Class
+        @param references: If given, record the classes used by class_ in it
+        """
+        context = self.context_of(class_)
+        parents: List[Class] = []
+        class_.inherits = [self.resolve(type_, context, parents) for type_ in class_.inherits]
+
+        for field in class_.fields or []:
+            # Class -> how the field uses it (first usage wins, a field is listed once per class)
+            used: Dict[Class, ReferenceKind] = {}
+            if isinstance(field.type, Function):
+                for kind, params in ((ReferenceKind.PARAMETER, field.type.inputs),
+                                     (ReferenceKind.RETURN, field.type.outputs)):
+                    for param in params:
+                        found: List[Class] = []
+                        param.types = [self.resolve(type_, context, found)
+                                       for type_ in param.types]
+                        for target in found:
+                            used.setdefault(target, kind)
+            else:
+                found: List[Class] = []
+                field.type = self.resolve(field.type, context, found)
+                used = dict.fromkeys(found, ReferenceKind.FIELD)
+
+            if references is not None:
+                for target, kind in used.items():
+                    references.add_reference(target, Reference(class_, field, kind))
+
+        if references is not None:
+            for parent in parents:
+                references.add_derived(parent, class_)
+
+    def resolve_all(self, references: ReferenceIndex = None):
+        """
+        Resolve every type referenced by every indexed class, in a single pass
+        @param references: If given, filled with the reverse references of every class
+        """
+        if references is not None:
+            references.clear()
+        for class_ in self.classes.values():
+            self.resolve_class(class_, references)
@@ -2,40 +2,172 @@
 Abstract content export class
 """
 
-from abc import ABC, abstractmethod
-from typing import List
+import copy
+from abc import ABC
+from types import GeneratorType
+from typing import Callable, Dict, Generator, List, TextIO
 
-from chardon.article_builder.content import Content
+from chardon.article_builder.content import Content, ContentType
+from chardon.article_builder.run_context import RunContext
+
+# A node handler either returns the rendered text directly (leaf nodes),
+# or is a generator yielding the children to render and receiving their text back
+NodeHandler = Callable[['ContentExport', Content], str | Generator[Content, str, str]]
 
 
 class ContentExport(ABC):
     """
     Abstract class to represent an Exporter
     Can be implemented to export Contents into a specific format (Markdown, html, etc)
+
+    Rendering is driven by a dispatch table built once per exporter class :
+    each ContentType is handled by the method named _export_<type> (eg. _export_span),
+    so subclasses only override the handlers of the nodes they render differently.
+    A handler rendering children yields them one by one and receives their rendered text,
+    which lets _export walk the Content tree with an explicit stack instead of recursion.
+
+    Pages are rendered by a copy of the exporter bound to the run (see bind), holding the params
+    of the run and the state of the page, so an exporter is never changed while rendering.
     """
 
     # Default extension to use
     PREFERRED_EXTENSION: str = ".txt"
 
+    # ContentType -> handler, resolved once per class (see __init_subclass__)
+    _handlers: Dict[ContentType, NodeHandler] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._handlers = {}
+        for content_type in ContentType:
+            handler = getattr(cls, f'_export_{content_type.name.lower()}', None)
+            if handler is not None:
+                cls._handlers[content_type] = handler
+
     def __init__(self, params: dict = None):
         """
         Init an Exporter, with possible parameters
         @param params: Parameters to setup
         """
-        self.params = params or {}
+        self.params = dict(params or {})
 
     def param(self, key: str, value):
         """
-        Set a parameter
+        Set a parameter, for the next exports
+        (pages being rendered keep the params they started with)
         @param key: Key
         @param value: Value
         """
         self.params[key] = value
 
-    @abstractmethod
-    def export(self, contents: List[Content]) -> str:
+    def bind(self, context: RunContext = None) -> 'ContentExport':
+        """
+        Copy of the exporter rendering pages of a run, with its own params and page state
+        @param context: RunContext, whose params override the exporter ones
+        @return: Exporter
+        """
+        bound = copy.copy(self)
+        bound.params = context.params_of(self) if context is not None else dict(self.params)
+        return bound
+
+    def _handler(self, content: Content) -> NodeHandler:
+        """
+        Find the handler rendering a content
+        @param content: Content
+        @return: Handler
+        """
+        try:
+            return self._handlers[content.type]
+        except KeyError:
+            raise NotImplementedError(f'Type {content.type} is not implemented '
+                                      f'yet for {self.__class__.__name__}') from None
+
+    def _export(self, content: Content) -> str:
+        """
+        Render a single Content (and all of its children) to str
+        The tree is walked with an explicit stack, so deep nesting can't hit the recursion limit
+        @param content: Content to render
+        @return: Rendered text
+        """
+        result = self._handler(content)(self, content)
+        if not isinstance(result, GeneratorType):
+            return result
+
+        stack: List[Generator[Content, str, str]] = [result]
+        value: str | None = None
+        while stack:
+            try:
+                child: Content = stack[-1].send(value)
+            except StopIteration as stop:
+                stack.pop()
+                value = stop.value
+                continue
+
+            result = self._handler(child)(self, child)
+            if isinstance(result, GeneratorType):
+                stack.append(result)
+                value = None
+            else:
+                value = result
+
+        return value
+
+    def export(self, contents: List[Content], context: RunContext = None) -> str:
         """
         Export Contents to str in the implemented language
         @param contents : Contents to export
+        @param context: RunContext of the export (default: the exporter params only)
+        @return: Page
+        """
+        return self.bind(context).render(contents)
+
+    def export_to(self, contents: List[Content], stream: TextIO, context: RunContext = None):
+        """
+        Export Contents into a stream
+        @param contents: Contents to export
+        @param stream: Stream to write into
+        @param context: RunContext of the export (default: the exporter params only)
+        """
+        if self.overrides_export():
+            stream.write(self.export(contents, context))
+        else:
+            self.bind(context).render_to(contents, stream)
+
+    def overrides_export(self) -> bool:
+        """
+        Tell if the exporter overrides export below the class implementing its render, as exporters
+        did before runs had a RunContext : pages must then be exported with export, not rendered
+        @return: True if export is overridden
+        """
+        owners = [next(class_ for class_ in type(self).__mro__ if method in vars(class_))
+                  for method in ('render', 'export')]
+        return owners[1] is not owners[0] and issubclass(owners[1], owners[0])
+
+    def render(self, contents: List[Content]) -> str:
+        """
+        Render Contents to str in the implemented language, on a bound exporter (see bind)
+        Exporters implement it, or override export as they did before runs had a RunContext,
+        in which case render calls their export
+        @param contents : Contents to render
+        @return: Page
+        """
+        if self.overrides_export():
+            return self.export(contents)
+        raise NotImplementedError(f'{self.__class__.__name__} implements neither render '
+                                  f'nor export')
+
+    def render_to(self, contents: List[Content], stream: TextIO):
+        """
+        Render Contents into a stream, on a bound exporter (see bind)
+        Exporters able to emit chunks as they render should override it
+        @param contents: Contents to render
+        @param stream: Stream to write into
+        """
+        stream.write(self.render(contents))
+
+    def get_assets(self) -> Dict[str, str]:
+        """
+        Files shared by every exported page (eg. stylesheets), written once per export
+        @return: Path of the file (relative to the output directory) -> content
         """
-        return NotImplemented
+        return {}
@@ -0,0 +1,330 @@
+"""
+implementation of export content to HTML
+"""
+from html import escape
+from io import StringIO
+from pathlib import Path
+from typing import Dict, List, TextIO
+
+from chardon.article_builder.content import Content, ContentType, TextStyle
+from chardon.exporter import ContentExport
+
+DEFAULT_STYLESHEET: str = """\
+body { max-width: 60em; margin: 0 auto; padding: 1em; font-family: sans-serif; line-height: 1.5; }
+table { border-collapse: collapse; }
+th, td { border: 1px solid #ccc; padding: .25em .5em; text-align: left; }
+pre { background: #f5f5f5; padding: .5em; overflow-x: auto; }
+blockquote { border-left: 4px solid #ccc; margin-left: 0; padding-left: 1em; }
+blockquote.callout { border-color: #4a90d9; background: #f0f6fc; }
+.callout-title { font-weight: bold; }
+.level-1 { margin-left: 2em; }
+.level-2 { margin-left: 4em; }
+.level-3 { margin-left: 6em; }
+"""
+
+# Contents rendered inline, that need a block when they are at the root of the page
+INLINE_TYPES = frozenset({ContentType.TEXT, ContentType.SPAN, ContentType.LINK, ContentType.IMAGE})
+
+
+def escape_text(text: str) -> str:
+    """
+    Escape text content, quotes don't need to be escaped outside attributes
+    @param text: Text
+    @return: Escaped text
+    """
+    if '&' in text or '<' in text or '>' in text:
+        return escape(text, quote=False)
+    return text
+
+
+def anchor(text: str) -> str:
+    """
+    Convert a title text to an id usable as anchor
+    @param text: Title
+    @return: Anchor
+    """
+    return escape(text.replace(' ', '-'))
+
+
+def _block(content: Content, exported_content: str) -> str:
+    """
+    Wrap inline contents in a block, so they are laid out on their own line
+    @param content: Content
+    @param exported_content: Exported content
+    @return: HTML
+    """
+    if content.type in INLINE_TYPES:
+        return f'<div>{exported_content}</div>'
+    return exported_content
+
+
+class HtmlContentExport(ContentExport):
+    """
+    Export Content To HTML
+    Each page links to a single shared stylesheet (see get_assets) instead of inline styles
+    Pages are written chunk by chunk into the stream given to export_to
+    """
+
+    # Default extension to use
+    PREFERRED_EXTENSION: str = ".html"
+
+    # Name of the shared stylesheet, relative to the output directory
+    STYLESHEET: str = "chardon.css"
+
+    # Templates, compiled once as bound str.format
+    TEMPLATES = {
+        ContentType.SEPARATOR: '<hr>'.format,
+        ContentType.CODE: '<pre><code class="language-{language}">{code}</code></pre>'.format,
+        ContentType.LIST_ENTRY: '<li class="level-{level}">{checkbox}{entry}</li>'.format,
+        ContentType.TITLE: '<h{level} id="{anchor}">{text}</h{level}>'.format,
+        ContentType.IMAGE: '<img src="{uri}" alt="{alt}"{title}>'.format,
+        ContentType.LINK: '<a href="{target}"{title}>{text}</a>'.format,
+        ContentType.COMMENT: '<!-- {text} -->'.format,
+        ContentType.QUOTE: '<blockquote{classes}>{title}{quote}{footer}</blockquote>'.format,
+    }
+
+    PROLOGUE = ('<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+                '<title>{title}</title>\n{metadata}'
+                '<link rel="stylesheet" href="{stylesheet}">\n</head>\n<body>\n').format
+    METADATA = '<meta name="{name}" content="{content}">\n'.format
+    EPILOGUE = '</body>\n</html>\n'
+
+    def __init__(self, params: dict = None):
+        super().__init__(params)
+        self.params.setdefault('stylesheet', self.STYLESHEET)
+        # Relative path from the page being rendered to the output directory (set on bound copies)
+        self._root: str = ''
+
+    def get_assets(self) -> Dict[str, str]:
+        """
+        Return the shared stylesheet
+        @return: Stylesheet path -> content
+        """
+        return {
+            self.params['stylesheet']: self.params.get('stylesheet_content', DEFAULT_STYLESHEET)
+        }
+
+    def render(self, contents: List[Content]) -> str:
+        """
+        Render content
+        """
+        stream = StringIO()
+        self.render_to(contents, stream)
+        return stream.getvalue()
+
+    def render_to(self, contents: List[Content], stream: TextIO):
+        """
+        Render content chunk by chunk into a stream
+        @param contents: Contents to render
+        @param stream: Stream to write into
+        """
+        header: Content | None = next((content for content in contents
+                                       if content.type == ContentType.HEADER), None)
+        self._root = ''
+        if header is not None and header.attributes.get('path'):
+            self._root = '../' * len(Path(header.attributes['path']).parts)
+
+        stream.write(self._prologue(header))
+        for content in contents:
+            if content.type == ContentType.HEADER:
+                continue
+            stream.write(_block(content, self._export(content)) + '\n')
+        stream.write(self.EPILOGUE)
+
+    def _prologue(self, header: Content | None) -> str:
+        """
+        Render the head of the page, and open its body
+        @param header: Header Content holding metadata (if any)
+        @return: HTML
+        """
+        attributes: dict = header.attributes if header is not None else {}
+        metadata: List[str] = []
+        for key, value in attributes.items():
+            if key == 'title' or value is None or value == '' or value == []:
+                continue
+            if isinstance(value, list):
+                value = ', '.join(map(str, value))
+            metadata.append(self.METADATA(name=escape(key), content=escape(str(value))))
+
+        return self.PROLOGUE(title=escape_text(str(attributes.get('title', ''))),
+                             metadata=''.join(metadata),
+                             stylesheet=escape(self._root + self.params['stylesheet']))
+
+    def _export_separator(self, _content: Content) -> str:
+        """
+        Export Separator
+        """
+        return self.TEMPLATES[ContentType.SEPARATOR]()
+
+    def _export_code(self, content: Content) -> str:
+        """
+        Export Code
+        """
+        language = escape(content.attributes.get('language') or '')
+        return self.TEMPLATES[ContentType.CODE](language=language,
+                                                code=escape_text(content.attributes['text']))
+
+    def _export_list_entry(self, content: Content):
+        """
+        Export List Entry
+        """
+        checkbox = ''
+        if 'completed' in content.attributes:
+            checked = ' checked' if content.attributes['completed'] else ''
+            checkbox = f'<input type="checkbox" disabled{checked}> '
+        return self.TEMPLATES[ContentType.LIST_ENTRY](level=content.attributes['level'],
+                                                      checkbox=checkbox,
+                                                      entry=(yield content.attributes['entry']))
+
+    def _export_list(self, content: Content):
+        """
+        Export List
+        """
+        tag = 'ol' if content.attributes['ordered'] else 'ul'
+        entries = []
+        for entry in content.attributes['children']:
+            entries.append((yield entry))
+        return f"<{tag}>{''.join(entries)}</{tag}>"
+
+    def _export_text(self, content: Content) -> str:
+        """
+        Export Text
+        """
+        return escape_text(content.attributes['text'])
+
+    def _export_span(self, content: Content):
+        """
+        Export Span, with its style
+        """
+        children = []
+        for child in content.attributes['children']:
+            if child.type == ContentType.SECTION:
+                # Sections within a span are lines of parsed text, and stay inline
+                children.append((yield from self._export_line(child)))
+            else:
+                children.append((yield child))
+        exported_content = escape_text(content.attributes.get('separator', '')).join(children)
+
+        style: TextStyle = content.attributes['style']
+        if TextStyle.ITALIC in style:
+            exported_content = f'<em>{exported_content}</em>'
+        if TextStyle.BOLD in style:
+            exported_content = f'<strong>{exported_content}</strong>'
+        if TextStyle.UNDERLINED in style:
+            exported_content = f'<u>{exported_content}</u>'
+        if TextStyle.STRIKETHROUGH in style:
+            exported_content = f'<s>{exported_content}</s>'
+        return exported_content
+
+    def _export_line(self, content: Content):
+        """
+        Export a Section inline, as a single line of text
+        """
+        lines = []
+        for child in content.attributes['children']:
+            lines.append((yield child))
+        return ''.join(lines)
+
+    def _export_quote(self, content: Content):
+        """
+        Export Quote, as a callout if specified
+        """
+        classes = ''
+        title = ''
+        if 'callout' in content.attributes:
+            # CalloutType is a str Enum, its value is the callout name
+            callout = escape(str(getattr(content.attributes['callout'], 'value',
+                                         content.attributes['callout'])))
+            classes = f' class="callout callout-{callout}"'
+            callout_title = content.attributes.get('callout-title', callout.capitalize())
+            title = f'<div class="callout-title">{escape_text(callout_title)}</div>'
+
+        footer = ' '.join(escape_text(str(content.attributes[key]))
+                          for key in ('author', 'date', 'location') if key in content.attributes)
+        if footer:
+            footer = f'<footer>{footer}</footer>'
+
+        return self.TEMPLATES[ContentType.QUOTE](classes=classes, title=title,
+                                                 quote=(yield content.attributes['quote']),
+                                                 footer=footer)
+
+    def _export_header(self, _content: Content) -> str:
+        """
+        Header is rendered in the head of the page (see render_to)
+        """
+        return ''
+
+    def _export_section(self, content: Content):
+        """
+        Export Section
+        """
+        children = []
+        for child in content.attributes['children']:
+            children.append(_block(child, (yield child)))
+        return '<div class="section">' + '\n'.join(children) + '</div>'
+
+    def _export_image(self, content: Content) -> str:
+        """
+        Export Image
+        """
+        title = f' title="{escape(content.attributes["title"])}"' \
+            if 'title' in content.attributes else ''
+        exported_content = self.TEMPLATES[ContentType.IMAGE](uri=escape(content.attributes['uri']),
+                                                             alt=escape(content.attributes['alt']),
+                                                             title=title)
+        if 'link' in content.attributes:
+            link = escape(content.attributes['link'])
+            exported_content = f'<a href="{link}">{exported_content}</a>'
+        return exported_content
+
+    def _export_title(self, content: Content) -> str:
+        """
+        Export Title, anchored by its text
+        """
+        return self.TEMPLATES[ContentType.TITLE](level=min(content.attributes['level'], 6),
+                                                 anchor=anchor(content.attributes['text']),
+                                                 text=escape_text(content.attributes['text']))
+
+    def _export_table(self, content: Content):
+        """
+        Export Table
+        """
+        headers: List[str] = []
+        for head in content.attributes['headers']:
+            headers.append(f'<th>{(yield head)}</th>')
+
+        rows: List[str] = []
+        for row in content.attributes['rows']:
+            cells: List[str] = []
+            for cell in row.cells:
+                colspan = f' colspan="{cell.size}"' if cell.size > 1 else ''
+                cells.append(f'<td{colspan}>{(yield cell.content)}</td>')
+            rows.append(f"<tr>{''.join(cells)}</tr>")
+
+        return f"<table><thead><tr>{''.join(headers)}</tr></thead>" \
+               f"<tbody>{''.join(rows)}</tbody></table>"
+
+    def _export_link(self, content: Content) -> str:
+        """
+        Export Link, resolving internal links to anchors and links to other pages to .html files
+        """
+        target = str(content.attributes['target'])
+        if content.attributes.get('internal-link', False):
+            target = '#' + anchor(target)
+        elif content.attributes.get('link_to_another_page', False):
+            target = escape(self._root + target + self.PREFERRED_EXTENSION)
+        else:
+            target = escape(target)
+
+        title = f' title="{escape(content.attributes["alt"])}"' \
+            if 'alt' in content.attributes else ''
+        return self.TEMPLATES[ContentType.LINK](target=target, title=title,
+                                                text=escape_text(content.attributes['text']))
+
+    def _export_comment(self, content: Content) -> str:
+        """
+        Export Comment
+        """
+        # "--" would end the comment early
+        text = content.attributes['text'].replace('--', '- -')
+        return self.TEMPLATES[ContentType.COMMENT](text=text)
@@ -0,0 +1,124 @@
+"""
+Escaping of text for Markdown based exporters
+Every escape table is built once at import, and applied once per text in its context
+(plain text, table cell, link target, list entry head)
+
+Note : tables are sequences of (old, new) applied with str.replace, only when old is present.
+On CPython, str.translate with multi-characters replacements goes through a slow generic path,
+while most texts contain no special character at all and only pay a few `in` checks
+"""
+import re
+from functools import lru_cache
+from typing import Tuple
+
+EscapeTable = Tuple[Tuple[str, str], ...]
+
+# Newline that must survive the breakline substitution (used by front matter)
+RAW_BREAKLINE: str = '\0'
+
+# Characters with a meaning in CommonMark / GFM inline syntax
+# (backslash must come first, so that added backslashes aren't escaped again)
+MARKDOWN_SPECIAL_CHARACTERS: str = '\\`*_[]<>~'
+
+# Obsidian adds #tags and $math$
+OBSIDIAN_SPECIAL_CHARACTERS: str = MARKDOWN_SPECIAL_CHARACTERS + '#$'
+
+MARKDOWN_TEXT_TABLE: EscapeTable = tuple((char, '\\' + char)
+                                         for char in MARKDOWN_SPECIAL_CHARACTERS)
+
+OBSIDIAN_TEXT_TABLE: EscapeTable = tuple((char, '\\' + char)
+                                         for char in OBSIDIAN_SPECIAL_CHARACTERS)
+
+# Texts repeat a lot across pages (type names, separators...), escaped texts are memoized
+TEXT_CACHE_SIZE: int = 1 << 14
+
+# Obsidian ==highlight== and %%comment%% are only special when doubled
+OBSIDIAN_DOUBLED_REGEX = re.compile(r'(==|%%)')
+
+# Characters that would end or break the target of a [text](target) link
+LINK_TARGET_TABLE: EscapeTable = (
+    (' ', '%20'),
+    ('(', '%28'),
+    (')', '%29'),
+    ('<', '%3C'),
+    ('>', '%3E'),
+)
+
+# A list entry starting with "1968." or "- " would be read as a nested list
+# See https://www.markdownguide.org/basic-syntax/#starting-unordered-list-items-with-numbers
+LIST_HEAD_REGEX = re.compile(r'^(\d+(?=[.)])|(?=[-+>](?:\s|$)))')
+
+
+def escape(text: str, table: EscapeTable) -> str:
+    """
+    Apply an escape table to a text
+    @param text: Text
+    @param table: Escape table
+    @return: Escaped text
+    """
+    for old, new in table:
+        if old in text:
+            text = text.replace(old, new)
+    return text
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def escape_text(text: str) -> str:
+    """
+    Escape plain text so it is rendered as is
+    @param text: Text
+    @return: Escaped text
+    """
+    return escape(text, MARKDOWN_TEXT_TABLE)
+
+
+@lru_cache(maxsize=TEXT_CACHE_SIZE)
+def escape_obsidian_text(text: str) -> str:
+    """
+    Escape plain text so it is rendered as is by Obsidian
+    @param text: Text
+    @return: Escaped text
+    """
+    text = escape(text, OBSIDIAN_TEXT_TABLE)
+    if '==' in text or '%%' in text:
+        text = OBSIDIAN_DOUBLED_REGEX.sub(r'\\\1', text)
+    return text
+
+
+def escape_link_target(target: str) -> str:
+    """
+    Percent-encode characters that can't appear in a link target
+    @param target: Target
+    @return: Escaped target
+    """
+    return escape(target, LINK_TARGET_TABLE)
+
+
+def escape_list_head(element: str) -> str:
+    """
+    Escape the head of a list entry, so it isn't read as another list
+    eg. "1968. A great year" becomes "1968\\. A great year"
+    @param element: Rendered entry
+    @return: Unambiguous entry
+    """
+    if element and (element[0].isdigit() or element[0] in '-+>'):
+        return LIST_HEAD_REGEX.sub(r'\1\\', element, count=1)
+    return element
+
+
+def table_cell_table(breakline: str | None) -> EscapeTable:
+    """
+    Build the escape table used to sanitize table cells
+    @param breakline: Replacement for breaklines (a space if None)
+    @return: Escape table
+    """
+    return ('|', '\\|'), ('\n', breakline or ' ')
+
+
+def breakline_table(breakline: str) -> EscapeTable:
+    """
+    Build the escape table substituting breaklines at the end of an export
+    @param breakline: Replacement for breaklines
+    @return: Escape table
+    """
+    return ('\n', breakline), (RAW_BREAKLINE, '\n')
@@ -1,13 +1,15 @@
 """
 implementation of export content to Markdown
 """
-import logging
 from enum import Enum, auto
-from typing import List
+from typing import Dict, List
 
 # pylint: disable=too-many-arguments
-from chardon.article_builder.content import ContentType, TextStyle, Content
+from chardon import diagnostics
+from chardon.article_builder.content import TextStyle, Content
 from chardon.exporter import ContentExport
+from chardon.exporter.markdown_escaping import RAW_BREAKLINE, EscapeTable, escape, escape_text, \
+    escape_list_head, escape_link_target, table_cell_table, breakline_table
 
 
 def joins(elements: List[str], before: str = '', before_each: str = '',
@@ -27,28 +29,22 @@ def joins(elements: List[str], before: str = '', before_each: str = '',
     ) + after
 
 
-# pylint: disable=anomalous-backslash-in-string
 def clean_list_element(element: str):
     """
     Markdown will improperly convert unsorted array to sorted
-    array if the first element starts with a number
+    array if the first element starts with a number followed by a period
     eg. Avoid doing
-    - 1 octet is equals to 8 bits
+    - 1968. A great year
     - This is the second element
 
     Do this instead :
-    - 1\ octet is equals to 8 bits
+    - 1968\\. A great year
     - This is the second element
     See https://www.markdownguide.org/basic-syntax/#starting-unordered-list-items-with-numbers
     @param element: Element to clean
     @return: Unambiguous text
     """
-    if element[0].isdigit():
-        i = 0
-        while element[i].isdigit():
-            i += 1
-        return element[:i] + "\\" + element[i:]
-    return element
+    return escape_list_head(element)
 
 
 class MarkdownContentBreaklineType(Enum):
@@ -62,6 +58,14 @@ class MarkdownContentBreaklineType(Enum):
     BR_TAG = auto()  # Using <br>
 
 
+BREAKLINE_TABLES: Dict[MarkdownContentBreaklineType, EscapeTable] = {
+    MarkdownContentBreaklineType.NONE: breakline_table('\n'),
+    MarkdownContentBreaklineType.TRAILING_WHITESPACE: breakline_table('  \n'),
+    MarkdownContentBreaklineType.BACKSLASH: breakline_table('\\\n'),
+    MarkdownContentBreaklineType.BR_TAG: breakline_table('<br>\n')
+}
+
+
 class MarkdownContentExport(ContentExport):
     """
     Export Content To Markdown
@@ -72,9 +76,24 @@ class MarkdownContentExport(ContentExport):
     BREAKLINE: MarkdownContentBreaklineType = MarkdownContentBreaklineType.TRAILING_WHITESPACE
     BREAKLINE_IN_TABLE: str = None
 
+    # Escape table sanitizing table cells, built once per class (see __init_subclass__)
+    _table_cell_table: EscapeTable = table_cell_table(BREAKLINE_IN_TABLE)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._table_cell_table = table_cell_table(cls.BREAKLINE_IN_TABLE)
+
     def __init__(self, params: dict = None):
         super().__init__(params)
-        self.params['break_line_type'] = MarkdownContentExport.BREAKLINE
+        self.params.setdefault('break_line_type', MarkdownContentExport.BREAKLINE)
+
+    def escape(self, text: str) -> str:
+        """
+        Escape plain text, so that Markdown special characters are rendered as is
+        @param text: Text
+        @return: Escaped text
+        """
+        return escape_text(text)
 
     def sanitize_table_element(self, element: str) -> str:
         """
@@ -85,182 +104,207 @@ class MarkdownContentExport(ContentExport):
         """
         if '\n' in element:
             if self.BREAKLINE_IN_TABLE is None:
-                logging.warning("Table element contains \\n, which is unsupported in %s : %s",
-                                self.__class__.__name__,
-                                element.replace("\n", '\\n'))
-            element = element.replace("\n", self.BREAKLINE_IN_TABLE or ' ')
+                diagnostics.record('table-line-break', symbol=element.replace("\n", '\\n'),
+                                   detail=self.__class__.__name__)
 
-        return element.replace("|", "\|")  # Note : can be replaced with &#124;
+        return escape(element, self._table_cell_table)  # Note : | can be replaced with &#124;
 
     def set_break_line_type(self, new_type: MarkdownContentBreaklineType):
         """
-        Specify a breakline type
+        Specify a breakline type, for the next exports
         @param new_type: Breakline
         """
         self.params['break_line_type'] = new_type
 
-    def export(self, contents: List[Content]) -> str:
+    def render(self, contents: List[Content]) -> str:
         """
-        Export content
+        Render content
         """
-        breakline: str = {
-            MarkdownContentBreaklineType.NONE: '\n',
-            MarkdownContentBreaklineType.TRAILING_WHITESPACE: '  \n',
-            MarkdownContentBreaklineType.BACKSLASH: '\\\n',
-            MarkdownContentBreaklineType.BR_TAG: '<br>\n'
-        }[self.params['break_line_type']]  # Selecting the appropriate breakline
-
         text = "\n".join([self._export(content) for content in contents])
 
-        return text.replace('\n', breakline).replace('\m', '\n')
+        # Selecting the appropriate breakline
+        return escape(text, BREAKLINE_TABLES[self.params['break_line_type']])
 
-    # pylint: disable=too-many-branches
-    # pylint: disable=too-many-statements
-    def _export(self, content: Content) -> str:
+    def _export_separator(self, _content: Content) -> str:
         """
-        Export content, without considering the breaklines yet
+        Export Separator
         """
-        exported_content: str
-        match content.type:
-            case ContentType.SEPARATOR:
-                exported_content = '\n---\n'
+        return '\n---\n'
 
-            case ContentType.CODE:
-                exported_content = joins(
-                    before=f"```{content.attributes['language']}\n",
-                    after="```",
+    def _export_code(self, content: Content) -> str:
+        """
+        Export Code
+        """
+        return joins(
+            before=f"```{content.attributes['language']}\n",
+            after="```",
 
-                    elements=content.attributes['text'].split('\n'),
-                    before_each="  ",
-                    between_each="\n"
-                )
+            elements=content.attributes['text'].split('\n'),
+            before_each="  ",
+            between_each="\n"
+        )
 
-            case ContentType.LIST_ENTRY:
-                exported_content = "    " * content.attributes['level'] + \
-                                   self._export(content.attributes['entry'])
+    def _export_list_entry(self, content: Content):
+        """
+        Export List Entry
+        """
+        return "    " * content.attributes['level'] + \
+            escape_list_head((yield content.attributes['entry']))
 
-            case ContentType.LIST:
-                ordered = content.attributes['ordered']
-                entries = ["    " * entry.attributes['level'] +
+    def _export_list(self, content: Content):
+        """
+        Export List
+        """
+        ordered = content.attributes['ordered']
+        entries = []
+        for i, entry in enumerate(content.attributes['children']):
+            entries.append("    " * entry.attributes['level'] +
                            (f'{i + 1}. ' if ordered else "- ") +
-                           self._export(entry.attributes['entry'])
-                           for i, entry in enumerate(content.attributes['children'])]
-
-                exported_content = joins(
-                    elements=entries,
-                    between_each="\n"
-                )
-
-            case ContentType.TEXT:
-                exported_content = content.attributes['text']
-
-            case ContentType.SPAN:
-                exported_content = (content.attributes.get('separator', '')).join([
-                    self._export(children)
-                    for children in content.attributes['children']
-                ])
-
-                if TextStyle.ITALIC in content.attributes['style']:
-                    exported_content = f'*{exported_content}*'
-                if TextStyle.BOLD in content.attributes['style']:
-                    exported_content = f'**{exported_content}**'
-
-            case ContentType.QUOTE:
-                base_footer = "\n> "
-                footer = base_footer
-
-                # Creating the footer
-                if 'author' in content.attributes:
-                    footer += f" {content.attributes['author']}"
-                if 'date' in content.attributes:
-                    footer += f" {content.attributes['date']}"
-                if 'location' in content.attributes:
-                    footer += f" {content.attributes['location']}"
-
-                if footer == base_footer:  # If the footer is empty, remove it
-                    footer = ""
-
-                exported_content = joins(
-                    elements=self._export(content.attributes['quote']).split('\n'),
-                    before_each="> ",
-                    between_each="\n",
-
-                    # Put blank line around the quote, for best practices :
-                    # https://www.markdownguide.org/basic-syntax/#blockquotes-best-practices
-                    before="\n",
-                    after=footer + "\n"
-                )
-
-            case ContentType.HEADER:
-                keys = content.attributes.keys()
-                values = {}
-                for key in keys:
-                    if isinstance(content.attributes[key], list):
-                        if len(content.attributes[key]) > 0:
-                            values[key] = joins(content.attributes[key],
-                                                before="\n", before_each="- ", after_each="\n")
-                    else:
-                        if content.attributes[key] is None or content.attributes[key] == "":
-                            continue
-
-                        values[key] = content.attributes[key]
-                exported_content = '\n'.join([key + ": " + value for key, value in values.items()])
-                exported_content = f"---\m{exported_content}\n---\m"
-
-            case ContentType.SECTION:
-                exported_content = joins(
-                    elements=[self._export(content)
-                              for content in content.attributes['children']],
-                    between_each="\n"
-                )
-
-            case ContentType.IMAGE:
-                title = f" {content.attributes['title']}" \
-                    if 'title' in content.attributes else ""
-                size = f"|{content.attributes['size']}" \
-                    if 'size' in content.attributes else ""
-
-                exported_content = f"![{content.attributes['alt']}{size}" \
-                                   f"({content.attributes['uri']}{title})]"
-                if 'link' in content.attributes:
-                    exported_content = f"[{exported_content}]({content.attributes['link']})"
-
-            case ContentType.TITLE:
-                # Put blank line around the title, for best practices :
-                # https://www.markdownguide.org/basic-syntax/#heading-best-practices
-                exported_content = f"\n{'#' * content.attributes['level']}" \
-                                   f" {content.attributes['text']}\n"
-
-            case ContentType.TABLE:
-                headers: List[str] = [self.sanitize_table_element(self._export(head)) for head in
-                                      content.attributes['headers']]
-
-                # Export header
-                exported_content = joins(headers, before="\n| ", after=" |\n", between_each=" | ")
-
-                # Export --- below header
-                exported_content += joins(
-                    ["---" for _ in content.attributes['headers']],
-                    before="| ", after=" |\n", between_each=" | "
-                )
-
-                # Export rows
-                for row in content.attributes['rows']:
-                    exported_content += joins(
-                        [self.sanitize_table_element(self._export(cell.content))
-                         for cell in row.cells],
-                        before="| ", after=" |\n", between_each=" | "
-                    )
-
-            case ContentType.LINK:
-                if 'internal-link' in content.attributes and content.attributes['internal-link']:
-                    exported_content = f"[[{content.attributes['text']}]]"
-                else:
-                    exported_content = f"[{content.attributes['text']}]" \
-                                       f"({str(content.attributes['target']).replace(' ', '%20')})"
-
-            case _:
-                raise NotImplementedError(f'Type {content.type} is not implemented'
-                                          f'yet for {self.__class__.__name__}')
+                           escape_list_head((yield entry.attributes['entry'])))
+
+        return joins(
+            elements=entries,
+            between_each="\n"
+        )
+
+    def _export_text(self, content: Content) -> str:
+        """
+        Export Text
+        """
+        # Texts parsed from comments are written as is, their markup being rendered
+        if content.attributes.get('literal', False):
+            return self.escape(content.attributes['text'])
+        return content.attributes['text']
+
+    def _export_span(self, content: Content):
+        """
+        Export Span, with its style
+        """
+        children = []
+        for child in content.attributes['children']:
+            children.append((yield child))
+        exported_content = content.attributes.get('separator', '').join(children)
+
+        if TextStyle.ITALIC in content.attributes['style']:
+            exported_content = f'*{exported_content}*'
+        if TextStyle.BOLD in content.attributes['style']:
+            exported_content = f'**{exported_content}**'
 
         return exported_content
+
+    def _export_quote(self, content: Content):
+        """
+        Export Quote and its footer
+        """
+        base_footer = "\n> "
+        footer = base_footer
+
+        # Creating the footer
+        if 'author' in content.attributes:
+            footer += f" {content.attributes['author']}"
+        if 'date' in content.attributes:
+            footer += f" {content.attributes['date']}"
+        if 'location' in content.attributes:
+            footer += f" {content.attributes['location']}"
+
+        if footer == base_footer:  # If the footer is empty, remove it
+            footer = ""
+
+        quote: str = yield content.attributes['quote']
+        return joins(
+            elements=quote.split('\n'),
+            before_each="> ",
+            between_each="\n",
+
+            # Put blank line around the quote, for best practices :
+            # https://www.markdownguide.org/basic-syntax/#blockquotes-best-practices
+            before="\n",
+            after=footer + "\n"
+        )
+
+    def _export_header(self, content: Content) -> str:
+        """
+        Export Header as a front matter
+        """
+        values = {}
+        for key, value in content.attributes.items():
+            if isinstance(value, list):
+                if len(value) > 0:
+                    values[key] = joins(value, before="\n", before_each="- ", after_each="\n")
+            else:
+                if value is None or value == "":
+                    continue
+
+                values[key] = value
+        exported_content = '\n'.join([key + ": " + value for key, value in values.items()])
+        return f"---{RAW_BREAKLINE}{exported_content}\n---{RAW_BREAKLINE}"
+
+    def _export_section(self, content: Content):
+        """
+        Export Section
+        """
+        children = []
+        for child in content.attributes['children']:
+            children.append((yield child))
+        return joins(
+            elements=children,
+            between_each="\n"
+        )
+
+    def _export_image(self, content: Content) -> str:
+        """
+        Export Image
+        """
+        title = f" {content.attributes['title']}" \
+            if 'title' in content.attributes else ""
+        size = f"|{content.attributes['size']}" \
+            if 'size' in content.attributes else ""
+
+        exported_content = f"![{content.attributes['alt']}{size}" \
+                           f"({content.attributes['uri']}{title})]"
+        if 'link' in content.attributes:
+            exported_content = f"[{exported_content}]({content.attributes['link']})"
+        return exported_content
+
+    def _export_title(self, content: Content) -> str:
+        """
+        Export Title
+        """
+        # Put blank line around the title, for best practices :
+        # https://www.markdownguide.org/basic-syntax/#heading-best-practices
+        return f"\n{'#' * content.attributes['level']} {content.attributes['text']}\n"
+
+    def _export_table(self, content: Content):
+        """
+        Export Table
+        """
+        headers: List[str] = []
+        for head in content.attributes['headers']:
+            headers.append(self.sanitize_table_element((yield head)))
+
+        # Export header
+        exported_content = joins(headers, before="\n| ", after=" |\n", between_each=" | ")
+
+        # Export --- below header
+        exported_content += joins(
+            ["---" for _ in content.attributes['headers']],
+            before="| ", after=" |\n", between_each=" | "
+        )
+
+        # Export rows
+        for row in content.attributes['rows']:
+            cells: List[str] = []
+            for cell in row.cells:
+                cells.append(self.sanitize_table_element((yield cell.content)))
+            exported_content += joins(cells, before="| ", after=" |\n", between_each=" | ")
+
+        return exported_content
+
+    def _export_link(self, content: Content) -> str:
+        """
+        Export Link
+        """
+        if 'internal-link' in content.attributes and content.attributes['internal-link']:
+            return f"[[{content.attributes['text']}]]"
+        return f"[{self.escape(content.attributes['text'])}]" \
+               f"({escape_link_target(str(content.attributes['target']))})"
@@ -1,9 +1,11 @@
 """
 implementation of export content to Markdown
 """
+from pathlib import PurePath
 
-from chardon.article_builder.content import ContentType, Content
-from chardon.exporter.markdown_exporter import joins, MarkdownContentExport,\
+from chardon.article_builder.content import Content
+from chardon.exporter.markdown_escaping import escape_obsidian_text
+from chardon.exporter.markdown_exporter import joins, escape_list_head, MarkdownContentExport,\
     MarkdownContentBreaklineType
 
 
@@ -17,7 +19,15 @@ class ObsidianFlavoredMarkdownContentExport(MarkdownContentExport):
     # Override default breakline for ObsidianFlavoredMD
     BREAKLINE: MarkdownContentBreaklineType = MarkdownContentBreaklineType.NONE
 
-    def _list_entry_export(self, entry: Content, ordered: bool = False, index: int = 0) -> str:
+    def escape(self, text: str) -> str:
+        """
+        Escape plain text, including Obsidian #tags, $math$, ==highlight== and %%comment%%
+        @param text: Text
+        @return: Escaped text
+        """
+        return escape_obsidian_text(text)
+
+    def _list_entry_export(self, entry: Content, ordered: bool = False, index: int = 0):
         """
         Export list entry to string
         @param entry: Content
@@ -30,56 +40,60 @@ class ObsidianFlavoredMarkdownContentExport(MarkdownContentExport):
         checkbox = ""
         if 'completed' in entry.attributes:
             checkbox = f'[{"x" if entry.attributes["completed"] else " "}] '
-        content = self._export(entry.attributes['entry'])
+        content = escape_list_head((yield entry.attributes['entry']))
         return f"{tab}{head}{checkbox}{content}"
 
-    def _export(self, content: Content) -> str:
+    def _export_list(self, content: Content):
         """
-        Export content, without considering the breaklines yet
+        Export List, with optional checkboxes
         """
-        exported_content: str
-        match content.type:
-            case ContentType.LIST:
-                ordered = content.attributes['ordered']
-                entries = [self._list_entry_export(entry, ordered, i)
-                           for i, entry in enumerate(content.attributes['children'])]
-
-                exported_content = joins(
-                    elements=entries,
-                    between_each="\n"
-                )
-
-            case ContentType.QUOTE:
-                exported_content: str = ""
-                if 'callout' in content.attributes:
-                    exported_content = f'\n> [!{content.attributes["callout"]}]'
-                    if content.attributes.get('foldable', False):
-                        indicator = "+"
-                        if content.attributes.get('collapses-by-default', False):
-                            indicator = "-"
-                        exported_content += indicator
-
-                    if 'callout-title' in content.attributes:
-                        exported_content += f" {content.attributes['callout-title']}"
+        ordered = content.attributes['ordered']
+        entries = []
+        for i, entry in enumerate(content.attributes['children']):
+            entries.append((yield from self._list_entry_export(entry, ordered, i)))
 
-                return exported_content + super()._export(content)
+        return joins(
+            elements=entries,
+            between_each="\n"
+        )
 
-            case ContentType.LINK:
-                if content.attributes.get('internal-link', False):
-                    text: str = ('|' + content.attributes['text']) \
-                        if 'text' in content.attributes else ''
-                    exported_content = f"[[#{content.attributes['target']}{text}]]"
-
-                    if 'embed' in content.attributes and content.attributes['embed']:
-                        exported_content = '!' + exported_content
-
-                elif content.attributes.get('link_to_another_page', False):
-                    exported_content = f"[[{content.attributes['text']}]]"
+    def _export_quote(self, content: Content):
+        """
+        Export Quote, as a callout if specified
+        """
+        exported_content: str = ""
+        if 'callout' in content.attributes:
+            exported_content = f'\n> [!{content.attributes["callout"]}]'
+            if content.attributes.get('foldable', False):
+                indicator = "+"
+                if content.attributes.get('collapses-by-default', False):
+                    indicator = "-"
+                exported_content += indicator
 
-                else:
-                    return super()._export(content)
+            if 'callout-title' in content.attributes:
+                exported_content += f" {content.attributes['callout-title']}"
 
-            case _:
-                return super()._export(content)
+        return exported_content + (yield from super()._export_quote(content))
 
-        return exported_content
+    def _export_link(self, content: Content) -> str:
+        """
+        Export Link, using wikilinks for internal links and links to other pages
+        """
+        if content.attributes.get('internal-link', False):
+            text: str = ('|' + content.attributes['text']) \
+                if 'text' in content.attributes else ''
+            exported_content = f"[[#{content.attributes['target']}{text}]]"
+
+            if 'embed' in content.attributes and content.attributes['embed']:
+                exported_content = '!' + exported_content
+            return exported_content
+
+        if content.attributes.get('link_to_another_page', False):
+            # Notes are linked by name, the text is shown instead when it differs
+            # (eg. member pages of a split class)
+            page: str = PurePath(str(content.attributes['target'])).name
+            if page and page != content.attributes['text']:
+                return f"[[{page}|{content.attributes['text']}]]"
+            return f"[[{content.attributes['text']}]]"
+
+        return super()._export_link(content)
@@ -1,2 +1,25 @@
 # pylint: disable=missing-module-docstring
-from .obsidian_graph_colorer import ObsidianGraphColorer
\ No newline at end of file
+# pylint: disable=undefined-all-variable
+import importlib
+
+# Extra exporters are optional, and some import heavy modules (sqlite3), so they are only
+# imported when used (PEP 562)
+_LAZY_ATTRIBUTES = {
+    'ObsidianGraphColorer': '.obsidian_graph_colorer',
+    'SqliteExporter': '.sqlite_exporter',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    """
+    Import the module of an extra exporter on first access
+    @param name: Name
+    @return: Extra exporter class
+    """
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Dict, Iterable
+from typing import List, Dict, Iterable, Iterator, Tuple
 
 
 class FileInput:
@@ -20,21 +20,66 @@ class FileNode:
     parent: Self | None
     children: Dict[str, Self]
     key: str
-    path: str
 
     def __init__(self, data: any, key: str, parent: Self | None = None, children: Dict[str, Self] | None = None):
         self.data = data
         self.key = key
         self.parent = parent
         self.children = children or {}
-        self.path = (parent.path + "/") if parent and parent.path != "" else ""
-        self.path += key
+        # Computed on first access, see path
+        self._path: str | None = None
+
+    @property
+    def path(self) -> str:
+        """
+        Path of the node from the root (eg. Core/Brain), computed once from its parents
+        @return: Path
+        """
+        if self._path is None:
+            keys = []
+            node = self
+            while node is not None and node.cached_path() is None:
+                keys.append(node.key)
+                node = node.parent
+            prefix = node.cached_path() if node is not None else ""
+            for key in reversed(keys):
+                if key == "":
+                    continue
+                prefix = prefix + "/" + key if prefix else key
+            self._path = prefix
+        return self._path
+
+    def cached_path(self) -> str | None:
+        """
+        Path of the node, if it was already computed
+        @return: Path, None if not computed yet
+        """
+        return self._path
+
+    def reset_path(self):
+        """
+        Forget the path of the node, computed again on next access
+        """
+        self._path = None
+
+    def invalidate_path(self):
+        """
+        Forget the path of the node and of its whole subtree (eg. once moved to another parent)
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            node.reset_path()
+            stack.extend(node.children.values())
 
     def add_child(self, child: Self):
+        if child.parent is not None and child.parent is not self \
+                and child.parent.children.get(child.key) is child:
+            # Moved from another parent
+            del child.parent.children[child.key]
         self.children[child.key] = child
         child.parent = self
-        child.path = self.path + "/" if self.path else ""
-        child.path += child.key
+        child.invalidate_path()
 
     def __repr__(self):
         return f"FileNode({self.parent.key if self.parent else '[root]'}->{self.key}->[{len(self.children)}])"
@@ -42,43 +87,143 @@ class FileNode:
 class FileTree:
     """
     FileTree containing FileNode, created from a list of FileInput
+    Nodes are indexed by their hierarchy, so inserting a file doesn't walk the tree from its root
     """
     root: FileNode
+    nodes: Dict[Tuple[str, ...], FileNode]
 
-    def __init__(self, files: List[FileInput]):
+    def __init__(self, files: Iterable[FileInput]):
         self.root = FileNode(None, "", None, {})
+        self.nodes = {(): self.root}
+        self.add_all(files)
+
+    def add_all(self, files: Iterable[FileInput]):
+        """
+        Add files in bulk : the folders of the previous file are kept on a stack, so when files
+        are sorted by hierarchy, only the folders that differ from the previous file's are visited
+        Unsorted files are supported too, their folders being found in the index
+        @param files: Files
+        """
+        # Folders of the previous file, from the root
+        stack: List[FileNode] = [self.root]
+        previous: Tuple[str, ...] = ()
         for file in files:
-            self.add(file)
+            hierarchy = tuple(file.hierarchy)
+            if hierarchy != previous:
+                common = 0
+                while common < min(len(hierarchy), len(previous)) \
+                        and hierarchy[common] == previous[common]:
+                    common += 1
+                del stack[common + 1:]
+                for depth in range(common + 1, len(hierarchy) + 1):
+                    folder = self.nodes.get(hierarchy[:depth])
+                    if folder is None:
+                        folder = FileNode(None, hierarchy[depth - 1])
+                        stack[-1].add_child(folder)
+                        self.nodes[hierarchy[:depth]] = folder
+                    stack.append(folder)
+                previous = hierarchy
+
+            child = FileNode(file.data, file.key)
+            stack[-1].add_child(child)
+            self.nodes[hierarchy + (file.key,)] = child
 
     def create_empty_nodes(self, nodes: List[str], from_node: FileNode | None = None) -> FileNode:
         parent = from_node or self.root
+        hierarchy = self.hierarchy_of(parent)
         for node in nodes:
+            hierarchy += (node,)
             child = FileNode(None, node, parent, {})
             parent.add_child(child)
+            self.nodes[hierarchy] = child
             parent = child
 
         return parent
 
     def get_node(self, nodes: List[str], create_if_empty: bool = False) -> FileNode:
-
-        current_node = self.root
-        for node in nodes:
-            if node in current_node.children:
-                current_node = current_node.children[node]
-            else:
-                if create_if_empty:
-                    current_node = self.create_empty_nodes([node], from_node=current_node)
-                else:
-                    raise Exception(f"Get node couldn't find node {node} in {current_node} (looking for {nodes})")
-
-        return current_node
+        hierarchy = tuple(nodes)
+        current_node = self.nodes.get(hierarchy)
+        if current_node is not None:
+            return current_node
+
+        # Deepest existing ancestor
+        depth = len(hierarchy) - 1
+        while hierarchy[:depth] not in self.nodes:
+            depth -= 1
+        if not create_if_empty:
+            raise Exception(f"Get node couldn't find node {hierarchy[depth]} in "
+                            f"{self.nodes[hierarchy[:depth]]} (looking for {nodes})")
+        return self.create_empty_nodes(list(hierarchy[depth:]),
+                                       from_node=self.nodes[hierarchy[:depth]])
+
+    def hierarchy_of(self, node: FileNode) -> Tuple[str, ...]:
+        """
+        Keys from the root to a node
+        @param node: Node
+        @return: Keys, empty for the root
+        """
+        keys = []
+        while node is not None and node is not self.root:
+            keys.append(node.key)
+            node = node.parent
+        return tuple(reversed(keys))
+
+    def move(self, node: FileNode, parent: FileNode):
+        """
+        Move a node and its subtree under another parent, keeping the index up to date
+        @param node: Node to move
+        @param parent: New parent
+        """
+        old = self.hierarchy_of(node)
+        new = self.hierarchy_of(parent) + (node.key,)
+        if new[:len(old)] == old:
+            raise ValueError(f"Can't move {node} under itself")
+        if node.key in parent.children:
+            raise ValueError(f"{parent} already has a child {node.key}")
+
+        # Hierarchies of the subtree, relative to the moved node
+        moved: Dict[Tuple[str, ...], FileNode] = {}
+        stack: List[Tuple[Tuple[str, ...], FileNode]] = [((), node)]
+        while stack:
+            keys, descendant = stack.pop()
+            del self.nodes[old + keys]
+            moved[new + keys] = descendant
+            stack.extend((keys + (child.key,), child) for child in descendant.children.values())
+        parent.add_child(node)
+        self.nodes.update(moved)
 
     def add(self, file: FileInput):
-        self.get_node(file.hierarchy, True).add_child(FileNode(file.data, file.key))
+        parent = self.get_node(file.hierarchy, True)
+        child = FileNode(file.data, file.key)
+        parent.add_child(child)
+        self.nodes[tuple(file.hierarchy) + (file.key,)] = child
+
+    def pre_order(self, from_node: FileNode | None = None) -> Iterator[FileNode]:
+        """
+        Iterate over a subtree, each node before its children
+        @param from_node: Root of the subtree (the whole tree by default)
+        @return: Nodes
+        """
+        stack = [from_node or self.root]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children.values()))
+
+    def post_order(self, from_node: FileNode | None = None) -> Iterator[FileNode]:
+        """
+        Iterate over a subtree, each node after its children
+        @param from_node: Root of the subtree (the whole tree by default)
+        @return: Nodes
+        """
+        stack: List[Tuple[FileNode, bool]] = [(from_node or self.root, False)]
+        while stack:
+            node, visited = stack.pop()
+            if visited or not node.children:
+                yield node
+                continue
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(node.children.values()))
 
     def get_all_nodes(self, from_node: FileNode | None = None) -> Iterable[FileNode]:
-        parent = from_node or self.root
-        yield parent
-
-        for child in parent.children.values():
-            yield from self.get_all_nodes(child)
\ No newline at end of file
+        return self.pre_order(from_node)
@@ -1,14 +1,17 @@
+import heapq
 import json
 from pathlib import Path
-from typing import List
-
-from treelib import Tree
+from typing import Dict, List, Tuple
 
 from chardon.extraexporter.extraexporter import ExtraExporter
 from chardon.extraexporter.file_tree import FileTree, FileInput, FileNode
+from chardon.extraexporter.palette import hsl_to_hex, hsl_to_int
 from chardon.code_parser.structure.class_ import Class
 from chardon.documentation.project_manager import ProjectManager
-from colour import Color
+
+# Obsidian evaluates every group query against every node,
+# so the graph view slows down with their count
+DEFAULT_MAX_GROUPS: int = 64
 
 
 def rank_by_level(class_: Class) -> int:
@@ -21,9 +24,9 @@ def get_letter_position(class_: Class, position: int = 0) -> int:
 
 
 class ClassNode:
-    def __init__(self, class_: Class, color: Color | None = None):
+    def __init__(self, class_: Class, hue: float | None = None):
         self.class_ = class_
-        self.color = color
+        self.hue = hue
 
 class ObsidianGraphColorer(ExtraExporter):
     """
@@ -32,7 +35,7 @@ class ObsidianGraphColorer(ExtraExporter):
     """
 
     classes: List[Class]
-    tree: Tree
+    tree: FileTree
     class_nodes: List[ClassNode]
 
     def __init__(self, project: ProjectManager):
@@ -46,27 +49,35 @@ class ObsidianGraphColorer(ExtraExporter):
             for class_ in self.classes
         ])
 
-        self.color_nodes(self.tree.root, Color(hsl=(0,1,0.5)), Color(hsl=(1,1,0.5)))
+        self.color_nodes(self.tree.root)
 
     def add_node(self, node: ClassNode) -> ClassNode:
         self.class_nodes.append(node)
         return node
 
-    def color_nodes(self, node: FileNode, color: Color, color2: Color, level: int =0):
-        if node.children == {}:
-            return
-
-        hue_steps = (color2.get_hue() - color.get_hue()) / len(node.children)
-        hue = color.get_hue()
-        for child in node.children.values():
-            if child.data:
-                child.data.color = Color(hsl=(hue, 1, 0.5))
-            else:
-                child.data = ClassNode(None, Color(hsl=(hue, 1, 0.5)))
-
-            self.color_nodes(child, Color(hsl=(hue-self.get_hue_variation(level), 1, 0.5)), Color(hsl=(hue+self.get_hue_variation(level), 1, 0.5)), level + 1)
-
-            hue += hue_steps
+    def color_nodes(self, node: FileNode, start_hue: float = 0, end_hue: float = 1):
+        """
+        Spread hues over a subtree in a single pass : the children of a node share its hue range,
+        and each child gets a narrower range around its own hue for its children
+        @param node: Root of the subtree
+        @param start_hue: Hue of the first child
+        @param end_hue: Hue after the last child
+        """
+        # Node -> (hue range of its children, level)
+        ranges: Dict[int, Tuple[float, float, int]] = {id(node): (start_hue, end_hue, 0)}
+        for parent in self.tree.pre_order(node):
+            if not parent.children:
+                continue
+            start, end, level = ranges.pop(id(parent))
+            hue_steps = (end - start) / len(parent.children)
+            variation = self.get_hue_variation(level)
+            for index, child in enumerate(parent.children.values()):
+                hue = start + hue_steps * index
+                if child.data:
+                    child.data.hue = hue
+                else:
+                    child.data = ClassNode(None, hue)
+                ranges[id(child)] = (hue - variation, hue + variation, level + 1)
 
     def get_hue_variation(self, level) -> float:
         match level:
@@ -77,23 +88,76 @@ class ObsidianGraphColorer(ExtraExporter):
             case _:
                 return 5 / 360
 
-    def colour_to_int(self, color: Color) -> int:
-        return (int(color.get_red() * 255) << 16) + (int(color.get_green() * 255) << 8) + int(color.get_blue() * 255)
+    def get_groups(self, max_groups: int | None = DEFAULT_MAX_GROUPS) -> List[List[FileNode]]:
+        """
+        Choose the nodes to color, each folder node coloring its whole subtree with its own hue
+        Starting from the top level folders, the biggest folders are split into their children
+        as long as the number of groups stays under max_groups
+        When there are more top level nodes than max_groups, neighbour top level nodes
+        (whose hues are close) are colored by the same group
+        @param max_groups: Maximum number of groups (None to color each class on its own)
+        @return: Nodes of each group, covering every class exactly once
+        """
+        top_level = list(self.tree.root.children.values())
+        if max_groups is not None and len(top_level) > max_groups:
+            return [top_level[len(top_level) * i // max_groups:
+                              len(top_level) * (i + 1) // max_groups] for i in range(max_groups)]
+
+        # Number of classes under each node
+        sizes: Dict[int, int] = {}
+        for node in self.tree.post_order():
+            sizes[id(node)] = sum(sizes[id(child)] for child in node.children.values()) \
+                if node.children else 1
+
+        groups: Dict[str, FileNode] = {}
+        folders: List = []
+
+        def add_group(node: FileNode):
+            groups[node.path] = node
+            if node.children:
+                heapq.heappush(folders, (-sizes[id(node)], node.path, node))
+
+        for child in top_level:
+            add_group(child)
+
+        while folders:
+            _size, path, folder = heapq.heappop(folders)
+            if max_groups is not None and len(groups) - 1 + len(folder.children) > max_groups:
+                continue
+            del groups[path]
+            for child in folder.children.values():
+                add_group(child)
+
+        return [[groups[path]] for path in sorted(groups)]
 
-    def color_graph(self, graph_file_path: Path) -> None:
+    def color_graph(self, graph_file_path: Path,
+                    max_groups: int | None = DEFAULT_MAX_GROUPS) -> None:
+        """
+        Write the color groups of the graph view
+        Folders are colored with a single group when there are too many classes,
+        and groups already in the config keep their color, so the config doesn't change between runs
+        @param graph_file_path: graph.json of the vault
+        @param max_groups: Maximum number of groups (None to color each class on its own)
+        """
         with open(graph_file_path, "rb") as graph_file:
             config = json.loads(graph_file.read())
 
-        config['colorGroups'] = [
-            {
-                "query": f"path:{'/'.join(class_.class_.attributes['uri'].parts)}  ",
-                "color": {
+        previous_colors = {group.get('query'): group.get('color')
+                           for group in config.get('colorGroups', [])}
+
+        config['colorGroups'] = []
+        for nodes in self.get_groups(max_groups):
+            query = " OR ".join(f'path:"{node.path}.md"' if node.data.class_ else
+                                f'path:"{node.path}/"' for node in nodes)
+            # Merged groups take the hue in the middle of their nodes
+            hue = nodes[len(nodes) // 2].data.hue
+            config['colorGroups'].append({
+                "query": query,
+                "color": previous_colors.get(query) or {
                     "a": 1,
-                    "rgb": self.colour_to_int(class_.color)
+                    "rgb": hsl_to_int(hue, 1, 0.5)
                 }
-            }
-            for class_ in self.class_nodes
-        ]
+            })
 
         with open(graph_file_path, "w") as graph_file:
             graph_file.write(json.dumps(config, indent=2))
@@ -112,7 +176,7 @@ class ObsidianGraphColorer(ExtraExporter):
                 continue
 
             config['styles'][fileNode.path + (".md" if fileNode.data.class_ else "")] = {
-                "backgroundColor": Color(hsl=(fileNode.data.color.get_hue(), saturation, luminance)).get_hex(),
+                "backgroundColor": hsl_to_hex(fileNode.data.hue, saturation, luminance),
                 "isBold": False,
                 "isItalic": False,
                 "opacity": 1,
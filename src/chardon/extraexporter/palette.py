@@ -0,0 +1,35 @@
+"""
+HSL colors, converted to the RGB formats used by Obsidian configs
+Hues are floats, where 0 and 1 are both red (any value is taken modulo 1)
+"""
+import colorsys
+from typing import Tuple
+
+
+def hsl_to_rgb(hue: float, saturation: float, luminance: float) -> Tuple[int, int, int]:
+    """
+    Convert an HSL color
+    @param hue: Hue
+    @param saturation: Saturation, between 0 and 1
+    @param luminance: Luminance, between 0 and 1
+    @return: Red, green, blue, between 0 and 255
+    """
+    red, green, blue = colorsys.hls_to_rgb(hue % 1, luminance, saturation)
+    return round(red * 255), round(green * 255), round(blue * 255)
+
+
+def hsl_to_int(hue: float, saturation: float, luminance: float) -> int:
+    """
+    Convert an HSL color to a single integer (0xRRGGBB)
+    @return: Color
+    """
+    red, green, blue = hsl_to_rgb(hue, saturation, luminance)
+    return (red << 16) + (green << 8) + blue
+
+
+def hsl_to_hex(hue: float, saturation: float, luminance: float) -> str:
+    """
+    Convert an HSL color to a hex code (#rrggbb)
+    @return: Color
+    """
+    return f"#{hsl_to_int(hue, saturation, luminance):06x}"
@@ -0,0 +1,263 @@
+"""
+Export the documentation model of a project to a SQLite database, with a full-text index
+"""
+import os
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from chardon.code_arranger import DocArticle, ReferenceKind
+from chardon.code_arranger.documentation import classes_of
+from chardon.code_parser.structure import Class, Field, Function, Type, ArrayOfType, \
+    DictOfType, SpecificType
+from chardon.documentation.project_manager import ProjectManager
+from chardon.exporter import ContentExport, MarkdownContentExport
+from chardon.extraexporter.extraexporter import ExtraExporter
+
+SCHEMA: str = """
+CREATE TABLE classes (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    qualified_name TEXT NOT NULL UNIQUE,
+    namespace TEXT NOT NULL,
+    uri TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    summary TEXT,
+    remarks TEXT,
+    page TEXT
+);
+CREATE TABLE inherits (
+    class_id INTEGER NOT NULL REFERENCES classes(id),
+    position INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    parent_id INTEGER REFERENCES classes(id)
+);
+CREATE TABLE fields (
+    id INTEGER PRIMARY KEY,
+    class_id INTEGER NOT NULL REFERENCES classes(id),
+    name TEXT NOT NULL,
+    is_function INTEGER NOT NULL,
+    scope TEXT NOT NULL,
+    type TEXT,
+    default_value TEXT,
+    summary TEXT
+);
+CREATE TABLE parameters (
+    id INTEGER PRIMARY KEY,
+    field_id INTEGER NOT NULL REFERENCES fields(id),
+    direction TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    description TEXT
+);
+CREATE TABLE links (
+    class_id INTEGER NOT NULL REFERENCES classes(id),
+    field_id INTEGER REFERENCES fields(id),
+    kind TEXT NOT NULL,
+    target_id INTEGER NOT NULL REFERENCES classes(id)
+);
+CREATE VIRTUAL TABLE search USING fts5(
+    kind UNINDEXED, class_id UNINDEXED, field_id UNINDEXED, name, summary, page,
+    tokenize = 'unicode61'
+);
+"""
+
+# Created after the bulk inserts, which is faster than maintaining them row by row
+INDEXES: str = """
+CREATE INDEX classes_name ON classes(name);
+CREATE INDEX inherits_class ON inherits(class_id);
+CREATE INDEX inherits_parent ON inherits(parent_id);
+CREATE INDEX fields_class ON fields(class_id);
+CREATE INDEX fields_name ON fields(name);
+CREATE INDEX parameters_field ON parameters(field_id);
+CREATE INDEX links_class ON links(class_id);
+CREATE INDEX links_target ON links(target_id, kind);
+"""
+
+
+def type_text(type_: Type) -> str:
+    """
+    Write a type as in the code
+    @param type_: Type
+    @return: Text
+    """
+    if isinstance(type_, ArrayOfType):
+        return type_text(type_.type_) + '[]'
+    if isinstance(type_, DictOfType):
+        return f"Dictionary<{type_text(type_.key)}, {type_text(type_.value)}>"
+    if isinstance(type_, SpecificType):
+        specifics = type_text(type_.specific1)
+        if type_.specific2 is not None:
+            specifics += ', ' + type_text(type_.specific2)
+        return f"{type_text(type_.type_)}<{specifics}>"
+    return type_.name
+
+
+def comment_text(attributes: dict, tag: str) -> str | None:
+    """
+    Find a comment tag (summary, remarks...) in parsed attributes
+    @param attributes: Attributes of a Class or a Field
+    @param tag: Tag
+    @return: Content of the tag, None if missing
+    """
+    comment = attributes.get('comments', {}).get(tag)
+    return comment.content if comment is not None else None
+
+
+# pylint: disable=too-few-public-methods
+class SqliteExporter(ExtraExporter):
+    """
+    Write the resolved model of a project (classes, fields, parameters, types, links and pages)
+    into a single SQLite database, with a FTS5 index over names, summaries and pages
+    eg. every method taking an EntityAI :
+    SELECT c.name, f.name FROM links l JOIN fields f ON f.id = l.field_id
+    JOIN classes c ON c.id = l.class_id JOIN classes t ON t.id = l.target_id
+    WHERE t.name = 'EntityAI' AND l.kind = 'parameter'
+    """
+
+    def __init__(self, project: ProjectManager, page_exporter: ContentExport | None = None):
+        """
+        Init a SqliteExporter
+        @param project: Parsed project, with its types resolved
+        @param page_exporter: Exporter rendering the text of each page (Markdown by default)
+        """
+        super().__init__(project)
+        self.page_exporter = page_exporter or MarkdownContentExport()
+
+    # pylint: disable=arguments-differ
+    def export(self, database: Path, pages: bool = True):
+        """
+        Write the database, replacing any previous one once it is complete
+        @param database: Path of the database
+        @param pages: Also store (and index) the rendered text of each page
+        """
+        rows = self._rows(pages)
+
+        temporary = database.with_name(database.name + '.tmp')
+        temporary.unlink(missing_ok=True)
+        database.parent.mkdir(parents=True, exist_ok=True)
+
+        connection = sqlite3.connect(temporary)
+        try:
+            # The database is built from scratch, and only kept once complete
+            connection.execute("PRAGMA journal_mode = OFF")
+            connection.execute("PRAGMA synchronous = OFF")
+            connection.executescript(SCHEMA)
+            with connection:
+                for table, table_rows in rows.items():
+                    if table_rows:
+                        placeholders = ', '.join('?' * len(table_rows[0]))
+                        connection.executemany(f"INSERT INTO {table} VALUES ({placeholders})",
+                                               table_rows)
+            connection.executescript(INDEXES)
+            connection.execute("INSERT INTO search(search) VALUES ('optimize')")
+            connection.commit()
+        finally:
+            connection.close()
+
+        os.replace(temporary, database)
+
+    # pylint: disable=too-many-locals
+    def _rows(self, pages: bool) -> Dict[str, List[Tuple]]:
+        """
+        Build the rows of every table, ids being assigned here so rows can be bulk inserted
+        @param pages: Render the text of each page
+        @return: Table -> rows
+        """
+        rows: Dict[str, List[Tuple]] = {table: [] for table in
+                                        ('classes', 'inherits', 'fields', 'parameters', 'links',
+                                         'search')}
+        ids: Dict[str, int] = {name: index for index, name
+                               in enumerate(self.project.classes.keys(), start=1)}
+        field_id = 0
+        parameter_id = 0
+
+        for result in self.project.results:
+            for class_ in result.results:
+                if self.project.classes.get(class_.get_qualified_name()) is not class_:
+                    # Declared more than once, only the last declaration is documented
+                    continue
+                class_id = ids[class_.get_qualified_name()]
+                page: str | None = None
+                if pages:
+                    with self.project.context.active():
+                        article = DocArticle(class_, result.clean_path.parent,
+                                             self.project.references, self.project.inheritance)
+                        page = self.page_exporter.export(article.to_contents(),
+                                                         self.project.context)
+
+                summary = comment_text(class_.attributes, 'summary')
+                rows['classes'].append((class_id, class_.name, class_.get_qualified_name(),
+                                        class_.get_namespace(),
+                                        '/'.join(class_.attributes['uri'].parts),
+                                        class_.scope.name, class_.variant.name,
+                                        summary, comment_text(class_.attributes, 'remarks'), page))
+                rows['search'].append(('class', class_id, None, class_.name, summary, page))
+
+                for position, parent in enumerate(class_.inherits):
+                    parent_id = ids.get(parent.get_qualified_name()) \
+                        if isinstance(parent, Class) else None
+                    rows['inherits'].append((class_id, position, type_text(parent), parent_id))
+                    if parent_id is not None:
+                        rows['links'].append((class_id, None, 'inherits', parent_id))
+
+                for field in class_.fields or []:
+                    field_id += 1
+                    parameter_id = self._field_rows(rows, ids, class_id, field,
+                                                    field_id=field_id, parameter_id=parameter_id)
+        return rows
+
+    # pylint: disable=too-many-arguments
+    def _field_rows(self, rows: Dict[str, List[Tuple]], ids: Dict[str, int], class_id: int,
+                    field: Field, *, field_id: int, parameter_id: int) -> int:
+        """
+        Build the rows of a field, its parameters and the classes it links to
+        @param rows: Table -> rows, to append to
+        @param ids: Qualified name -> class id
+        @param class_id: Id of the class declaring the field
+        @param field: Field
+        @param field_id: Id of the field
+        @param parameter_id: Last parameter id used
+        @return: Last parameter id used
+        """
+        summary = comment_text(field.attributes, 'summary')
+        targets: Dict[int, str] = {}
+
+        if isinstance(field.type, Function):
+            type_ = None
+            descriptions: dict = field.attributes.get('params', {})
+            for direction, kind, params in (('input', ReferenceKind.PARAMETER, field.type.inputs),
+                                            ('output', ReferenceKind.RETURN, field.type.outputs)):
+                for position, param in enumerate(params):
+                    parameter_id += 1
+                    rows['parameters'].append((parameter_id, field_id, direction, position,
+                                               param.name,
+                                               ' | '.join(map(type_text, param.types)),
+                                               descriptions.get(param.name)))
+                    for param_type in param.types:
+                        for target in self._ids_of(param_type, ids):
+                            targets.setdefault(target, kind.value)
+        else:
+            type_ = type_text(field.type)
+            for target in self._ids_of(field.type, ids):
+                targets.setdefault(target, ReferenceKind.FIELD.value)
+
+        rows['fields'].append((field_id, class_id, field.name,
+                               isinstance(field.type, Function), field.scope.name, type_,
+                               field.default_value, summary))
+        rows['search'].append(('field', class_id, field_id, field.name, summary, None))
+        rows['links'].extend((class_id, field_id, kind, target) for target, kind in targets.items())
+        return parameter_id
+
+    @staticmethod
+    def _ids_of(type_: Type, ids: Dict[str, int]) -> List[int]:
+        """
+        Ids of the classes a type refers to
+        @param type_: Type
+        @param ids: Qualified name -> class id
+        @return: Class ids
+        """
+        return [ids[class_.get_qualified_name()] for class_ in classes_of(type_)
+                if class_.get_qualified_name() in ids]
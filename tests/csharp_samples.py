@@ -0,0 +1,33 @@
+"""
+C# sources and parser shared by the tests parsing projects
+"""
+from pathlib import PurePosixPath
+
+from chardon.code_parser.language import CSharpParser
+
+# Documented class, formatted with its name and summary
+CLASS = """
+namespace Core
+{{
+    /// <summary>
+    /// {summary}
+    /// </summary>
+    public class {name}
+    {{
+    }}
+}}
+"""
+
+
+class CountingParser(CSharpParser):
+    """
+    CSharpParser recording the files it parses
+    """
+
+    def __init__(self, parameters: dict = None):
+        super().__init__(parameters)
+        self.parsed = []
+
+    def parse_bytes(self, content, file, encoding='utf-8', coverage=None):
+        self.parsed.append(PurePosixPath(file).as_posix())
+        return super().parse_bytes(content, file, encoding, coverage)
@@ -0,0 +1,85 @@
+"""
+Exporters written before render existed
+"""
+import io
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from chardon.article_builder import Content
+from chardon.code_parser.language import CSharpParser
+from chardon.documentation import MemorySource, ProjectManager
+from chardon.exporter import ContentExport, MarkdownContentExport
+
+ENTITY = """
+/// <summary>
+/// An entity
+/// </summary>
+public class Entity
+{
+}
+"""
+
+
+class LegacyExport(ContentExport):
+    """
+    Exporter only overriding export
+    """
+
+    def export(self, contents, context=None):
+        return "|".join(content.attributes['text'] for content in contents) \
+            + self.params.get('end', '')
+
+
+class HeaderMarkdownExport(MarkdownContentExport):
+    """
+    Markdown exporter overriding export to add a header
+    """
+
+    def export(self, contents, context=None):
+        return "<!-- generated -->\n" + super().export(contents, context)
+
+
+class ContentExportTest(unittest.TestCase):
+    """
+    export stays a supported override point
+    """
+
+    def test_legacy_exporter_renders(self):
+        """
+        Pages rendered by a bound exporter go through the export of the subclass
+        """
+        exporter = LegacyExport({'end': '!'})
+        stream = io.StringIO()
+        exporter.bind().render_to([Content.Text('a'), Content.Text('b')], stream)
+        self.assertEqual(stream.getvalue(), 'a|b!')
+        self.assertEqual(exporter.export([Content.Text('c')]), 'c!')
+
+    def test_project_exports_with_overridden_export(self):
+        """
+        Pages of a project go through the export of a subclass of a built-in exporter
+        """
+        directory = Path(tempfile.mkdtemp())
+        try:
+            project = ProjectManager(CSharpParser(), HeaderMarkdownExport(),
+                                     MemorySource({'Entity.cs': ENTITY}), directory)
+            project.export()
+            page = (directory / 'Entity.md').read_text(encoding='utf-8')
+        finally:
+            shutil.rmtree(directory)
+        self.assertTrue(page.startswith("<!-- generated -->\n"))
+        self.assertIn('An entity', page)
+        self.assertEqual(HeaderMarkdownExport().export([Content.Text('a')]),
+                         "<!-- generated -->\na")
+
+    def test_exporter_without_render(self):
+        """
+        An exporter implementing neither render nor export can't render
+        """
+        with self.assertRaises(NotImplementedError):
+            ContentExport().export([])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""
+Documentation daemon, answering requests over a temporary Unix socket
+"""
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from chardon.daemon import DocumentationDaemon, serve
+from chardon.daemon_client import DaemonClient, DaemonError
+from chardon.documentation import ProjectManager
+from chardon.exporter import MarkdownContentExport
+from tests.csharp_samples import CLASS, CountingParser
+
+# Comment at the end of a declaration, which the C# parser rejects
+BROKEN = """
+namespace Core
+{
+    public class Broken
+    {
+        public int x; /// <summary>Not a documentation comment</summary>
+    }
+}
+"""
+
+
+@unittest.skipIf(not hasattr(socket, 'AF_UNIX'), "Unix sockets are not supported")
+class DaemonTest(unittest.TestCase):
+    """
+    chardon serve keeps the project in memory, and answers render, reindex and symbols
+    """
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.project = self.directory / 'project'
+        (self.project / 'Core').mkdir(parents=True)
+        self.write('Core/Entity.cs', CLASS.format(name='Entity', summary='An entity'))
+        self.write('Core/Brain.cs', CLASS.format(name='Brain', summary='A brain'))
+        (self.directory / 'Secret.cs').write_text(CLASS.format(name='Secret', summary='Secret'),
+                                                   encoding='utf-8')
+
+        self.socket = self.directory / 'chardon.sock'
+        self.parser = CountingParser()
+        daemon = DocumentationDaemon(
+            lambda: ProjectManager(self.parser, None, None, None, file_regex=r'.*\.cs$',
+                                   targets=[]),
+            self.project, {'markdown': MarkdownContentExport()})
+        self.thread = threading.Thread(target=serve, args=(daemon, 0, self.socket))
+        self.thread.start()
+        for _ in range(100):
+            if self.socket.exists():
+                break
+            time.sleep(0.05)
+        self.client = DaemonClient(socket_path=self.socket, timeout=10)
+
+    def tearDown(self):
+        self.client.call('shutdown')
+        self.thread.join(10)
+        shutil.rmtree(self.directory)
+
+    def write(self, path: str, content: str):
+        """
+        Write a file of the project
+        """
+        (self.project / path).write_text(content, encoding='utf-8')
+
+    def raw_status(self, headers: str) -> int:
+        """
+        Send a request with the given headers, as a web page could
+        @return: HTTP status of the answer
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(self.socket))
+            client.sendall(f"POST / HTTP/1.1\r\n{headers}Content-Length: 2\r\n"
+                           f"Connection: close\r\n\r\n{{}}".encode('utf-8'))
+            return int(client.recv(1024).split()[1])
+
+    def test_render_reindex_symbols(self):
+        """
+        Pages show the files as they were last indexed
+        """
+        self.assertIn('An entity', self.client.call('render', name='Entity')['content'])
+        self.assertEqual([symbol['qualified_name'] for symbol in
+                          self.client.call('symbols', query='b')], ['Core.Brain'])
+
+        self.write('Core/Entity.cs', CLASS.format(name='Entity', summary='A living entity'))
+        self.parser.parsed.clear()
+        self.assertEqual(self.client.call('reindex', files=['Core/Entity.cs'])['classes'], 2)
+        self.assertEqual(self.parser.parsed, ['Core/Entity.cs'])
+        self.assertIn('A living entity', self.client.call('render', name='Entity')['content'])
+
+    def test_errors_are_answered(self):
+        """
+        Files failing to parse and files outside the project are reported to the client,
+        and the daemon keeps serving
+        """
+        self.write('Core/Broken.cs', BROKEN)
+        with self.assertRaises(DaemonError):
+            self.client.call('reindex', files=['Core/Broken.cs'])
+        with self.assertRaisesRegex(DaemonError, 'outside the project'):
+            self.client.call('reindex', files=['../Secret.cs'])
+        self.assertEqual(len(self.client.call('symbols')), 2)
+
+    def test_only_local_json_requests(self):
+        """
+        Requests without a JSON content type or a local host are rejected
+        """
+        self.assertEqual(self.raw_status("Host: localhost\r\nContent-Type: text/plain\r\n"), 403)
+        self.assertEqual(self.raw_status("Host: attacker.example:7420\r\n"
+                                         "Content-Type: application/json\r\n"), 403)
+        self.assertEqual(self.raw_status("Host: localhost\r\n"
+                                         "Content-Type: application/json\r\n"), 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
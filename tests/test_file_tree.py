@@ -0,0 +1,47 @@
+"""
+FileTree construction and lazily computed paths
+"""
+import unittest
+
+from chardon.extraexporter.file_tree import FileTree, FileInput
+
+
+class FileTreeTest(unittest.TestCase):
+    """
+    FileTree built in bulk, and paths of its nodes
+    """
+
+    def test_bulk_matches_one_by_one(self):
+        """
+        Sorted or not, files added in bulk give the same tree as files added one by one
+        """
+        files = [FileInput(i, f"Class{i}", hierarchy) for i, hierarchy in enumerate(
+            [("A", "B"), ("A", "B"), ("A",), ("C", "D", "E"), ("A", "B", "X"), (), ("C", "D")])]
+        tree = FileTree(files)
+        expected = FileTree([])
+        for file in files:
+            expected.add(file)
+        self.assertEqual([(node.path, list(node.children)) for node in tree.pre_order()],
+                         [(node.path, list(node.children)) for node in expected.pre_order()])
+
+    def test_moved_subtree(self):
+        """
+        A moved subtree leaves its old parent, is indexed at its new place,
+        and its cached paths are computed again
+        """
+        tree = FileTree([FileInput(None, "Brain", ("Core", "AI"))])
+        brain = tree.nodes[("Core", "AI", "Brain")]
+        self.assertEqual(brain.path, "Core/AI/Brain")
+        tree.move(tree.nodes[("Core", "AI")], tree.get_node(["Game"], create_if_empty=True))
+        self.assertEqual(brain.path, "Game/AI/Brain")
+        self.assertEqual([node.path for node in tree.pre_order()],
+                         ["", "Core", "Game", "Game/AI", "Game/AI/Brain"])
+        self.assertEqual(sorted(tree.nodes), [(), ("Core",), ("Game",), ("Game", "AI"),
+                                              ("Game", "AI", "Brain")])
+        self.assertIs(tree.get_node(["Game", "AI", "Brain"]), brain)
+        with self.assertRaises(ValueError):
+            tree.move(tree.nodes[("Game",)], tree.nodes[("Game", "AI")])
+
+
+if __name__ == '__main__':
+    unittest.main()
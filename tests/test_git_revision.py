@@ -0,0 +1,120 @@
+"""
+Parsing a project from git revisions, against a local repository
+"""
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+from chardon.code_parser.language import CSharpParser
+from chardon.documentation import ProjectManager
+from chardon.exporter import MarkdownContentExport
+from tests.csharp_samples import CLASS, CountingParser
+
+
+@unittest.skipIf(shutil.which('git') is None, "git is not installed")
+class GitRevisionTest(unittest.TestCase):
+    """
+    parse_git reads files from git objects, and only parses the files changed since the cache
+    """
+
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.repository = self.directory / 'repository'
+        self.repository.mkdir()
+        self.git('init', '-q')
+        self.commit({'Core/Entity.cs': CLASS.format(name='Entity', summary='An entity'),
+                     'Core/Brain.cs': CLASS.format(name='Brain', summary='A brain')})
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def git(self, *args: str) -> str:
+        """
+        Run git in the repository
+        @return: Output
+        """
+        return subprocess.run(['git', '-c', 'user.name=test', '-c', 'user.email=test@test',
+                               *args], cwd=self.repository, check=True, capture_output=True,
+                              text=True).stdout.strip()
+
+    def commit(self, files: dict) -> str:
+        """
+        Write files and commit them
+        @param files: Path -> content
+        @return: Commit id
+        """
+        for path, content in files.items():
+            (self.repository / path).parent.mkdir(parents=True, exist_ok=True)
+            (self.repository / path).write_text(content, encoding='utf-8')
+        self.git('add', '-A')
+        self.git('commit', '-q', '-m', 'update')
+        return self.git('rev-parse', 'HEAD')
+
+    def project(self, parser: CSharpParser) -> ProjectManager:
+        """
+        ProjectManager exporting Markdown in the output directory
+        """
+        return ProjectManager(parser, MarkdownContentExport(), None, self.directory / 'out')
+
+    def test_only_changed_files_are_parsed(self):
+        """
+        With a cache of the previous revision, only the changed files are parsed again
+        """
+        cache = self.directory / 'cache' / 'git-parse-cache'
+        first = self.git('rev-parse', 'HEAD')
+        parser = CountingParser()
+        project = self.project(parser)
+        project.parse_git(self.repository, 'HEAD', cache=cache)
+        project.export()
+        self.assertEqual(sorted(parser.parsed), ['Core/Brain.cs', 'Core/Entity.cs'])
+
+        self.commit({'Core/Brain.cs': CLASS.format(name='Brain', summary='A smarter brain')})
+        parser = CountingParser()
+        project = self.project(parser)
+        project.parse_git(self.repository, 'HEAD', previous=first, cache=cache)
+        project.export()
+        self.assertEqual(parser.parsed, ['Core/Brain.cs'])
+        self.assertEqual(sorted(project.classes), ['Core.Brain', 'Core.Entity'])
+        self.assertIn('A smarter brain',
+                      (self.directory / 'out' / 'Core' / 'Brain.md').read_text(encoding='utf-8'))
+
+    def test_cache_of_another_parser_is_discarded(self):
+        """
+        Files parsed with other parameters are parsed again, even if they didn't change
+        """
+        cache = self.directory / 'cache' / 'git-parse-cache'
+        first = self.git('rev-parse', 'HEAD')
+        self.project(CountingParser()).parse_git(self.repository, 'HEAD', cache=cache)
+        parser = CountingParser({'analyse_uncommented_code': True})
+        self.project(parser).parse_git(self.repository, 'HEAD', previous=first, cache=cache)
+        self.assertEqual(sorted(parser.parsed), ['Core/Brain.cs', 'Core/Entity.cs'])
+
+    def test_exclude_from_project_directory(self):
+        """
+        Excluded paths are matched from the project directory, as when parsing a directory
+        """
+        self.commit({'Assets/Core/Bar.cs': CLASS.format(name='Bar', summary='Kept'),
+                     'Assets/Gen/Foo.cs': CLASS.format(name='Foo', summary='Generated')})
+        project = ProjectManager(CountingParser(), MarkdownContentExport(), None,
+                                 self.directory / 'out', exclude_regex='^Gen/')
+        project.parse_git(self.repository, 'HEAD', directory='Assets')
+        self.assertEqual(sorted(project.classes), ['Core.Bar'])
+
+    def test_no_cache_in_outputs(self):
+        """
+        Nothing is cached without a cache path, and caches can't be written in an output
+        """
+        project = self.project(CountingParser())
+        project.parse_git(self.repository, 'HEAD')
+        project.export()
+        self.assertEqual(sorted(path.name for path in (self.directory / 'out').rglob('*')
+                                if path.is_file()), ['Brain.md', 'Entity.md'])
+        with self.assertRaises(ValueError):
+            self.project(CountingParser()).parse_git(
+                self.repository, 'HEAD', cache=self.directory / 'out' / 'cache')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+"""
+Deferred parsing of documentation texts
+"""
+import unittest
+
+from chardon.article_builder import Content, ContentParser, RunContext
+
+
+class FailingOnceParser(ContentParser):
+    """
+    Parser raising the first time it is used
+    """
+    calls = 0
+
+    def parse(self):
+        FailingOnceParser.calls += 1
+        if FailingOnceParser.calls == 1:
+            raise ValueError("Parser failed")
+        return [Content.Text(self.get_text())]
+
+
+class LazyTextTest(unittest.TestCase):
+    """
+    LazyTextContent parses its text on first read
+    """
+
+    def test_failed_parse_is_retried(self):
+        """
+        A parser raising doesn't leave the Span without children
+        """
+        with RunContext(FailingOnceParser).active():
+            content = Content.LazyText("Summary")
+        with self.assertRaises(ValueError):
+            _ = content.attributes
+        self.assertEqual([child.attributes['text'] for child in content.attributes['children']],
+                         ["Summary"])
+
+
+if __name__ == '__main__':
+    unittest.main()
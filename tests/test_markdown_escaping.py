@@ -0,0 +1,41 @@
+"""
+Escaping of the Markdown exporters : names from the code are escaped, parsed texts aren't
+"""
+import unittest
+
+from chardon.article_builder import Content
+from chardon.exporter import MarkdownContentExport, ObsidianFlavoredMarkdownContentExport
+
+
+class MarkdownEscapingTest(unittest.TestCase):
+    """
+    Texts of Markdown and Obsidian pages
+    """
+
+    def test_parsed_text_is_written_as_is(self):
+        """
+        Code spans and HTML of comments are left to the renderer
+        """
+        summary = 'see `Move` or <see cref="Brain"/>'
+        for exporter in (MarkdownContentExport(), ObsidianFlavoredMarkdownContentExport()):
+            self.assertEqual(exporter.export([Content.FromText(summary)]), summary)
+
+    def test_literal_is_escaped(self):
+        """
+        Names from the code are rendered as is
+        """
+        self.assertEqual(MarkdownContentExport().export([Content.Literal('max_depth')]),
+                         'max\\_depth')
+        self.assertEqual(ObsidianFlavoredMarkdownContentExport().export(
+            [Content.Literal('#tag')]), '\\#tag')
+
+    def test_title_is_not_escaped(self):
+        """
+        Anchors of the table of content link to the title as written
+        """
+        self.assertEqual(MarkdownContentExport().export([Content.Title('move_speed', 2)]).strip(),
+                         '## move_speed')
+
+
+if __name__ == '__main__':
+    unittest.main()
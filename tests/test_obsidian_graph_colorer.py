@@ -0,0 +1,54 @@
+"""
+Color groups of the Obsidian graph view
+"""
+import unittest
+
+from chardon.code_parser.language import CSharpParser
+from chardon.documentation import MemorySource, ProjectManager
+from chardon.extraexporter.obsidian_graph_colorer import ObsidianGraphColorer
+
+CLASS = """
+namespace {namespace}
+{{
+    /// <summary>
+    /// {name}
+    /// </summary>
+    public class {name}
+    {{
+    }}
+}}
+"""
+
+
+class ObsidianGraphColorerTest(unittest.TestCase):
+    """
+    Groups stay under the maximum group count
+    """
+
+    def setUp(self):
+        project = ProjectManager(CSharpParser(), None, MemorySource({
+            f"{folder}/{name}.cs": CLASS.format(namespace=folder, name=name)
+            for folder in ("Core", "Game", "Network") for name in ("First", "Second")
+        }), None)
+        project.resolve()
+        self.colorer = ObsidianGraphColorer(project)
+
+    def test_folders_are_split_under_the_limit(self):
+        """
+        Folders are split into their classes while the limit allows it
+        """
+        self.assertEqual(len(self.colorer.get_groups(None)), 6)
+        self.assertEqual(len(self.colorer.get_groups(4)), 4)
+
+    def test_top_level_folders_are_merged(self):
+        """
+        More top level folders than the limit are merged, every class being colored once
+        """
+        groups = self.colorer.get_groups(2)
+        self.assertEqual(len(groups), 2)
+        self.assertEqual(sorted(node.path for nodes in groups for node in nodes),
+                         ["Core", "Game", "Network"])
+
+
+if __name__ == '__main__':
+    unittest.main()